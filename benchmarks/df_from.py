@@ -0,0 +1,60 @@
+""" Compare stacframes.df_from against building one pandas.Series per item
+
+Usage:
+    python benchmarks/df_from.py [--items 10000] [--repeat 3]
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+import timeit
+
+import geopandas as gpd
+import pandas as pd
+import pystac
+from shapely.geometry import box, mapping
+
+import stacframes
+
+
+def build_catalog(n_items):
+    catalog = pystac.Catalog("bench", "bench")
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    for i in range(n_items):
+        geometry = box(i % 360 - 180, i % 180 - 90, i % 360 - 179, i % 180 - 89)
+        item = pystac.Item(
+            "item-{}".format(i),
+            mapping(geometry),
+            list(geometry.bounds),
+            start + timedelta(minutes=i),
+            {"index": i, "name": "item-{}".format(i % 100)},
+        )
+        catalog.add_item(item)
+    return catalog
+
+
+def df_from_series(catalog, crs="EPSG:4326"):
+    series = [stacframes.series_from(item) for item in catalog.get_all_items()]
+    return gpd.GeoDataFrame(series, crs=crs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.items)
+    pd.testing.assert_frame_equal(stacframes.df_from(catalog), df_from_series(catalog))
+
+    for name, func in (("series", df_from_series), ("columnar", stacframes.df_from)):
+        seconds = min(
+            timeit.repeat(lambda: func(catalog), number=1, repeat=args.repeat)
+        )
+        print(
+            "{:>10}: {:.3f}s ({:.0f} items/s)".format(
+                name, seconds, args.items / seconds
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
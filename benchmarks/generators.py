@@ -0,0 +1,97 @@
+""" Deterministic synthetic frames and catalogs for the stacframes benchmarks """
+from datetime import datetime, timezone
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pystac
+import shapely
+
+import stacframes
+
+
+def generate_frame(n_items, depth=2, fanout=4, n_properties=8, n_vertices=5, seed=0):
+    """Build a GeoDataFrame of n_items rows structured as stacframes.df_to expects
+
+    The same arguments always produce the same frame.
+
+    Args:
+        n_items (int): The number of rows
+        depth (int): The number of collection levels in the parents column
+        fanout (int): The number of child collections of each collection
+        n_properties (int): The number of keys in each properties dict, cycling
+            through int, float and str values
+        n_vertices (int): The number of vertices of each polygon geometry
+        seed (int): The seed of the random number generator
+
+    Returns:
+        geopandas.GeoDataFrame
+
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform([-170.0, -80.0], [170.0, 80.0], size=(n_items, 2))
+    radii = rng.uniform(0.01, 1.0, size=(n_items, 1))
+    angles = np.linspace(0.0, 2.0 * np.pi, n_vertices, endpoint=False)
+    xs = centers[:, :1] + radii * np.cos(angles)
+    ys = centers[:, 1:] + radii * np.sin(angles)
+    rings = np.stack([xs, ys], axis=-1)
+    geometries = shapely.polygons(np.concatenate([rings, rings[:, :1]], axis=1))
+    bboxes = shapely.bounds(geometries).tolist()
+
+    start = pd.Timestamp(datetime(2020, 1, 1, tzinfo=timezone.utc))
+    seconds = rng.integers(0, 365 * 24 * 3600, size=n_items)
+    datetimes = start + pd.to_timedelta(seconds, unit="s")
+
+    values = rng.integers(0, 1000, size=(n_items, n_properties))
+    properties = [
+        {"p{}".format(k): _property_value(k, int(v)) for k, v in enumerate(row)}
+        for row in values.tolist()
+    ]
+    paths = rng.integers(0, fanout, size=(n_items, depth)).tolist()
+    parents = [
+        [
+            "c{}".format("-".join(str(p) for p in path[: level + 1]))
+            for level in range(depth)
+        ]
+        for path in paths
+    ]
+    ids = ["item-{}".format(i) for i in range(n_items)]
+    assets = [
+        {
+            "data": {
+                "href": "s3://bucket/{}.tif".format(item_id),
+                "type": pystac.MediaType.COG,
+                "title": "Data",
+                "roles": ["data"],
+            }
+        }
+        for item_id in ids
+    ]
+    return gpd.GeoDataFrame(
+        {
+            "id": ids,
+            "datetime": datetimes,
+            "geometry": geometries,
+            "bbox": bboxes,
+            "properties": properties,
+            "assets": assets,
+            "parents": parents,
+        },
+        crs="EPSG:4326",
+    )
+
+
+def generate_catalog(dataframe):
+    """Build an in-memory pystac.Catalog from a frame made by generate_frame"""
+    catalog = pystac.Catalog("benchmark", "Synthetic stacframes benchmark catalog")
+    stacframes.df_to(catalog, dataframe)
+    return catalog
+
+
+def _property_value(k, value):
+    kind = k % 3
+    if kind == 0:
+        return value
+    if kind == 1:
+        return value / 10.0
+    return "value-{}".format(value % 50)
@@ -0,0 +1,87 @@
+""" Compare stacframes.parents helpers against the row-wise DataFrame.apply versions
+
+Usage:
+    python benchmarks/parents.py [--rows 1000000] [--repeat 3]
+"""
+import argparse
+from itertools import accumulate
+import timeit
+
+import pandas as pd
+
+from stacframes import parents
+
+
+def build_frame(n_rows):
+    return pd.DataFrame(
+        {
+            "id": ["item-{}".format(i) for i in range(n_rows)],
+            "properties": [
+                {
+                    "Year": 2000 + i % 20,
+                    "Month": i % 12 + 1,
+                    "Flight": "f{}".format(i % 500),
+                }
+                for i in range(n_rows)
+            ],
+        }
+    )
+
+
+def from_properties_apply(keys, dataframe, prefix="", parents_col="parents"):
+    def apply(series):
+        properties = series.get("properties", {})
+        series[parents_col] = ["{}{}".format(prefix, properties[arg]) for arg in keys]
+        return series
+
+    return dataframe.apply(apply, axis=1)
+
+
+def from_properties_accum_apply(
+    keys, dataframe, prefix="", separator="", parents_col="parents"
+):
+    def apply(series):
+        properties = series.get("properties", {})
+        values = [str(properties[x]) for x in keys]
+        result = list(accumulate(values, lambda acc, x: acc + separator + x))
+        if prefix:
+            result = [prefix + separator + x for x in result]
+        series[parents_col] = result
+        return series
+
+    return dataframe.apply(apply, axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = build_frame(args.rows)
+    keys = ["Year", "Month", "Flight"]
+    cases = (
+        ("from_properties", from_properties_apply, parents.from_properties, {}),
+        (
+            "from_properties_accum",
+            from_properties_accum_apply,
+            parents.from_properties_accum,
+            {"prefix": "dt", "separator": "-"},
+        ),
+    )
+    for name, apply_func, func, kwargs in cases:
+        # apply(axis=1) also loses the dtypes of the other columns, so compare values
+        pd.testing.assert_frame_equal(
+            func(keys, df, **kwargs), apply_func(keys, df, **kwargs), check_dtype=False
+        )
+        for label, f in (("apply", apply_func), ("vectorized", func)):
+            seconds = min(
+                timeit.repeat(
+                    lambda: f(keys, df, **kwargs), number=1, repeat=args.repeat
+                )
+            )
+            print("{:>22} {:>10}: {:.3f}s".format(name, label, seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+""" Time and measure the peak memory of each stacframes entry point on synthetic data
+
+Each result is printed as one line of JSON, so that runs on different commits
+can be saved and compared.
+
+Usage:
+    ./scripts/benchmark --sizes 1000 10000 --cases df_to df_from
+    ./scripts/benchmark --output results.jsonl
+"""
+import argparse
+from datetime import datetime, timezone
+import functools
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import pystac
+
+import stacframes
+from stacframes import parents
+
+from benchmarks.df_from import df_from_series
+from benchmarks.generators import generate_catalog, generate_frame
+from benchmarks.parents import from_properties_accum_apply, from_properties_apply
+
+
+class Workload:
+    """The synthetic inputs of one benchmark size, each built on first use
+
+    Args:
+        tmp_dir (str): A directory to write catalogs and files to
+        options (dict): The keyword arguments of generate_frame, other than
+            n_items
+
+    """
+
+    def __init__(self, n_items, tmp_dir, options):
+        self.n_items = n_items
+        self.tmp_dir = tmp_dir
+        self.options = options
+        self._cache = {}
+        self._servers = []
+
+    def close(self):
+        """Stop the HTTP servers started for catalog_url"""
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def _get(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def frame(self):
+        return self._get("frame", lambda: generate_frame(self.n_items, **self.options))
+
+    @property
+    def catalog(self):
+        return self._get("catalog", lambda: generate_catalog(self.frame))
+
+    @property
+    def items(self):
+        return self._get("items", lambda: list(self.catalog.get_all_items()))
+
+    @property
+    def catalog_href(self):
+        def build():
+            root = os.path.join(self.tmp_dir, "catalog")
+            stacframes.df_write(
+                pystac.Catalog("benchmark", "benchmark"),
+                self.frame,
+                root,
+                write_index=True,
+            )
+            return os.path.join(root, "catalog.json")
+
+        return self._get("catalog_href", build)
+
+    @property
+    def catalog_url(self):
+        """The url of catalog_href, served over HTTP from a thread until close()"""
+
+        def serve():
+            directory = os.path.dirname(self.catalog_href)
+            handler = functools.partial(_QuietHandler, directory=directory)
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+            return "http://127.0.0.1:{}/catalog.json".format(server.server_address[1])
+
+        return self._get("catalog_url", serve)
+
+    def path(self, name):
+        """A path in tmp_dir for the output of a case"""
+        return os.path.join(self.tmp_dir, name)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _read_catalog(workload):
+    href = workload.catalog_href
+    return lambda: stacframes.df_from(pystac.Catalog.from_file(href))
+
+
+def _query_catalog(workload):
+    href = workload.catalog_href
+    item_id = workload.frame["id"].iloc[len(workload.frame) // 2]
+    return lambda: stacframes.df_from(
+        pystac.Catalog.from_file(href), ids=[item_id], use_index=True
+    )
+
+
+def _iter_catalog(workload):
+    href = workload.catalog_href
+
+    def run():
+        catalog = pystac.Catalog.from_file(href)
+        return sum(len(chunk) for chunk in stacframes.iter_df_from(catalog))
+
+    return run
+
+
+def _write_partitioned(workers):
+    def case(workload):
+        href = workload.catalog_href
+        counter = iter(range(sys.maxsize))
+
+        def run():
+            catalog = pystac.Catalog.from_file(href)
+            partitioned = stacframes.df_from(catalog, partitioned=True)
+            root = workload.path("partitioned-{}".format(next(counter)))
+            stacframes.df_write(
+                pystac.Catalog("benchmark", "benchmark"),
+                partitioned,
+                root,
+                workers=workers,
+            )
+
+        return run
+
+    return case
+
+
+def _read_url(workload):
+    url = workload.catalog_url
+    return lambda: stacframes.df_from_url(url)
+
+
+def _write_ndjson(workload):
+    frame = workload.frame
+    return lambda: stacframes.df_to_ndjson(frame, workload.path("items.ndjson"))
+
+
+def _read_ndjson(workload):
+    path = workload.path("read.ndjson")
+    stacframes.df_to_ndjson(workload.frame, path)
+    return lambda: stacframes.df_from_ndjson(path)
+
+
+def _write_parquet(workload):
+    frame = stacframes.df_from(workload.catalog)
+    return lambda: stacframes.to_parquet(frame, workload.path("items.parquet"))
+
+
+def _read_parquet(workload):
+    path = workload.path("read.parquet")
+    stacframes.to_parquet(stacframes.df_from(workload.catalog), path)
+    return lambda: stacframes.read_parquet(path)
+
+
+def _df_write(workload):
+    frame = workload.frame
+    counter = iter(range(sys.maxsize))
+
+    def run():
+        root = workload.path("df_write-{}".format(next(counter)))
+        stacframes.df_write(pystac.Catalog("benchmark", "benchmark"), frame, root)
+
+    return run
+
+
+def _from_properties(func):
+    def case(workload):
+        frame = workload.frame.drop(columns="parents")
+        return lambda: func(["p0", "p2"], frame)
+
+    return case
+
+
+def _from_properties_accum(func):
+    def case(workload):
+        frame = workload.frame.drop(columns="parents")
+        return lambda: func(["p0", "p2"], frame, prefix="dt", separator="-")
+
+    return case
+
+
+# Each case takes a Workload and returns the function to measure. Cases in
+# QUERY_CASES answer one query per call, and report queries rather than items
+# per second, with the number of items their last call returned. Cases named
+# ":series_from" and ":apply" time the implementations that df_from and the
+# parents helpers replaced, for comparison.
+CASES = {
+    "item_from": lambda w: lambda: [
+        stacframes.item_from(row) for _, row in w.frame.iterrows()
+    ],
+    "series_from": lambda w: lambda: [stacframes.series_from(i) for i in w.items],
+    "df_to": lambda w: lambda: generate_catalog(w.frame),
+    "df_from": lambda w: lambda: stacframes.df_from(w.catalog),
+    "df_from:series_from": lambda w: lambda: df_from_series(w.catalog),
+    "df_from:flatten_properties": lambda w: lambda: stacframes.df_from(
+        w.catalog, flatten_properties=True
+    ),
+    "df_from:catalog_file": _read_catalog,
+    "df_from:indexed_id_query": _query_catalog,
+    "df_from_path": lambda w: lambda: stacframes.df_from_path(w.catalog_href),
+    "df_from_url": _read_url,
+    "iter_df_from": _iter_catalog,
+    "df_write": _df_write,
+    "df_write:partitioned": _write_partitioned(None),
+    "df_write:partitioned_workers": _write_partitioned(os.cpu_count()),
+    "df_to_ndjson": _write_ndjson,
+    "df_from_ndjson": _read_ndjson,
+    "to_parquet": _write_parquet,
+    "read_parquet": _read_parquet,
+    "validate_df": lambda w: lambda: stacframes.validate_df(w.frame, schema=False),
+    "parents.from_properties": _from_properties(parents.from_properties),
+    "parents.from_properties:apply": _from_properties(from_properties_apply),
+    "parents.from_properties_accum": _from_properties_accum(
+        parents.from_properties_accum
+    ),
+    "parents.from_properties_accum:apply": _from_properties_accum(
+        from_properties_accum_apply
+    ),
+}
+
+QUERY_CASES = {"df_from:indexed_id_query"}
+
+
+def measure(func, repeat):
+    """The best wall time of repeat calls to func, the peak traced memory of one,
+    and the value that call returned
+
+    Peak memory is measured with tracemalloc in a separate call, so that tracing
+    does not slow down the timed calls. It covers allocations made through
+    Python's allocators, including numpy's, but not those made inside GEOS.
+
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        value = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(seconds), peak, value
+
+
+def environment():
+    """The commit, versions and machine that results were measured on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pystac": pystac.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def run(sizes, cases, repeat, options, output):
+    env = environment()
+    for n_items in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workload = Workload(n_items, tmp_dir, options)
+            try:
+                for name in cases:
+                    result = _run_case(name, workload, repeat)
+                    result.update(options=options, repeat=repeat, **env)
+                    output.write(json.dumps(result) + "\n")
+                    output.flush()
+            finally:
+                workload.close()
+
+
+def _run_case(name, workload, repeat):
+    n_items = workload.n_items
+    try:
+        func = CASES[name](workload)
+        seconds, peak, value = measure(func, repeat)
+    except ImportError as e:
+        return {"case": name, "items": n_items, "skipped": str(e)}
+    result = {"case": name, "items": n_items, "seconds": seconds}
+    if name in QUERY_CASES:
+        result["queries_per_second"] = 1 / seconds if seconds else None
+        result["items_returned"] = len(value)
+    else:
+        result["items_per_second"] = n_items / seconds if seconds else None
+    result["peak_memory_bytes"] = peak
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument(
+        "--cases", nargs="+", choices=sorted(CASES), default=list(CASES)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--properties", type=int, default=8)
+    parser.add_argument("--vertices", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Append results to this file, not stdout")
+    args = parser.parse_args()
+
+    options = {
+        "depth": args.depth,
+        "fanout": args.fanout,
+        "n_properties": args.properties,
+        "n_vertices": args.vertices,
+        "seed": args.seed,
+    }
+    if args.output:
+        with open(args.output, "a") as output:
+            run(args.sizes, args.cases, args.repeat, options, output)
+    else:
+        run(args.sizes, args.cases, args.repeat, options, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
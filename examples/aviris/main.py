@@ -159,13 +159,12 @@ def main():
         ["Year", "Flight"], df, prefix="aviris", separator="_"
     )
 
-    catalog = pystac.Catalog("aviris", AVIRIS_DESCRIPTION)
-    stacframes.df_to(catalog, df)
+    stacframes.validate_df(df, schema=True)
 
-    # Normalize before validation to set all the required object links
-    catalog.normalize_hrefs("./catalog")
-    catalog.validate_all()
-    catalog.save(catalog_type=pystac.CatalogType.SELF_CONTAINED)
+    catalog = pystac.Catalog("aviris", AVIRIS_DESCRIPTION)
+    stacframes.df_write(
+        catalog, df, "./catalog", catalog_type=pystac.CatalogType.SELF_CONTAINED
+    )
 
 
 if __name__ == "__main__":
@@ -8,8 +8,20 @@ setup(
     author_email="info@azavea.com",
     url="https://github.com/azavea/stacframes",
     license="Apache Software License 2.0",
-    packages=find_packages(),
-    install_requires=["pystac>=0.5.0", "geopandas>=0.7.0"],
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
+    python_requires=">=3.9",
+    install_requires=[
+        "geopandas>=0.13.0",
+        "pandas>=2.0.0",
+        "pystac>=1.6.0",
+        "shapely>=2.0.0",
+    ],
+    extras_require={
+        "fast": ["orjson>=3.0.0"],
+        "parquet": ["pyarrow>=13.0.0"],
+        "remote": ["aiohttp>=3.7.4"],
+        "validation": ["jsonschema>=3.2.0"],
+    },
     keywords=["pystac", "pandas", "DataFrame"],
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -17,8 +29,9 @@ setup(
         "License :: OSI Approved :: Apache Software License",
         "Natural Language :: English",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
+        "Programming Language :: Python :: 3.12",
     ],
 )
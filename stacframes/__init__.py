@@ -1,11 +1,42 @@
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import geopandas as gpd
+import functools
+import math
+import os
 import pandas as pd
 import pystac
 from shapely.geometry import mapping, shape
 
-from .parents import DEFAULT_PARENTS_COLUMN
-from .utils import build_recursive, update_collection_extents
+from . import assets
+from .builder import ColumnBuilder
+from .cache import df_from_cache
+from .convert import datetimes_to_str, geojson_from_geometries, reproject, STAC_CRS
+from .filters import ItemFilter
+from . import index
+from . import instrument as instruments
+from . import ndjson
+from .parents import DEFAULT_PARENTS_COLUMN, group_positions
+from .partitions import catalog_partitions, PartitionedFrame
+from .parquet import read_parquet, to_parquet  # noqa: F401
+from . import properties
+from .remote import df_from_url  # noqa: F401
+from .static import df_from_path  # noqa: F401
+from .utils import (  # noqa: F401
+    build_recursive,
+    CatalogBuilder,
+    empty_extent,
+    extents_from_frame,
+    index_items,
+    item_hash,
+    iter_items,
+    merge_extents,
+    refresh_extents,
+    remove_items,
+    resolve_items,
+    set_collection_extents,
+)
+from . import validate
 
 
 def item_from(series):
@@ -21,6 +52,12 @@ def item_from(series):
         - assets (dict)
         - links (list)
         - properties (dict)
+        - properties.<key> (any), as created by stacframes.properties.flatten.
+          Values that are not missing are added to properties under <key>,
+          and None is added as null.
+        - assets.<key>.<field> (any), as created by stacframes.assets.templatize.
+          Each asset is rebuilt from its template in series.attrs and the
+          fields that are not missing.
 
     If you wish to encode STAC Assets and Links it is recommended that you construct
     the actual pystac objects in your code and then call `to_dict()` on them before
@@ -37,15 +74,39 @@ def item_from(series):
         pystac.Item
 
     Note:
-        Ensure your geometry column is reprojected to EPSG:4326 prior to use
+        Ensure your geometry column is reprojected to EPSG:4326 prior to use.
+        stacframes.df_to and stacframes.df_write do this for a GeoDataFrame in
+        any other crs.
     """
-    series_dict = series.to_dict()
+    return _item_from_dict(series.to_dict(), series.attrs.get(assets.TEMPLATES_ATTR))
+
+
+def _item_from_dict(series_dict, templates=None):
+    """item_from for one row of a frame as a dict, which is modified in place
+
+    The geometry may already be a GeoJSON dict and the datetime an RFC 3339
+    string, as produced in bulk by _item_records.
+
+    """
+    if templates is not None:
+        templated = assets.templated_columns(series_dict, templates)
+        row = {name: series_dict.pop(name) for name in templated}
+        series_dict["assets"] = assets.asset_dicts(row, templates)
 
     series_dict.setdefault("stac_version", pystac.get_stac_version())
     series_dict.setdefault("type", "Feature")
     series_dict.setdefault("assets", {})
     series_dict.setdefault("links", [])
-    series_dict.setdefault("properties", {})
+    # Copy so that the dataframe's own properties dicts are not modified
+    series_dict["properties"] = properties.to_python(
+        series_dict.get("properties") or {}
+    )
+    flattened = [k for k in series_dict if str(k).startswith(properties.PREFIX)]
+    for name in flattened:
+        value = series_dict.pop(name)
+        if not properties.is_absent(value):
+            key = name.replace(properties.PREFIX, "", 1)
+            series_dict["properties"][key] = properties.to_python(value)
 
     dt = series_dict.get("datetime", None)
     if dt and series_dict["properties"].get("datetime", None) is None:
@@ -53,11 +114,61 @@ def item_from(series):
         series_dict["properties"]["datetime"] = dt_str
         del series_dict["datetime"]
 
-    series_dict["geometry"] = mapping(series_dict["geometry"])
+    if not isinstance(series_dict["geometry"], dict):
+        series_dict["geometry"] = mapping(series_dict["geometry"])
     # from_dict handles associating any Links and Assets with the Item
     return pystac.Item.from_dict(series_dict)
 
 
+# The top-level columns of an item that are kept in its record when missing
+_ITEM_COLUMNS = {
+    "type",
+    "stac_version",
+    "stac_extensions",
+    "id",
+    "geometry",
+    "bbox",
+    "datetime",
+    "properties",
+    "links",
+    "assets",
+}
+
+
+def _item_records(dataframe, parents_col=None):
+    """The rows of dataframe as dicts for _item_from_dict
+
+    Geometries and datetimes are converted to GeoJSON and RFC 3339 strings for
+    all rows at once rather than in each call to item_from. The parents_col
+    value of each row only places its item in the catalog, and is left out, as
+    are missing values in columns other than those of _ITEM_COLUMNS.
+
+    """
+    records = dataframe.to_dict("records")
+    if parents_col in dataframe.columns:
+        for record in records:
+            del record[parents_col]
+    # A missing value in any other top-level column, as left by concatenating
+    # frames with different columns, is a field the item does not have
+    for name in dataframe.columns:
+        if name in _ITEM_COLUMNS or name == parents_col:
+            continue
+        if str(name).startswith((properties.PREFIX, assets.PREFIX)):
+            continue
+        missing = dataframe[name].isna().to_numpy()
+        for position in missing.nonzero()[0]:
+            del records[position][name]
+    if "geometry" in dataframe.columns:
+        geojsons = geojson_from_geometries(dataframe["geometry"])
+        for record, geojson in zip(records, geojsons):
+            record["geometry"] = geojson
+    if "datetime" in dataframe.columns:
+        datetimes = datetimes_to_str(dataframe["datetime"])
+        for record, dt in zip(records, datetimes):
+            record["datetime"] = dt
+    return records
+
+
 def series_from(item):
     """Convert item to a pandas.Series
 
@@ -91,47 +202,837 @@ def series_from(item):
     return pd.Series(item_dict, name=item_id)
 
 
-def df_to(catalog, dataframe, parents_col=DEFAULT_PARENTS_COLUMN):
+def df_to(
+    catalog,
+    dataframe,
+    parents_col=DEFAULT_PARENTS_COLUMN,
+    mode="add",
+    delete_missing=False,
+    instrument=None,
+):
     """Add all items in dataframe to catalog
 
+    Rows are grouped by their parents so that each collection in the tree is
+    looked up or created once, and each group's items are added together.
+    Collection extents along each parents path are then computed from the
+    bbox and datetime columns of dataframe rather than by re-reading the items.
+
+    A GeoDataFrame in a crs other than EPSG:4326 is first reprojected to it,
+    with its bbox column recomputed from the reprojected geometries.
 
+    With mode="upsert", rows are instead diffed by id against the items already
+    in catalog. Items whose content or parents are unchanged are left alone,
+    changed items are replaced, and only the collections along the paths of
+    added, replaced or removed items have their extents recomputed.
+
+    dataframe may also be a stacframes.partitions.PartitionedFrame, whose
+    partitions are loaded and added one at a time, with the extents of all of
+    them merged at the end. Only mode="add" accepts one.
 
     Args:
-        dataframe (pandas.DataFrame): A DataFrame of rows structured as described
-            by stacframes.item_from.
+        dataframe (pandas.DataFrame | stacframes.partitions.PartitionedFrame): A
+            DataFrame of rows structured as described by stacframes.item_from.
         catalog (pystac.Catalog): The Catalog to add the items in dataframe to.
         parents_col (str): A column in dataframe that contains a list of
             collection ids to attach the item to. The collections are
             created in the pystac catalog tree if they do not exist.
             `stacframes.parents` contains a few helper methods for generating the
             parents column, and examples/aviris/main.py presents an example.
+        mode (str): Either "add" to add every row as a new item, or "upsert" to
+            add or replace only the items that differ from those in catalog.
+        delete_missing (bool): Only with mode="upsert". Remove items from
+            catalog whose id is not in dataframe.
+        instrument (stacframes.instrument.Instrument): Optional. Receives the
+            time spent in each stage and a progress event after each collection's
+            items are added. Nothing is timed if it is not set.
+
+    """
+    if mode not in ("add", "upsert"):
+        raise ValueError("mode {} must be 'add' or 'upsert'".format(mode))
+    if delete_missing and mode != "upsert":
+        raise ValueError("delete_missing requires mode='upsert'")
+
+    partitioned = isinstance(dataframe, PartitionedFrame)
+    if partitioned and mode != "add":
+        raise ValueError("mode='upsert' does not accept a PartitionedFrame")
+
+    total = None if partitioned else len(dataframe)
+    recorder = instruments.record(instrument, "df_to", total)
+    builder = CatalogBuilder(catalog, "collection")
+    start = recorder.clock()
+    if mode == "upsert":
+        dataframe = reproject(assets.expand(properties.nest(dataframe)), STAC_CRS)
+        groups = group_positions(dataframe, parents_col)
+        start = recorder.lap("prepare", start, len(dataframe))
+        _upsert(
+            builder, dataframe, groups, parents_col, delete_missing, recorder, start
+        )
+        recorder.finish()
+        return
+
+    extents = {}
+    for frame in dataframe.iter_partitions() if partitioned else [dataframe]:
+        if partitioned:
+            start = recorder.lap("load_partitions", start, len(frame))
+        frame = reproject(assets.expand(properties.nest(frame)), STAC_CRS)
+        groups = group_positions(frame, parents_col)
+        start = recorder.lap("prepare", start, len(frame))
+        records = _item_records(frame, parents_col)
+        for parents, positions in groups.items():
+            items = [_item_from_dict(records[i]) for i in positions]
+            start = recorder.lap("item_from", start, len(items))
+            child_catalog = builder.get(parents)
+            start = recorder.lap("build_collections", start)
+            child_catalog.add_items(items)
+            start = recorder.lap("add_items", start, len(items))
+            recorder.advance(len(items))
+        if groups:
+            extents = merge_extents(extents, extents_from_frame(frame, groups))
+            start = recorder.lap("collection_extents", start)
+
+    if extents:
+        set_collection_extents(builder.catalogs, extents)
+        recorder.lap("collection_extents", start, len(extents))
+    recorder.finish()
+
+
+def _upsert(builder, dataframe, groups, parents_col, delete_missing, recorder, start):
+    """Add, replace and remove only the items that differ between builder and dataframe"""
+    existing = index_items(builder)
+    start = recorder.lap("index_existing", start, len(existing))
+    records = _item_records(dataframe, parents_col)
+    seen = set()
+    removals = defaultdict(set)
+    additions = defaultdict(list)
+    for parents, positions in groups.items():
+        items = [_item_from_dict(records[i]) for i in positions]
+        start = recorder.lap("item_from", start, len(items))
+        for item in items:
+            seen.add(item.id)
+            found = existing.get(item.id)
+            if found is not None:
+                path, current = found
+                if path == parents and item_hash(current) == item_hash(item):
+                    continue
+                removals[path].add(item.id)
+            additions[parents].append(item)
+        start = recorder.lap("diff", start, len(items))
+        recorder.advance(len(items))
+    if delete_missing:
+        for item_id, (path, _) in existing.items():
+            if item_id not in seen:
+                removals[path].add(item_id)
+
+    for path, item_ids in removals.items():
+        remove_items(builder.catalogs[path], item_ids)
+        start = recorder.lap("remove_items", start, len(item_ids))
+    for parents, items in additions.items():
+        child_catalog = builder.get(parents)
+        start = recorder.lap("build_collections", start)
+        child_catalog.add_items(items)
+        start = recorder.lap("add_items", start, len(items))
+    paths = set(removals) | set(additions)
+    refresh_extents(builder.catalogs, paths)
+    recorder.lap("collection_extents", start, len(paths))
+
+
+def validate_df(dataframe, parents_col=DEFAULT_PARENTS_COLUMN, schema=False):
+    """Check that every row of dataframe can be added to a catalog as a valid Item
+
+    Each check runs over whole columns, before any pystac object is built:
+        - the id, geometry and bbox columns exist
+        - ids are strings and unique
+        - geometries are present, non-empty and valid
+        - each bbox has 4 or 6 numbers and contains its geometry, unless
+          dataframe is a GeoDataFrame whose crs is not EPSG:4326
+        - each row has a datetime, or a start_datetime and end_datetime property
+        - properties are dicts of JSON values, without NaN or infinity, in
+          nested dicts and lists too
+        - parents are lists of strings
+
+    If they all pass and schema is True, one Item is then built from the first
+    row of each distinct layout of property keys, asset keys and fields, and
+    stac_extensions, and validated against the STAC JSON Schemas with
+    pystac.Item.validate. This replaces validating every item after the
+    catalog is built, e.g. with catalog.validate_all().
+
+    Example:
+    ```
+    stacframes.validate_df(df)
+    stacframes.df_write(catalog, df, "./catalog")
+    ```
+
+    Args:
+        dataframe (pandas.DataFrame): A DataFrame of rows structured as described
+            by stacframes.item_from.
+        parents_col (str): See stacframes.df_to.
+        schema (bool): Optional. If True, also validate one Item per layout
+            against the STAC JSON Schemas. This requires jsonschema, installed
+            with stacframes[validation], and usually network access to fetch
+            the schemas. Defaults to False, running only the column checks.
+
+    Raises:
+        stacframes.validate.ValidationError: With one message per failed check
+
+    """
+    if schema:
+        validate.require_jsonschema()
+    errors = validate.check_frame(dataframe, parents_col)
+    if errors:
+        raise validate.ValidationError(errors)
+    if not schema:
+        return
+
+    samples = list(validate.layouts(dataframe).values())
+    rows = dataframe.iloc[[position for position, _ in samples]]
+    rows = reproject(assets.expand(properties.nest(rows)), STAC_CRS)
+    for label, record, (_, count) in zip(
+        rows.index, _item_records(rows, parents_col), samples
+    ):
+        try:
+            _item_from_dict(record).validate()
+        except pystac.errors.STACValidationError as e:
+            errors.append(
+                "{} row(s) with the layout of index {} fail schema validation: {}".format(
+                    count, label, e
+                )
+            )
+    if errors:
+        raise validate.ValidationError(errors)
+
+
+def df_write(
+    catalog,
+    dataframe,
+    root_href,
+    parents_col=DEFAULT_PARENTS_COLUMN,
+    catalog_type=pystac.CatalogType.SELF_CONTAINED,
+    workers=None,
+    write_index=False,
+    instrument=None,
+):
+    """Write all items in dataframe as a STAC catalog rooted at root_href
+
+    Unlike df_to followed by normalize_hrefs and save, no pystac.Item is kept in
+    memory: each row is converted and its JSON written to disk as soon as it is
+    produced, using the hrefs of pystac's best practices layout. The catalog
+    and collection JSON is written last, with item links and extents
+    computed from dataframe.
+
+    dataframe may also be a stacframes.partitions.PartitionedFrame. Each of its
+    partitions is then loaded, converted and written on its own, in a worker
+    process if workers is set, and only the hrefs, bboxes and datetimes of
+    the items written are sent back to merge into the collections and their
+    extents. Catalogs larger than memory can be converted this way.
+
+    Example:
+    ```
+    catalog = pystac.Catalog("aviris", AVIRIS_DESCRIPTION)
+    stacframes.df_write(catalog, df, "./catalog")
+    ```
+
+    Args:
+        catalog (pystac.Catalog): The root Catalog. It is written to
+            root_href/catalog.json along with the collections created for
+            the parents column.
+        dataframe (pandas.DataFrame | stacframes.partitions.PartitionedFrame): A
+            DataFrame of rows structured as described by stacframes.item_from.
+        root_href (str): The directory to write the catalog to.
+        parents_col (str): See stacframes.df_to.
+        catalog_type (pystac.CatalogType): The type of catalog to write.
+        workers (int): Optional. If set, dataframe is split into partitions that
+            are converted, serialized and written by this many processes. The
+            files written are identical to those written serially. Items are
+            written with pystac.StacIO.default() in each process. The
+            partitions of a PartitionedFrame are also loaded in the processes.
+        write_index (bool): Optional. If True, also write the index read by
+            stacframes.df_from to answer bbox, datetime and ids queries. See
+            stacframes.index.write_index.
+        instrument (stacframes.instrument.Instrument): Optional. Receives the
+            time spent in each stage and a progress event after each partition
+            of items is written. Nothing is timed if it is not set.
+
+    """
+    if isinstance(dataframe, PartitionedFrame):
+        recorder = instruments.record(instrument, "df_write")
+        _write_partitions(
+            catalog,
+            dataframe,
+            root_href,
+            parents_col,
+            catalog_type,
+            workers,
+            write_index,
+            recorder,
+        )
+        recorder.finish()
+        return
+
+    recorder = instruments.record(instrument, "df_write", len(dataframe))
+    start = recorder.clock()
+    dataframe = reproject(assets.expand(properties.nest(dataframe)), STAC_CRS)
+    groups = group_positions(dataframe, parents_col)
+    start = recorder.lap("prepare", start, len(dataframe))
+    builder = CatalogBuilder(catalog, "collection")
+    for parents in groups:
+        builder.get(parents)
+    catalog.normalize_hrefs(root_href)
+    start = recorder.lap("build_collections", start, len(builder.catalogs))
+
+    root = _LinkTarget(catalog.get_self_href(), catalog.title, None)
+    step = None
+    if workers:
+        step = max(1, math.ceil(len(dataframe) / (workers * 4)))
+    chunks = _write_chunks(builder, groups, step)
+
+    written = []
+    if workers:
+        # Slice and submit chunks as earlier ones finish, so that only a few
+        # chunks are copied and pickled at a time
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for parent, positions, target in chunks:
+                rows = dataframe.iloc[positions]
+                args = (rows, target, root, catalog_type, parents_col)
+                pending.append((parent, executor.submit(_write_items, *args)))
+                if len(pending) >= 2 * workers:
+                    parent, future = pending.popleft()
+                    written.append((parent, future.result()))
+                    recorder.advance(len(written[-1][1]))
+            while pending:
+                parent, future = pending.popleft()
+                written.append((parent, future.result()))
+                recorder.advance(len(written[-1][1]))
+    else:
+        for parent, positions, target in chunks:
+            rows = dataframe.iloc[positions]
+            entries = _write_items(rows, target, root, catalog_type, parents_col)
+            written.append((parent, entries))
+            recorder.advance(len(entries))
+    for parent, entries in written:
+        _add_item_links(parent, entries)
+    start = recorder.lap("write_items", start, len(dataframe))
+
+    if groups:
+        set_collection_extents(builder.catalogs, extents_from_frame(dataframe, groups))
+        start = recorder.lap("collection_extents", start, len(builder.catalogs))
+    catalog.save(catalog_type=catalog_type)
+    start = recorder.lap("save_catalog", start, len(builder.catalogs))
+    if write_index:
+        index.write_index(catalog, _ordered_entries(catalog, written))
+        recorder.lap("write_index", start, len(dataframe))
+    recorder.finish()
+
+
+def _write_chunks(builder, groups, step):
+    """Yield (parent, positions, link target) for each chunk of rows df_write writes
+
+    Each group of positions is split into chunks of at most step rows, or
+    kept whole if step is None.
+
+    """
+    for parents, positions in groups.items():
+        parent = builder.catalogs[parents]
+        target = _link_target(parent)
+        size = step or len(positions)
+        for first in range(0, len(positions), size):
+            stop = first + size
+            yield parent, positions[first:stop], target
+
+
+def _write_partitions(
+    catalog,
+    partitioned,
+    root_href,
+    parents_col,
+    catalog_type,
+    workers,
+    write_index,
+    recorder,
+):
+    """df_write for a PartitionedFrame, loading and writing each partition in turn
+
+    Collections that do not exist yet are linked to by their href under
+    pystac's best practices layout before they are created, so that workers
+    need nothing but the hrefs of the catalogs that already exist.
+
+    """
+    start = recorder.clock()
+    builder = CatalogBuilder(catalog, "collection")
+    catalog.normalize_hrefs(root_href)
+    targets = {path: _link_target(node) for path, node in builder.walk()}
+    root = _LinkTarget(catalog.get_self_href(), catalog.title, None)
+    start = recorder.lap("build_collections", start, len(targets))
+
+    write = functools.partial(
+        _write_partition,
+        parents_col=parents_col,
+        targets=targets,
+        root=root,
+        catalog_type=catalog_type,
+    )
+    written = []
+    extents = {}
+    count = 0
+    for partition_written, partition_extents in partitioned.iter_apply(write, workers):
+        written.extend(partition_written)
+        extents = merge_extents(extents, partition_extents)
+        items = sum(len(entries) for _, entries in partition_written)
+        count += items
+        recorder.advance(items)
+    start = recorder.lap("write_items", start, count)
+
+    written = [(builder.get(parents), entries) for parents, entries in written]
+    catalog.normalize_hrefs(root_href)
+    for parent, entries in written:
+        _add_item_links(parent, entries)
+    start = recorder.lap("build_collections", start)
+    if extents:
+        set_collection_extents(builder.catalogs, extents)
+        start = recorder.lap("collection_extents", start, len(extents))
+    catalog.save(catalog_type=catalog_type)
+    start = recorder.lap("save_catalog", start, len(builder.catalogs))
+    if write_index:
+        index.write_index(catalog, _ordered_entries(catalog, written))
+        recorder.lap("write_index", start, count)
+
+
+def _write_partition(dataframe, parents_col, targets, root, catalog_type):
+    """Write the items of one partition, returning their entries and extents
+
+    Only plain values are passed in so that this can run in a worker process.
+
+    Returns:
+        tuple: ([(parents, index entries)], parents tuple -> pystac.Extent)
+
+    """
+    dataframe = reproject(assets.expand(properties.nest(dataframe)), STAC_CRS)
+    groups = group_positions(dataframe, parents_col)
+    written = []
+    for parents, positions in groups.items():
+        target = targets.get(parents)
+        if target is None:
+            target = _LinkTarget(_collection_href(parents, targets), None, parents[-1])
+        rows = dataframe.iloc[positions]
+        entries = _write_items(rows, target, root, catalog_type, parents_col)
+        written.append((parents, entries))
+    extents = extents_from_frame(dataframe, groups) if groups else {}
+    return written, extents
+
+
+def _collection_href(parents, targets):
+    """The href the collection at parents will have once it is created and normalized
+
+    The href is derived from that of its nearest ancestor in targets with the
+    layout strategy pystac's normalize_hrefs uses by default.
+
+    """
+    strategy = pystac.layout.BestPracticesLayoutStrategy()
+    depth = len(parents)
+    while parents[:depth] not in targets:
+        depth -= 1
+    href = targets[parents[:depth]].href
+    for child_id in parents[depth:]:
+        collection = pystac.Collection(child_id, child_id, empty_extent())
+        href = strategy.get_href(collection, os.path.dirname(href))
+    return href
+
+
+def _add_item_links(parent, entries):
+    """Link parent to the item written at the href of each index entry"""
+    for item_href, *_ in entries:
+        parent.add_link(
+            pystac.Link(
+                pystac.RelType.ITEM, item_href, media_type=pystac.MediaType.GEOJSON
+            )
+        )
+
+
+def _ordered_entries(catalog, written):
+    """The index entries of the items written by df_write, in get_all_items order
+
+    Args:
+        written (iterable[tuple]): (parent catalog, index entries) pairs
+
+    """
+    by_parent = defaultdict(list)
+    for parent, entries in written:
+        by_parent[id(parent)].extend(entries)
+    for _, current in CatalogBuilder(catalog).walk():
+        yield from by_parent[id(current)]
+
+
+# The href, title and collection id of a catalog that items link to
+_LinkTarget = namedtuple("_LinkTarget", ["href", "title", "collection_id"])
+
+
+def _link_target(catalog):
+    return _LinkTarget(
+        catalog.get_self_href(),
+        catalog.title,
+        catalog.id if isinstance(catalog, pystac.Collection) else None,
+    )
+
+
+def _write_items(rows, parent, root, catalog_type, parents_col):
+    """Convert and write each row under parent, returning their index entries
+
+    The first value of each entry is the href the item was written to. The
+    parents_col value of each row only places the item in the catalog, and is
+    not written into its JSON.
+
+    Only plain values are passed in so that this can run in a worker process.
 
     """
+    stac_io = pystac.StacIO.default()
+    strategy = pystac.layout.BestPracticesLayoutStrategy()
+    parent_dir = os.path.dirname(parent.href)
+    entries = []
+    for record in _item_records(rows, parents_col):
+        item = _item_from_dict(record)
+        item_href = strategy.get_href(item, parent_dir)
+        stac_io.save_json(
+            item_href, _item_dict(item, item_href, parent, root, catalog_type)
+        )
+        entries.append(index.index_entry(item, item_href))
+    return entries
+
+
+def _item_dict(item, item_href, parent, root, catalog_type):
+    """item.to_dict() as if item were saved at item_href under parent in root
 
-    def handle_row(series):
-        parents_list = series.get(parents_col, [])
-        child_catalog = build_recursive(catalog, parents_list, "collection")
-        item = item_from(series)
-        child_catalog.add_item(item)
+    parent and root are _LinkTarget.
+
+    """
+    absolute = catalog_type == pystac.CatalogType.ABSOLUTE_PUBLISHED
 
-    dataframe.apply(handle_row, axis=1)
+    def link(rel, target, href):
+        href = href if absolute else pystac.utils.make_relative_href(href, item_href)
+        link_dict = {"rel": rel, "href": href, "type": pystac.MediaType.JSON}
+        if target is not None and target.title:
+            link_dict["title"] = target.title
+        return link_dict
 
-    update_collection_extents(catalog)
+    if parent.collection_id is not None:
+        item.collection_id = parent.collection_id
+    item_dict = item.to_dict(include_self_link=False, transform_hrefs=False)
+    links = [
+        link_dict
+        for link_dict in item_dict["links"]
+        if link_dict["rel"] not in ("root", "collection", "parent", "self")
+    ]
+    links.append(link("root", root, root.href))
+    if parent.collection_id is not None:
+        links.append(link("collection", parent, parent.href))
+    links.append(link("parent", parent, parent.href))
+    if absolute:
+        links.append(link("self", None, item_href))
+    item_dict["links"] = links
+    return item_dict
 
 
-def df_from(catalog, crs="EPSG:4326"):
+def df_from(
+    catalog,
+    crs="EPSG:4326",
+    workers=None,
+    bbox=None,
+    datetime=None,
+    ids=None,
+    where=None,
+    cache_dir=None,
+    flatten_properties=False,
+    templatize_assets=False,
+    use_index=False,
+    instrument=None,
+    partitioned=False,
+    partition_depth=1,
+):
     """Read catalog into a new geopandas.GeoDataFrame
 
-    Reprojects GeoDataFrame to the provided crs
+    Reprojects GeoDataFrame to the provided crs, transforming all geometries in
+    one batch and recomputing the bbox column from them
+
+    The bbox, datetime, ids and where filters are applied while walking the
+    catalog, before items are converted to rows. Child collections whose extent
+    cannot contain a matching item are skipped entirely. See
+    stacframes.filters.ItemFilter for the accepted values.
+
+    Example:
+    ```
+    df = stacframes.df_from(
+        catalog,
+        bbox=[-80.0, 35.0, -75.0, 40.0],
+        datetime=(datetime(2019, 1, 1), None),
+        where=lambda properties: properties["Pixel Size"] < 5,
+    )
+    ```
 
     Args:
         catalog (pystac.Catalog): The Catalog to read STAC Items from.
         crs (any): Optional. Value can be anything accepted by
             http://pyproj4.github.io/pyproj/stable/api/crs/crs.html#pyproj.crs.CRS.from_user_input
+        workers (int): Optional. If set, unresolved items are first read from
+            their hrefs concurrently in this many threads. Row order is the same
+            as when reading serially.
+        bbox (list[float]): Optional. Keep items whose bbox intersects bbox.
+        datetime (datetime | str | tuple): Optional. Keep items overlapping
+            this datetime or (start, end) range.
+        ids (iterable[str]): Optional. Keep items with these ids.
+        where (callable): Optional. Keep items for which where(properties) is True.
+        cache_dir (str): Optional. If set, the rows read from each catalog in the
+            tree are cached in this directory, keyed on the modification times
+            and sizes of its JSON files, and reused by later calls until those
+            files change. Only catalogs read from local files are cached. Cannot
+            be combined with the filters.
+        flatten_properties (bool): Optional. If True, the properties column is
+            replaced by one typed column per property key, named
+            "properties.<key>". See stacframes.properties.flatten.
+        templatize_assets (bool): Optional. If True, the assets column is
+            replaced by one template per asset key in the frame's attrs and
+            columns holding only the fields that differ between rows, named
+            "assets.<key>.<field>". See stacframes.assets.templatize.
+        use_index (bool): Optional. If True and catalog has an index written by
+            stacframes.index.write_index or df_write, the bbox, datetime and ids
+            filters are answered from the index and only the matching items are
+            read, from their files. Their links are listed self link first.
+            The index of a local catalog is ignored once any catalog or
+            collection file, or the file of any matching item, changed after
+            the index was written. Rewrite it after editing items in place
+            so that they match different filters, and whenever a remote
+            catalog changes, as those changes cannot be detected.
+        instrument (stacframes.instrument.Instrument): Optional. Receives the
+            time spent in each stage and a progress event every
+            stacframes.instrument.PROGRESS_INTERVAL items read. Nothing is timed
+            if it is not set.
+        partitioned (bool): Optional. If True, nothing is read yet and a
+            stacframes.partitions.PartitionedFrame is returned instead, with one
+            partition for the subtree of each catalog partition_depth levels
+            below catalog and one for the items of each catalog above them.
+            Each partition is read from its catalog's href when it is loaded,
+            in a worker process when passed to df_write or compute with
+            workers, and has a parents column so that it can be written back
+            with df_to or df_write. Cannot be combined with the filters,
+            cache_dir, flatten_properties or templatize_assets.
+        partition_depth (int): Optional. See partitioned.
 
     Returns:
+        geopandas.GeoDataFrame | stacframes.partitions.PartitionedFrame
+
+    """
+    item_filter = ItemFilter(bbox=bbox, datetime=datetime, ids=ids, where=where)
+    if partitioned:
+        if item_filter or cache_dir or flatten_properties or templatize_assets:
+            raise ValueError(
+                "partitioned cannot be combined with filters, cache_dir, "
+                "flatten_properties or templatize_assets"
+            )
+        return catalog_partitions(catalog, depth=partition_depth, crs=crs)
+    if cache_dir is not None and item_filter:
+        raise ValueError("cache_dir cannot be combined with item filters")
+    recorder = instruments.record(instrument, "df_from")
+    start = recorder.clock()
+    if cache_dir is not None:
+        dataframe = df_from_cache(catalog, cache_dir, crs=crs, workers=workers)
+        recorder.advance(len(dataframe))
+        start = recorder.lap("read_cache", start, len(dataframe))
+    else:
+        items = None
+        if use_index and item_filter:
+            catalog_index = index.CatalogIndex.load(catalog)
+            if catalog_index is not None:
+                items = catalog_index.items(item_filter, workers=workers)
+        if items is not None:
+            start = recorder.lap("read_index", start, len(items))
+        else:
+            if workers:
+                resolve_items(catalog, workers, item_filter)
+                start = recorder.lap("resolve_items", start)
+            items = iter_items(catalog, item_filter)
+        builder = ColumnBuilder()
+        builder.extend(recorder.track(item.to_dict() for item in items))
+        start = recorder.lap("read_items", start, len(builder))
+        dataframe = builder.to_frame(crs=crs)
+        start = recorder.lap("build_frame", start, len(dataframe))
+    if flatten_properties:
+        dataframe = properties.flatten(dataframe)
+        start = recorder.lap("flatten_properties", start, len(dataframe))
+    if templatize_assets:
+        dataframe = assets.templatize(dataframe)
+        recorder.lap("templatize_assets", start, len(dataframe))
+    recorder.finish()
+    return dataframe
+
+
+def iter_df_from(catalog, chunk_size=10000, crs="EPSG:4326", **filters):
+    """Read catalog into a sequence of geopandas.GeoDataFrame chunks
+
+    Items are read lazily in the order of catalog.get_all_items(), and each
+    item link read from a file is reset to its href once the item is in a
+    chunk, so at most chunk_size items are held in columns at once and none
+    are kept in catalog's tree. Each chunk is structured like the result
+    of stacframes.df_from, and repeats the columns of the chunks before it in
+    the same order, filling them with NaN where missing. Top-level item keys
+    first seen in a later chunk are appended as new columns from that chunk on.
+
+    Example:
+    ```
+    for chunk in stacframes.iter_df_from(catalog, chunk_size=50000):
+        chunk.to_file("items.gpkg", mode="a")
+    ```
+
+    Args:
+        catalog (pystac.Catalog): The Catalog to read STAC Items from.
+        chunk_size (int): The maximum number of rows in each chunk.
+        crs (any): Optional. Value can be anything accepted by
+            http://pyproj4.github.io/pyproj/stable/api/crs/crs.html#pyproj.crs.CRS.from_user_input
+        filters: Optional. Any of the bbox, datetime, ids and where filters
+            accepted by stacframes.df_from.
+
+    Yields:
         geopandas.GeoDataFrame
 
     """
-    series = [series_from(item) for item in catalog.get_all_items()]
-    return gpd.GeoDataFrame(series, crs=crs)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    columns = None
+    builder = ColumnBuilder()
+    for item in iter_items(catalog, ItemFilter(**filters), keep=False):
+        builder.append(item.to_dict())
+        if len(builder) == chunk_size:
+            chunk, columns = _conform(builder.to_frame(crs=crs), columns)
+            yield chunk
+            builder = ColumnBuilder()
+    if len(builder):
+        yield _conform(builder.to_frame(crs=crs), columns)[0]
+
+
+def _conform(chunk, columns):
+    """Reindex chunk to columns plus its own new columns, returning both"""
+    if columns is None:
+        return chunk, list(chunk.columns)
+    columns = columns + [c for c in chunk.columns if c not in columns]
+    if columns != list(chunk.columns):
+        chunk = chunk.reindex(columns=columns)
+    return chunk, columns
+
+
+def df_to_ndjson(
+    dataframe,
+    path,
+    parents_col=DEFAULT_PARENTS_COLUMN,
+    shard=False,
+    buffer_size=ndjson.BUFFER_SIZE,
+):
+    """Write all items in dataframe as newline-delimited JSON, one Item per line
+
+    Each line is a STAC Item, so a file can be read line by line into a
+    pystac.ItemCollection. Unlike df_write, no file is opened per item and no
+    catalog or collection JSON is written.
+
+    Example:
+    ```
+    stacframes.df_to_ndjson(df, "./items", shard=True)
+    df = stacframes.df_from_ndjson("./items")
+    ```
+
+    Args:
+        dataframe (pandas.DataFrame): A DataFrame of rows structured as described
+            by stacframes.item_from.
+        path (str): The file to write, or with shard=True the directory.
+        parents_col (str): Only with shard=True. See stacframes.df_to.
+        shard (bool): Optional. If True, the items of each parents path are
+            written to their own file, path/<parent>/.../items.ndjson, from which
+            df_from_ndjson restores parents_col. Each parent id is
+            percent-encoded as a directory name, see
+            stacframes.ndjson.quote_parent. Otherwise parents_col is not
+            written.
+        buffer_size (int): Optional. The size in bytes of each file's write
+            buffer.
+
+    Returns:
+        int: The number of items written
+
+    """
+    dataframe = reproject(assets.expand(properties.nest(dataframe)), STAC_CRS)
+    records = _item_records(dataframe)
+    if shard:
+        groups = group_positions(dataframe, parents_col)
+        # Check every parent id before any shard is written
+        paths = {parents: ndjson.shard_path(path, parents) for parents in groups}
+    else:
+        groups = {None: range(len(records))}
+        paths = {None: path}
+    count = 0
+    for parents, positions in groups.items():
+        item_dicts = (
+            _ndjson_dict(_item_from_dict(records[i]), parents_col) for i in positions
+        )
+        count += ndjson.write_items(paths[parents], item_dicts, buffer_size=buffer_size)
+    return count
+
+
+def _ndjson_dict(item, parents_col):
+    item_dict = item.to_dict(include_self_link=False, transform_hrefs=False)
+    item_dict.pop(parents_col, None)
+    return item_dict
+
+
+def df_from_ndjson(path, crs="EPSG:4326", parents_col=DEFAULT_PARENTS_COLUMN):
+    """Read items written by df_to_ndjson into a new geopandas.GeoDataFrame
+
+    The frame has the same index, columns and dtypes as stacframes.df_from.
+    When path is a directory written with shard=True, parents_col is restored
+    from the directory of each shard.
+
+    Args:
+        path (str): An ndjson file, or a directory written with shard=True
+        crs (any): Optional. Value can be anything accepted by
+            http://pyproj4.github.io/pyproj/stable/api/crs/crs.html#pyproj.crs.CRS.from_user_input
+        parents_col (str): Optional. The column to restore parents to.
+
+    Returns:
+        geopandas.GeoDataFrame
+
+    """
+    builder = ColumnBuilder()
+    builder.extend(_ndjson_rows(path, parents_col))
+    return builder.to_frame(crs=crs)
+
+
+def iter_df_from_ndjson(
+    path, chunk_size=10000, crs="EPSG:4326", parents_col=DEFAULT_PARENTS_COLUMN
+):
+    """Read items written by df_to_ndjson as a sequence of GeoDataFrame chunks
+
+    Lines are read lazily, so at most chunk_size items are held in columns at
+    once. Chunks are structured as described by stacframes.iter_df_from.
+
+    Args:
+        path (str): An ndjson file, or a directory written with shard=True
+        chunk_size (int): The maximum number of rows in each chunk.
+        crs (any): Optional. See stacframes.df_from_ndjson.
+        parents_col (str): Optional. See stacframes.df_from_ndjson.
+
+    Yields:
+        geopandas.GeoDataFrame
+
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    columns = None
+    builder = ColumnBuilder()
+    for row in _ndjson_rows(path, parents_col):
+        builder.append(row)
+        if len(builder) == chunk_size:
+            chunk, columns = _conform(builder.to_frame(crs=crs), columns)
+            yield chunk
+            builder = ColumnBuilder()
+    if len(builder):
+        yield _conform(builder.to_frame(crs=crs), columns)[0]
+
+
+def _ndjson_rows(path, parents_col):
+    for item_dict, parents in ndjson.iter_items(path):
+        if parents is not None:
+            item_dict[parents_col] = parents
+        yield item_dict
@@ -0,0 +1,125 @@
+""" Store the assets column of a frame as one template per asset key plus compact columns """
+from .properties import is_missing, to_python, typed_series
+
+
+PREFIX = "assets."
+
+# The key of dataframe.attrs that holds the templates of a templated frame
+TEMPLATES_ATTR = "asset_templates"
+
+
+def templatize(dataframe, column="assets"):
+    """Replace the assets dict column of dataframe with per asset key columns
+
+    For each asset key, the fields that have the same value in every row with
+    that asset, such as title, type and roles, are stored once in a template in
+    dataframe.attrs[TEMPLATES_ATTR]. The remaining fields are stored in columns
+    named PREFIX + key + "." + field, e.g. "assets.thumbnail.href", in the
+    position of the assets column. A row without an asset has a missing href.
+    "%" and "." in asset keys are written as "%25" and "%2E" in column names,
+    so that the columns of keys such as "a" and "a.b" cannot be confused.
+
+    stacframes.item_from and stacframes.df_to accept the templated layout, and
+    stacframes.assets.expand restores the assets column.
+
+    Args:
+        dataframe (pandas.DataFrame): A frame as returned by stacframes.df_from
+        column (str): The assets dict column to templatize
+
+    Returns:
+        pandas.DataFrame: A copy of dataframe with column replaced
+
+    """
+    records = [a if isinstance(a, dict) else {} for a in dataframe[column]]
+    by_key = {}
+    for record in records:
+        for key, asset in record.items():
+            by_key.setdefault(key, []).append(asset)
+
+    templates = {}
+    columns = {}
+    for key, key_assets in by_key.items():
+        fields = {}
+        for asset in key_assets:
+            fields.update(dict.fromkeys(asset))
+        template = {
+            field: key_assets[0][field]
+            for field in fields
+            if field != "href"
+            and all(field in a and a[field] == key_assets[0][field] for a in key_assets)
+        }
+        templates[key] = template
+        for field in fields:
+            if field in template:
+                continue
+            values = [record.get(key, {}).get(field) for record in records]
+            columns[_column(key, field)] = typed_series(values, dataframe.index)
+
+    order = []
+    for name in dataframe.columns:
+        order.extend(columns if name == column else [name])
+    templated = dataframe.drop(columns=column).assign(**columns)[order]
+    templated.attrs[TEMPLATES_ATTR] = templates
+    return templated
+
+
+def expand(dataframe, column="assets"):
+    """Rebuild the assets dict column of a frame templated by templatize
+
+    Args:
+        dataframe (pandas.DataFrame): A frame templated by
+            stacframes.assets.templatize
+        column (str): The assets dict column to create
+
+    Returns:
+        pandas.DataFrame: A copy of dataframe without the templated columns, or
+            dataframe itself if it is not templated
+
+    """
+    templates = dataframe.attrs.get(TEMPLATES_ATTR)
+    if templates is None:
+        return dataframe
+    templated = templated_columns(dataframe.columns, templates)
+    rows = dataframe[templated].to_dict("records")
+    expanded = dataframe.drop(columns=templated)
+    expanded[column] = [asset_dicts(row, templates) for row in rows]
+    del expanded.attrs[TEMPLATES_ATTR]
+    return expanded
+
+
+def templated_columns(columns, templates):
+    """The names in columns that hold a field of one of the assets in templates"""
+    prefixes = tuple(_column(key, "") for key in templates)
+    return [c for c in columns if isinstance(c, str) and c.startswith(prefixes)]
+
+
+def asset_dicts(row, templates):
+    """The assets dict of one row of a templated frame
+
+    Args:
+        row (dict): The row's templated columns and their values
+        templates (dict): The frame's templates
+
+    Returns:
+        dict: asset key -> asset dict
+
+    """
+    assets = {}
+    for key, template in templates.items():
+        prefix = _column(key, "")
+        fields = {
+            name.replace(prefix, "", 1): to_python(value)
+            for name, value in row.items()
+            if name.startswith(prefix) and not is_missing(value)
+        }
+        if "href" in fields:
+            assets[key] = dict(template, **fields)
+    return assets
+
+
+def _column(key, field):
+    return "{}{}.{}".format(PREFIX, _quote(key), field)
+
+
+def _quote(key):
+    return key.replace("%", "%25").replace(".", "%2E")
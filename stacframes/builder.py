@@ -0,0 +1,106 @@
+""" Columnar construction of the GeoDataFrame returned by stacframes.df_from() """
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from .convert import (
+    datetimes_from_str,
+    geometries_from_geojson,
+    reproject,
+    STAC_CRS,
+)
+
+
+# The columns of a frame built from pystac.Item.to_dict(), in order
+ITEM_COLUMNS = [
+    "type",
+    "stac_version",
+    "stac_extensions",
+    "id",
+    "geometry",
+    "bbox",
+    "properties",
+    "links",
+    "assets",
+    "datetime",
+]
+
+
+class ColumnBuilder:
+    """Accumulate STAC Item dicts into columns and build a GeoDataFrame once
+
+    The resulting frame is identical to building one stacframes.series_from()
+    Series per item and passing the list to geopandas.GeoDataFrame, but skips
+    the per-row Series allocation and alignment.
+
+    Example:
+    ```
+    builder = ColumnBuilder()
+    for item in catalog.get_all_items():
+        builder.append(item.to_dict())
+    df = builder.to_frame(crs="EPSG:4326")
+    ```
+
+    """
+
+    def __init__(self):
+        self._columns = {}
+        self._index = []
+
+    def __len__(self):
+        return len(self._index)
+
+    def append(self, item_dict):
+        """Add one STAC Item dict, as returned by pystac.Item.to_dict(), to the columns
+
+        item_dict["properties"] is copied rather than mutated.
+
+        """
+        length = len(self._index)
+        properties = dict(item_dict["properties"])
+        dt = properties.pop("datetime")
+        row = dict(item_dict, properties=properties, datetime=dt)
+        for key, value in row.items():
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = [np.nan] * length
+            column.append(value)
+        self._index.append(row["id"])
+        if len(row) != len(self._columns):
+            for column in self._columns.values():
+                if len(column) == length:
+                    column.append(np.nan)
+
+    def extend(self, item_dicts):
+        """Add each STAC Item dict in item_dicts"""
+        for item_dict in item_dicts:
+            self.append(item_dict)
+
+    def to_frame(self, crs="EPSG:4326"):
+        """Build a geopandas.GeoDataFrame from the accumulated columns
+
+        Item geometries are in EPSG:4326, and are reprojected to crs along with
+        the bbox column if it differs.
+
+        Args:
+            crs (any): Any value accepted by geopandas.GeoDataFrame
+
+        Returns:
+            geopandas.GeoDataFrame
+
+        """
+        if not self._index:
+            columns = {c: pd.Series([], dtype=object) for c in ITEM_COLUMNS}
+            columns["geometry"] = gpd.GeoSeries([])
+            columns["datetime"] = pd.Series([], dtype="datetime64[us, UTC]")
+            return gpd.GeoDataFrame(columns, crs=crs)
+        index = pd.Index(self._index)
+        columns = dict(self._columns)
+        columns["geometry"] = gpd.GeoSeries(
+            geometries_from_geojson(columns["geometry"]), index=index
+        )
+        datetimes = datetimes_from_str(columns["datetime"])
+        datetimes.index = index
+        columns["datetime"] = datetimes
+        frame = gpd.GeoDataFrame(columns, index=index, crs=STAC_CRS)
+        return reproject(frame, crs)
@@ -0,0 +1,118 @@
+""" On-disk cache of the frames read by stacframes.df_from(), keyed on file fingerprints """
+import hashlib
+import json
+import os
+import tempfile
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from .builder import ColumnBuilder
+from .utils import CatalogBuilder, resolve_links
+
+
+class FrameCache:
+    """Store one pickled frame per catalog, keyed on the files it was read from
+
+    The key of a catalog is a hash of the path, modification time and size of
+    its own JSON file and of each of its item files. Editing, adding or
+    removing any of them changes the key, so a stale frame is never returned.
+    Frames for old keys are left in cache_dir and can be removed at any time.
+
+    Args:
+        cache_dir (str): The directory to store frames in. It is created if it
+            does not exist.
+
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, catalog, *extra):
+        """The cache key of catalog's own items, or None if they are not all local files
+
+        Args:
+            catalog (pystac.Catalog)
+            extra: Any other values the cached frame depends on, such as its crs
+
+        """
+        hrefs = [catalog.get_self_href()]
+        hrefs.extend(
+            link.get_absolute_href() for link in catalog.links if link.rel == "item"
+        )
+        fingerprints = []
+        for href in hrefs:
+            if href is None or not _is_local(href):
+                return None
+            try:
+                stat = os.stat(href)
+            except OSError:
+                return None
+            fingerprints.append((href, stat.st_mtime_ns, stat.st_size))
+        content = json.dumps([fingerprints, [str(e) for e in extra]])
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """The frame stored under key, or None"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
+
+    def put(self, key, frame):
+        """Store frame under key"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        frame.to_pickle(tmp_path)
+        os.replace(tmp_path, self._path(key))
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, "{}.pkl".format(key))
+
+
+def _is_local(href):
+    # Single letter schemes are Windows drive letters
+    return len(urlparse(href).scheme) <= 1
+
+
+def df_from_cache(catalog, cache_dir, crs="EPSG:4326", workers=None):
+    """Read catalog like stacframes.df_from, reusing the frames cached in cache_dir
+
+    Each catalog in the tree is cached separately, so only the catalogs whose
+    own JSON or item files changed are read again.
+
+    Args:
+        catalog (pystac.Catalog)
+        cache_dir (str): The directory to cache frames in
+        crs (any): Optional. The crs of the returned frame
+        workers (int): Optional. If set, the items of catalogs that are not
+            cached are read in this many threads.
+
+    Returns:
+        geopandas.GeoDataFrame
+
+    """
+    cache = FrameCache(cache_dir)
+    nodes = [node for _, node in CatalogBuilder(catalog).walk()]
+    keys = [cache.key(node, crs) for node in nodes]
+    frames = [None if key is None else cache.get(key) for key in keys]
+    missed = [node for node, frame in zip(nodes, frames) if frame is None]
+    if workers:
+        resolve_links(
+            [link for node in missed for link in node.links if link.rel == "item"],
+            catalog.get_root(),
+            workers,
+        )
+    for i, (node, key, frame) in enumerate(zip(nodes, keys, frames)):
+        if frame is not None:
+            continue
+        builder = ColumnBuilder()
+        builder.extend(item.to_dict() for item in node.get_items())
+        frames[i] = builder.to_frame(crs=crs)
+        if key is not None:
+            cache.put(key, frames[i])
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return ColumnBuilder().to_frame(crs=crs)
+    return pd.concat(frames)
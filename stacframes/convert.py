@@ -0,0 +1,195 @@
+""" Bulk conversion between frame columns and the values of STAC Item JSON """
+from datetime import datetime, timedelta
+import json
+
+from dateutil import tz
+import numpy as np
+import pandas as pd
+import pystac
+from pyproj import CRS
+import shapely
+from shapely.errors import GEOSException
+from shapely.geometry import mapping, shape
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+UTC_SUFFIXES = ("Z", "z", "+00:00")
+
+# The crs of every STAC Item geometry and bbox
+STAC_CRS = "EPSG:4326"
+
+
+def geometries_from_geojson(geojsons):
+    """Convert a list of GeoJSON geometry dicts to a numpy array of shapely geometries
+
+    All geometries are parsed in a single call to GEOS by wrapping them in one
+    GeometryCollection when the installed shapely supports it. GEOS before 3.12
+    cannot read GeoJSON with Z coordinates, so those geometries are converted
+    one by one instead.
+
+    Args:
+        geojsons (list[dict]): GeoJSON geometry dicts
+
+    Returns:
+        numpy.ndarray: shapely geometries, in the same order as geojsons
+
+    """
+    if not geojsons:
+        return np.array([], dtype=object)
+    if hasattr(shapely, "from_geojson") and all(g is not None for g in geojsons):
+        collection = json.dumps({"type": "GeometryCollection", "geometries": geojsons})
+        try:
+            parts = shapely.get_parts(shapely.from_geojson(collection))
+        except GEOSException:
+            parts = None
+        if parts is not None and len(parts) == len(geojsons):
+            return parts
+    geometries = np.empty(len(geojsons), dtype=object)
+    geometries[:] = [None if g is None else shape(g) for g in geojsons]
+    return geometries
+
+
+def datetimes_from_str(values):
+    """Convert a list of RFC 3339 strings to a pandas.Series of datetimes
+
+    Strings that are all in UTC are parsed together by pandas. Any other mix of
+    offsets falls back to pystac.utils.str_to_datetime for each value so that
+    the result matches stacframes.series_from().
+
+    Args:
+        values (list[str]): datetime strings
+
+    Returns:
+        pandas.Series
+
+    """
+    if values and all(isinstance(v, str) and v.endswith(UTC_SUFFIXES) for v in values):
+        parsed = pd.to_datetime(values, utc=True, format="ISO8601")
+        return pd.Series(parsed.tz_convert(tz.tzutc()))
+    return pd.Series(
+        [pystac.utils.str_to_datetime(v) if isinstance(v, str) else v for v in values]
+    )
+
+
+def geojson_from_geometries(geometries):
+    """Convert a sequence of shapely geometries to a list of GeoJSON geometry dicts
+
+    All geometries are written in a single call to GEOS and decoded as one JSON
+    document, with orjson if it is installed, when the installed shapely
+    supports it. GEOS before 3.12 drops Z coordinates when writing GeoJSON, so
+    there geometries with Z are written one by one by mapping() instead.
+    Missing geometries become None. The dicts are equal to those of
+    shapely.geometry.mapping(), except that coordinates are lists rather than
+    tuples.
+
+    Args:
+        geometries (geopandas.GeoSeries | list[shapely.Geometry])
+
+    Returns:
+        list[dict]
+
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    if not len(geometries):
+        return []
+    if hasattr(shapely, "to_geojson"):
+        strings = shapely.to_geojson(geometries)
+        strings[shapely.is_missing(geometries)] = "null"
+        if shapely.geos_version < (3, 12):
+            has_z = shapely.has_z(geometries)
+            strings[has_z] = [json.dumps(mapping(g)) for g in geometries[has_z]]
+        document = "[{}]".format(",".join(strings))
+        return orjson.loads(document) if orjson is not None else json.loads(document)
+    return [None if g is None else mapping(g) for g in geometries]
+
+
+def datetimes_to_str(values):
+    """Convert a sequence of datetimes to a list of RFC 3339 strings
+
+    Each string is equal to pystac.utils.datetime_to_str() of the value. A
+    datetime64 column that is naive or in UTC is formatted by numpy in one
+    pass; other values are converted one by one. Strings are kept as is, and
+    missing values become None.
+
+    Args:
+        values (pandas.Series | list[datetime.datetime])
+
+    Returns:
+        list[str]
+
+    """
+    values = pd.Series(values)
+    if _is_utc_datetime64(values) and not values.isna().any():
+        if values.dt.tz is not None:
+            values = values.dt.tz_localize(None)
+        micros = values.to_numpy().astype("datetime64[us]")
+        seconds = micros.astype("datetime64[s]")
+        formatted = np.where(
+            micros == seconds,
+            np.datetime_as_string(seconds),
+            np.datetime_as_string(micros),
+        )
+        return np.char.add(formatted.astype(str), "Z").tolist()
+    return [_datetime_to_str(v) for v in values]
+
+
+def _is_utc_datetime64(values):
+    """Whether values is a datetime64 Series that is naive or has a zero UTC offset"""
+    if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return False
+    timezone = getattr(values.dtype, "tz", None)
+    return timezone is None or timezone.utcoffset(datetime(2000, 1, 1)) == timedelta(0)
+
+
+def _datetime_to_str(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, datetime):
+        return pystac.utils.datetime_to_str(value)
+    return value
+
+
+def bboxes_from_geometries(geometries):
+    """Compute [minx, miny, maxx, maxy] for each geometry in one call to GEOS
+
+    Missing and empty geometries have a bbox of None.
+
+    Args:
+        geometries (geopandas.GeoSeries | list[shapely.Geometry])
+
+    Returns:
+        list[list[float]]
+
+    """
+    bounds = shapely.bounds(np.asarray(geometries, dtype=object))
+    missing = np.isnan(bounds).any(axis=1)
+    return [None if m else b for m, b in zip(missing, bounds.tolist())]
+
+
+def reproject(dataframe, crs):
+    """Transform the geometries of dataframe to crs and recompute its bbox column
+
+    All geometries are transformed together by geopandas.GeoDataFrame.to_crs.
+    dataframe is returned unchanged if it has no crs, e.g. because it is a
+    pandas.DataFrame, or is already in crs.
+
+    Args:
+        dataframe (geopandas.GeoDataFrame | pandas.DataFrame)
+        crs (any): Any value accepted by pyproj.CRS.from_user_input
+
+    Returns:
+        geopandas.GeoDataFrame
+
+    """
+    current = getattr(dataframe, "crs", None)
+    if current is None or current == CRS.from_user_input(crs):
+        return dataframe
+    reprojected = dataframe.to_crs(crs)
+    if "bbox" in reprojected.columns:
+        bboxes = bboxes_from_geometries(reprojected.geometry)
+        reprojected["bbox"] = pd.Series(bboxes, index=reprojected.index, dtype=object)
+    return reprojected
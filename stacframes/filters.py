@@ -0,0 +1,156 @@
+""" Item filters that can be pushed down into the catalog walk of stacframes.df_from() """
+from datetime import datetime, timezone
+
+import pystac
+
+
+class ItemFilter:
+    """Select STAC Items by bbox, datetime, id and properties
+
+    Every criterion is optional, and an item must satisfy all of those given.
+    Collection extents are checked with intersects_extent so that whole
+    subtrees that cannot contain a match are skipped without reading them.
+
+    Args:
+        bbox (list[float]): Optional. [minx, miny, maxx, maxy] in EPSG:4326. Items
+            whose bbox intersects it are kept. A bbox with minx > maxx crosses
+            the antimeridian, as in the STAC spec.
+        datetime (datetime | str | tuple): Optional. A single datetime, a
+            (start, end) tuple where either end may be None to leave it open, or
+            an RFC 3339 interval string such as "2020-01-01T00:00:00Z/..". Items
+            whose datetime, or start_datetime / end_datetime range, overlaps it
+            are kept. Naive datetimes are assumed to be UTC.
+        ids (iterable[str]): Optional. Only items with these ids are kept.
+        where (callable): Optional. Called with each item's properties dict; only
+            items for which it returns True are kept.
+
+    """
+
+    def __init__(self, bbox=None, datetime=None, ids=None, where=None):
+        self.bbox = None if bbox is None else _bbox_2d(bbox)
+        self.start, self.end = _interval(datetime)
+        self.ids = None if ids is None else set(ids)
+        self.where = where
+
+    def __bool__(self):
+        criteria = (self.bbox, self.start, self.end, self.ids, self.where)
+        return any(v is not None for v in criteria)
+
+    def intersects_extent(self, extent):
+        """Whether items within extent could match this filter
+
+        Returns True when extent has no spatial extent set, as is the case for
+        collections created with stacframes.utils.empty_extent().
+
+        """
+        if extent is None:
+            return True
+        bboxes = extent.spatial.bboxes
+        if not bboxes or None in bboxes or None in bboxes[0]:
+            return True
+        if self.bbox is not None and not any(
+            _bbox_intersects(self.bbox, _bbox_2d(b)) for b in bboxes
+        ):
+            return False
+        if self.start is not None or self.end is not None:
+            start, end = extent.temporal.intervals[0]
+            if not self._overlaps(_utc(start), _utc(end)):
+                return False
+        return True
+
+    def matches_item(self, item):
+        """Whether the pystac.Item item matches this filter"""
+        common = item.common_metadata
+        return self._matches(
+            item.id,
+            item.bbox,
+            common.start_datetime or item.datetime,
+            common.end_datetime or item.datetime,
+            item.properties,
+        )
+
+    def matches_dict(self, item_dict):
+        """Whether the STAC Item JSON dict item_dict matches this filter"""
+        properties = item_dict.get("properties", {})
+        dt = properties.get("datetime")
+        return self._matches(
+            item_dict["id"],
+            item_dict.get("bbox"),
+            _parse(properties.get("start_datetime") or dt),
+            _parse(properties.get("end_datetime") or dt),
+            properties,
+        )
+
+    def _matches(self, item_id, bbox, start, end, properties):
+        if self.ids is not None and item_id not in self.ids:
+            return False
+        if self.bbox is not None and (
+            bbox is None or not _bbox_intersects(self.bbox, _bbox_2d(bbox))
+        ):
+            return False
+        if self.start is not None or self.end is not None:
+            if not self._overlaps(_utc(start), _utc(end)):
+                return False
+        if self.where is not None and not self.where(properties):
+            return False
+        return True
+
+    def _overlaps(self, start, end):
+        """Whether the interval start / end, None meaning open, overlaps this filter"""
+        if self.end is not None and start is not None and start > self.end:
+            return False
+        if self.start is not None and end is not None and end < self.start:
+            return False
+        return True
+
+
+def _bbox_2d(bbox):
+    if len(bbox) == 6:
+        return [bbox[0], bbox[1], bbox[3], bbox[4]]
+    return list(bbox)
+
+
+def _bbox_intersects(a, b):
+    """Whether 2D bboxes a and b intersect, either of which may cross the antimeridian"""
+    if a[1] > b[3] or b[1] > a[3]:
+        return False
+    return any(
+        a_west <= b_east and b_west <= a_east
+        for a_west, a_east in _x_ranges(a)
+        for b_west, b_east in _x_ranges(b)
+    )
+
+
+def _x_ranges(bbox):
+    """The longitude ranges of bbox, split in two if its west is east of its east"""
+    if bbox[0] > bbox[2]:
+        return ((bbox[0], 180.0), (-180.0, bbox[2]))
+    return ((bbox[0], bbox[2]),)
+
+
+def _interval(value):
+    """(start, end) UTC datetimes for a datetime filter value"""
+    if value is None:
+        return None, None
+    if isinstance(value, str):
+        value = value.split("/") if "/" in value else (value, value)
+    elif isinstance(value, datetime):
+        value = (value, value)
+    start, end = value
+    return _utc(_parse(start)), _utc(_parse(end))
+
+
+def _parse(value):
+    if value in (None, "", ".."):
+        return None
+    if isinstance(value, str):
+        return pystac.utils.str_to_datetime(value)
+    return value
+
+
+def _utc(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
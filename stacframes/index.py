@@ -0,0 +1,287 @@
+""" A sidecar spatial-temporal index of the items in a static catalog """
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+import hashlib
+import io
+import json
+import os
+from urllib.parse import urlparse
+
+import numpy as np
+import pystac
+from pystac.utils import make_absolute_href, make_relative_href
+import shapely
+
+from .static import read_bytes
+from .utils import CatalogBuilder
+
+
+# The index file written next to the catalog JSON by write_index
+INDEX_FILENAME = "stacframes-index.npz"
+
+
+def index_entry(item, item_href):
+    """The (href, id, bbox, start, end) indexed for item, whose JSON is at item_href
+
+    start and end are the item's start_datetime and end_datetime if set, and its
+    datetime otherwise.
+
+    """
+    common = item.common_metadata
+    bbox = item.bbox
+    if bbox is not None and len(bbox) == 6:
+        bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
+    return (
+        item_href,
+        item.id,
+        bbox,
+        common.start_datetime or item.datetime,
+        common.end_datetime or item.datetime,
+    )
+
+
+def write_index(catalog, entries=None):
+    """Write the index of the items in catalog to INDEX_FILENAME next to its JSON
+
+    The index maps each item id to the href of its JSON, its bbox and its
+    datetime range, in the order of catalog.get_all_items(). It also stores
+    the modification time and size of every item file, and a fingerprint of
+    those of every catalog and collection file, so that the index of a local
+    catalog is not used once a catalog or collection changed, e.g. because
+    items were added or removed, or once an item that matches a query
+    changed. The files must be saved before the index is written.
+
+    Example:
+    ```
+    catalog.normalize_and_save("./catalog", pystac.CatalogType.SELF_CONTAINED)
+    stacframes.index.write_index(catalog)
+    ```
+
+    Args:
+        catalog (pystac.Catalog): A catalog with a self href, usually the root
+        entries (iterable[tuple]): Optional. The index_entry() of every item in
+            catalog. If not given, the items are read from catalog.
+
+    Returns:
+        str: The path of the index file
+
+    """
+    catalog_href = catalog.get_self_href()
+    if catalog_href is None:
+        raise ValueError("catalog must have a self href to write an index")
+    if entries is None:
+        entries = (
+            index_entry(item, item.get_self_href()) for item in catalog.get_all_items()
+        )
+    catalogs = [
+        make_relative_href(node.get_self_href(), catalog_href)
+        for _, node in CatalogBuilder(catalog).walk()
+    ]
+    hrefs, ids, bboxes, starts, ends, stats = [], [], [], [], [], []
+    for href, item_id, bbox, start, end in entries:
+        hrefs.append(make_relative_href(href, catalog_href))
+        stats.append(_stat(make_absolute_href(href, catalog_href)))
+        ids.append(item_id)
+        bboxes.append([np.nan] * 4 if bbox is None else bbox)
+        starts.append(_datetime64(start))
+        ends.append(_datetime64(end))
+
+    path = os.path.join(os.path.dirname(catalog_href), INDEX_FILENAME)
+    fingerprint = _fingerprint(catalog_href, catalogs)
+    np.savez_compressed(
+        path,
+        catalogs=np.array(catalogs, dtype=str),
+        fingerprint=np.array(fingerprint or "", dtype=str),
+        stats=np.array(stats, dtype=np.int64).reshape(-1, 2),
+        hrefs=np.array(hrefs, dtype=str),
+        ids=np.array(ids, dtype=str),
+        bboxes=np.array(bboxes, dtype=float).reshape(-1, 4),
+        starts=np.array(starts, dtype="datetime64[us]"),
+        ends=np.array(ends, dtype="datetime64[us]"),
+    )
+    return path
+
+
+class CatalogIndex:
+    """The index written by write_index, with a packed R-tree over its bboxes
+
+    Args:
+        catalog_href (str): The href of the indexed catalog's JSON
+        arrays (dict): The arrays stored in the index file
+
+    """
+
+    def __init__(self, catalog_href, arrays):
+        self.catalog_href = catalog_href
+        self.catalogs = arrays.get("catalogs", np.array([], dtype=str))
+        self.fingerprint = str(arrays.get("fingerprint", ""))
+        self.hrefs = arrays["hrefs"]
+        self.stats = arrays.get("stats", np.full((len(self.hrefs), 2), -1))
+        self.ids = arrays["ids"]
+        self.bboxes = arrays["bboxes"]
+        self.starts = arrays["starts"]
+        self.ends = arrays["ends"]
+        self.verify = False
+        self._tree = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, catalog, verify=True):
+        """The index of catalog, or None if it has none or it is out of date
+
+        Args:
+            catalog (pystac.Catalog | str): The catalog, or the href of its JSON
+            verify (bool): Optional. If True, the index of a catalog on the
+                local filesystem is only returned if is_current(), and query
+                checks the item files it matches. The files of a remote
+                catalog cannot be checked, and its index is used as is.
+
+        """
+        catalog_href = catalog
+        if isinstance(catalog, pystac.Catalog):
+            catalog_href = catalog.get_self_href()
+        if catalog_href is None:
+            return None
+        index_href = make_absolute_href(INDEX_FILENAME, catalog_href)
+        try:
+            data = read_bytes(index_href)
+        except (OSError, ValueError):
+            return None
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            catalog_index = cls(catalog_href, dict(arrays))
+        catalog_index.verify = verify and _is_local(catalog_href)
+        if catalog_index.verify and not catalog_index.is_current():
+            return None
+        return catalog_index
+
+    def is_current(self):
+        """Whether no indexed catalog or collection file changed since writing
+
+        Item files are only checked by query, for the items it matches.
+
+        """
+        files = [str(href) for href in self.catalogs]
+        fingerprint = _fingerprint(self.catalog_href, files)
+        return fingerprint is not None and fingerprint == self.fingerprint
+
+    @property
+    def tree(self):
+        """A shapely.STRtree over the bbox of each item, built on first use"""
+        if self._tree is None:
+            # A bbox crossing the antimeridian is indexed as spanning all
+            # longitudes, and its items are checked by matches_item
+            bboxes = self.bboxes.copy()
+            crosses = bboxes[:, 0] > bboxes[:, 2]
+            bboxes[crosses, 0] = -180.0
+            bboxes[crosses, 2] = 180.0
+            self._tree = shapely.STRtree(shapely.box(*bboxes.T))
+        return self._tree
+
+    def query(self, item_filter):
+        """The absolute hrefs of the items that may match item_filter, in index order
+
+        The bbox, datetime and ids criteria of item_filter are answered from the
+        index. Items must still be checked with item_filter.matches_item, which
+        also applies its where criterion.
+
+        Args:
+            item_filter (stacframes.filters.ItemFilter)
+
+        Returns:
+            list[str]: None if the index was loaded with verify and the file of
+                any of these items changed since it was written
+
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if item_filter.ids is not None:
+            keep &= np.isin(self.ids, list(item_filter.ids))
+        if item_filter.bbox is not None:
+            west, south, east, north = item_filter.bbox
+            ranges = [(west, east)]
+            if west > east:
+                ranges = [(west, 180.0), (-180.0, east)]
+            in_bbox = np.zeros(len(self), dtype=bool)
+            for range_west, range_east in ranges:
+                query = shapely.box(range_west, south, range_east, north)
+                in_bbox[self.tree.query(query)] = True
+            keep &= in_bbox
+        if item_filter.end is not None:
+            keep &= ~(self.starts > _datetime64(item_filter.end))
+        if item_filter.start is not None:
+            keep &= ~(self.ends < _datetime64(item_filter.start))
+        hrefs = [
+            make_absolute_href(str(href), self.catalog_href)
+            for href in self.hrefs[keep]
+        ]
+        if self.verify:
+            stats = self.stats[keep].tolist()
+            if any(_stat(href) != stat for href, stat in zip(hrefs, stats)):
+                return None
+        return hrefs
+
+    def items(self, item_filter, workers=None):
+        """Read only the items that match item_filter, in index order
+
+        Args:
+            item_filter (stacframes.filters.ItemFilter)
+            workers (int): Optional. If set, items are read in this many threads.
+
+        Returns:
+            list[pystac.Item]: None if query returns None
+
+        """
+        hrefs = self.query(item_filter)
+        if hrefs is None:
+            return None
+        if workers:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                items = list(executor.map(pystac.Item.from_file, hrefs))
+        else:
+            items = [pystac.Item.from_file(href) for href in hrefs]
+        return [item for item in items if item_filter.matches_item(item)]
+
+
+def _fingerprint(catalog_href, hrefs):
+    """A hash of the modification time and size of each file at hrefs
+
+    hrefs are relative to catalog_href. None if any of them is not a local file.
+
+    """
+    stats = []
+    for href in hrefs:
+        path = make_absolute_href(href, catalog_href)
+        if not _is_local(path):
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stats.append((href, stat.st_mtime_ns, stat.st_size))
+    return hashlib.sha1(json.dumps(stats).encode("utf-8")).hexdigest()
+
+
+def _stat(path):
+    """[modification time in ns, size] of the local file at path, or [-1, -1]"""
+    if not _is_local(path):
+        return [-1, -1]
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [-1, -1]
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _is_local(href):
+    # Single letter schemes are Windows drive letters
+    return len(urlparse(href).scheme) <= 1
+
+
+def _datetime64(dt):
+    """dt as a naive UTC numpy.datetime64, or NaT if it is None"""
+    if dt is None:
+        return np.datetime64("NaT", "us")
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(dt, "us")
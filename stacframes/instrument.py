@@ -0,0 +1,188 @@
+""" Optional stage timings and progress events of df_to, df_write and df_from """
+import time
+
+
+# The number of items read between two progress events of df_from
+PROGRESS_INTERVAL = 1000
+
+
+class Instrument:
+    """Receive the stage timings and progress events of a stacframes operation
+
+    Pass an instance as the instrument argument of stacframes.df_to, df_write
+    or df_from, overriding any of the hooks below. The default hooks do
+    nothing. Each operation reports, in order:
+
+        - started(operation, total) once
+        - progress(operation, done, total) after each batch of items
+        - stage(operation, name, seconds, items) once per stage, after the last
+          batch, with the time spent in that stage summed over all batches
+        - finished(operation, seconds, items) once
+
+    The stages of each operation are:
+
+        - df_to: prepare, item_from, build_collections, add_items and
+          collection_extents. With mode="upsert", index_existing, diff and
+          remove_items too.
+        - df_write: prepare, build_collections, write_items,
+          collection_extents, save_catalog and, with write_index,
+          write_index.
+        - df_from: read_cache, or read_index or resolve_items, then
+          read_items, build_frame and any of flatten_properties and
+          templatize_assets.
+
+    Example:
+    ```
+    class Progress(stacframes.instrument.Instrument):
+        def progress(self, operation, done, total):
+            print("{}: {}/{}".format(operation, done, total or "?"))
+
+    stacframes.df_to(catalog, df, instrument=Progress())
+    ```
+
+    """
+
+    def started(self, operation, total):
+        """operation has started on total items, or an unknown number if None"""
+
+    def progress(self, operation, done, total):
+        """operation has processed done of total items, or of an unknown number if None"""
+
+    def stage(self, operation, name, seconds, items):
+        """operation spent seconds in stage name, which processed items items"""
+
+    def finished(self, operation, seconds, items):
+        """operation finished with items items in seconds"""
+
+
+class StageTimings(Instrument):
+    """An Instrument that records the stage timings of each operation
+
+    Example:
+    ```
+    timings = stacframes.instrument.StageTimings()
+    df = stacframes.df_from(catalog, instrument=timings)
+    for row in timings.summary():
+        print(row)
+    ```
+
+    """
+
+    def __init__(self):
+        self.stages = []
+        self.operations = []
+
+    def stage(self, operation, name, seconds, items):
+        self.stages.append((operation, name, seconds, items))
+
+    def finished(self, operation, seconds, items):
+        self.operations.append((operation, seconds, items))
+
+    def summary(self):
+        """One dict per recorded stage with its seconds, items and items_per_second"""
+        return [
+            {
+                "operation": operation,
+                "stage": name,
+                "seconds": seconds,
+                "items": items,
+                "items_per_second": items / seconds if seconds else None,
+            }
+            for operation, name, seconds, items in self.stages
+        ]
+
+
+class Recorder:
+    """Sum the time and items of each stage of one operation for an Instrument
+
+    Stages may be entered repeatedly, as in a loop over collections:
+    ```
+    recorder = record(instrument, "df_to", len(df))
+    for parents, positions in groups.items():
+        start = recorder.clock()
+        ...
+        start = recorder.lap("item_from", start, len(positions))
+        ...
+        recorder.lap("add_items", start, len(positions))
+        recorder.advance(len(positions))
+    recorder.finish()
+    ```
+
+    """
+
+    def __init__(self, instrument, operation, total):
+        self.instrument = instrument
+        self.operation = operation
+        self.total = total
+        self.done = 0
+        self._stages = {}
+        self._start = time.perf_counter()
+        instrument.started(operation, total)
+
+    def clock(self):
+        """The current time, to pass to lap"""
+        return time.perf_counter()
+
+    def lap(self, name, start, items=0):
+        """Add the time since start and items to stage name, returning the current time"""
+        now = time.perf_counter()
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = [0.0, 0]
+        stage[0] += now - start
+        stage[1] += items
+        return now
+
+    def advance(self, items):
+        """Add items to the number done and send a progress event"""
+        self.done += items
+        self.instrument.progress(self.operation, self.done, self.total)
+
+    def track(self, iterable, interval=PROGRESS_INTERVAL):
+        """Yield from iterable, advancing every interval values and at its end"""
+        count = 0
+        for value in iterable:
+            yield value
+            count += 1
+            if count == interval:
+                self.advance(count)
+                count = 0
+        if count:
+            self.advance(count)
+
+    def finish(self):
+        """Report each stage in the order first entered, then the whole operation"""
+        for name, (seconds, items) in self._stages.items():
+            self.instrument.stage(self.operation, name, seconds, items)
+        self.instrument.finished(
+            self.operation, time.perf_counter() - self._start, self.done
+        )
+
+
+class _NullRecorder:
+    """A Recorder that records nothing, used when no instrument is given"""
+
+    def clock(self):
+        return 0.0
+
+    def lap(self, name, start, items=0):
+        return 0.0
+
+    def advance(self, items):
+        pass
+
+    def track(self, iterable, interval=PROGRESS_INTERVAL):
+        return iterable
+
+    def finish(self):
+        pass
+
+
+_NULL_RECORDER = _NullRecorder()
+
+
+def record(instrument, operation, total=None):
+    """A Recorder of operation for instrument, or one that does nothing if it is None"""
+    if instrument is None:
+        return _NULL_RECORDER
+    return Recorder(instrument, operation, total)
@@ -0,0 +1,93 @@
+""" Newline-delimited JSON files of STAC Items, one Item per line """
+import json
+import os
+from urllib.parse import quote, unquote
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# The file name of each shard in a directory written with shard=True
+SHARD_FILENAME = "items.ndjson"
+
+# The default size in bytes of the write buffer
+BUFFER_SIZE = 1 << 20
+
+
+def shard_path(root, parents):
+    """The path of the shard for the items with parents under the directory root
+
+    Each parent id is one directory, percent-encoded with quote_parent so that
+    ids such as "..", "a/b" or "/abs" cannot write outside root.
+
+    """
+    return os.path.join(root, *[quote_parent(p) for p in parents], SHARD_FILENAME)
+
+
+def quote_parent(parent):
+    """parent as a directory name, with "/", "\\", "." and "%" percent-encoded"""
+    if not isinstance(parent, str) or not parent:
+        raise ValueError(
+            "parent ids must be non-empty strings, not {!r}".format(parent)
+        )
+    return quote(parent, safe="").replace(".", "%2E")
+
+
+def write_items(path, item_dicts, buffer_size=BUFFER_SIZE):
+    """Write each STAC Item dict in item_dicts as one line of the file at path
+
+    Directories in path are created if they do not exist. orjson is used to
+    encode items if it is installed.
+
+    Returns:
+        int: The number of items written
+
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    count = 0
+    with open(path, "wb", buffering=buffer_size) as f:
+        for item_dict in item_dicts:
+            f.write(_dumps(item_dict))
+            f.write(b"\n")
+            count += 1
+    return count
+
+
+def iter_items(path):
+    """Yield (item dict, parents) for each line of the ndjson file or directory at path
+
+    If path is a directory written with shard=True, every shard below it is
+    read in sorted order and parents is the list of directories from path to
+    the shard, decoded from quote_parent. Otherwise parents is None.
+
+    """
+    if not os.path.isdir(path):
+        for item_dict in _iter_lines(path):
+            yield item_dict, None
+        return
+    for directory, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        if SHARD_FILENAME not in filenames:
+            continue
+        relative = os.path.relpath(directory, path)
+        parents = [] if relative == os.curdir else relative.split(os.sep)
+        parents = [unquote(p) for p in parents]
+        for item_dict in _iter_lines(os.path.join(directory, SHARD_FILENAME)):
+            yield item_dict, list(parents)
+
+
+def _iter_lines(path):
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def _dumps(item_dict):
+    if orjson is not None:
+        return orjson.dumps(item_dict)
+    return json.dumps(item_dict, separators=(",", ":")).encode("utf-8")
@@ -1,6 +1,8 @@
 """ Helper methods for generating the "parents" column used by stacframes.df_to() """
 from itertools import accumulate
 
+import pandas as pd
+
 
 DEFAULT_PARENTS_COLUMN = "parents"
 
@@ -27,13 +29,8 @@ def from_properties(keys, dataframe, prefix="", parents_col=DEFAULT_PARENTS_COLU
     if parents_col in dataframe.columns:
         raise ValueError("{} already exists on dataframe".format(parents_col))
 
-    def apply(series):
-        properties = series.get("properties", {})
-        parents = ["{}{}".format(prefix, properties[arg]) for arg in keys]
-        series[parents_col] = parents
-        return series
-
-    return dataframe.apply(apply, axis=1)
+    columns = [prefix + _property_strings(dataframe, key) for key in keys]
+    return _assign_parents(dataframe, columns, parents_col)
 
 
 def from_properties_accum(
@@ -66,13 +63,50 @@ def from_properties_accum(
     if parents_col in dataframe.columns:
         raise ValueError("{} already exists on dataframe".format(parents_col))
 
-    def apply(series):
-        properties = series.get("properties", {})
-        values = [str(properties[x]) for x in keys]
-        parents = list(accumulate(values, lambda acc, x: acc + separator + x))
-        if prefix:
-            parents = [prefix + separator + x for x in parents]
-        series[parents_col] = parents
-        return series
+    values = [_property_strings(dataframe, key) for key in keys]
+    columns = list(accumulate(values, lambda acc, x: acc + separator + x))
+    if prefix:
+        columns = [prefix + separator + x for x in columns]
+    return _assign_parents(dataframe, columns, parents_col)
+
+
+def _property_strings(dataframe, key):
+    """The value of key in each row's properties, formatted with str()"""
+    values = [str(properties[key]) for properties in dataframe["properties"]]
+    return pd.Series(values, index=dataframe.index, dtype=object)
+
+
+def _assign_parents(dataframe, columns, parents_col):
+    """Return dataframe with one list per row of the values in columns"""
+    if columns:
+        parents = [list(row) for row in zip(*columns)]
+    else:
+        parents = [[] for _ in range(len(dataframe))]
+    return dataframe.assign(**{parents_col: parents})
+
 
-    return dataframe.apply(apply, axis=1)
+def group_positions(dataframe, parents_col=DEFAULT_PARENTS_COLUMN):
+    """Group the row positions of dataframe by the value of parents_col
+
+    Rows without parents_col, or with a missing value in it, are grouped under
+    the empty tuple.
+
+    Args:
+        dataframe (pandas.DataFrame): DataFrame to group
+        parents_col (str): The column containing each row's list of parents
+
+    Returns:
+        dict: tuple of parent ids -> list of integer row positions, in the
+            order each parents tuple is first seen
+
+    """
+    groups = {}
+    if parents_col not in dataframe.columns:
+        if len(dataframe):
+            groups[()] = list(range(len(dataframe)))
+        return groups
+    for position, parents in enumerate(dataframe[parents_col]):
+        if not isinstance(parents, (list, tuple)) and pd.isna(parents):
+            parents = ()
+        groups.setdefault(tuple(parents), []).append(position)
+    return groups
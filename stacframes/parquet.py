@@ -0,0 +1,235 @@
+""" GeoParquet persistence for the GeoDataFrames read and written by stacframes """
+import json
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from .assets import TEMPLATES_ATTR
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+METADATA_KEY = b"stacframes"
+
+
+def to_parquet(dataframe, path, row_group_size=None):
+    """Write dataframe to a GeoParquet file at path
+
+    The geometry column is stored as WKB. Columns holding dicts or lists, such
+    as properties, assets, links, bbox and parents, are stored as typed nested
+    struct and list columns when that round-trips them exactly, and as JSON
+    strings otherwise, e.g. when a key has values of different types in
+    different rows. Other object columns that pyarrow would change, such as
+    flattened properties mixing ints and floats or None and pandas.NA, are
+    stored as JSON strings too, with pandas.NA as null. stacframes.read_parquet
+    restores the original values, and the asset templates of a frame
+    templated by stacframes.assets.templatize.
+
+    Args:
+        dataframe (pandas.DataFrame | geopandas.GeoDataFrame): A frame as returned
+            by stacframes.df_from or accepted by stacframes.df_to
+        path (str): The file to write
+        row_group_size (int): Optional. The maximum number of rows in each row
+            group. Smaller row groups allow read_parquet to load fewer rows.
+
+    """
+    _require_pyarrow()
+    geometry_col = None
+    if isinstance(dataframe, gpd.GeoDataFrame):
+        geometry_col = dataframe.geometry.name
+    objects = [
+        c
+        for c in dataframe.columns
+        if c != geometry_col and dataframe[c].dtype == object
+    ]
+    nested = [c for c in objects if _is_nested(dataframe[c])]
+    scalars = [
+        c
+        for c in objects
+        if c not in nested and not _round_trips(dataframe[c].tolist())
+    ]
+    plain = [
+        c
+        for c in dataframe.columns
+        if c not in nested and c not in scalars and c != geometry_col
+    ]
+    table = pa.Table.from_pandas(pd.DataFrame(dataframe[plain]), preserve_index=True)
+
+    json_columns = list(scalars)
+    for name in nested + scalars:
+        values = dataframe[name].tolist()
+        array = None if name in scalars else _typed_array(values)
+        if array is None:
+            array = _json_array(values)
+            if name in nested:
+                json_columns.append(name)
+        table = table.append_column(name, array)
+
+    metadata = dict(table.schema.metadata or {})
+    if geometry_col is not None:
+        wkb = shapely.to_wkb(dataframe.geometry.values)
+        table = table.append_column(geometry_col, pa.array(wkb, type=pa.binary()))
+        crs = dataframe.crs
+        metadata[b"geo"] = json.dumps(
+            {
+                "version": "1.0.0",
+                "primary_column": geometry_col,
+                "columns": {
+                    geometry_col: {
+                        "encoding": "WKB",
+                        "geometry_types": [],
+                        "crs": None if crs is None else crs.to_json_dict(),
+                    }
+                },
+            }
+        ).encode("utf-8")
+    metadata[METADATA_KEY] = json.dumps(
+        {
+            "nested_columns": nested,
+            "json_columns": json_columns,
+            "asset_templates": dataframe.attrs.get(TEMPLATES_ATTR),
+        }
+    ).encode("utf-8")
+
+    index_columns = [c for c in table.column_names if c not in dataframe.columns]
+    table = table.select([str(c) for c in dataframe.columns] + index_columns)
+    table = table.replace_schema_metadata(metadata)
+    pq.write_table(table, path, row_group_size=row_group_size)
+
+
+def read_parquet(path, columns=None, row_groups=None):
+    """Read a GeoParquet file written by stacframes.to_parquet
+
+    Args:
+        path (str): The file to read
+        columns (list[str]): Optional. Only read these columns.
+        row_groups (list[int]): Optional. Only read these row groups.
+
+    Returns:
+        geopandas.GeoDataFrame, or pandas.DataFrame if the geometry column was
+            not read
+
+    """
+    _require_pyarrow()
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.schema_arrow.metadata or {}
+    stacframes_metadata = json.loads(metadata.get(METADATA_KEY, b"{}"))
+    geo = json.loads(metadata[b"geo"]) if b"geo" in metadata else None
+    if row_groups is None:
+        table = parquet_file.read(columns=columns, use_pandas_metadata=True)
+    else:
+        table = parquet_file.read_row_groups(
+            row_groups, columns=columns, use_pandas_metadata=True
+        )
+
+    nested = set(stacframes_metadata.get("nested_columns", []))
+    json_columns = set(stacframes_metadata.get("json_columns", []))
+    geometry_col = geo["primary_column"] if geo else None
+    converted = {}
+    for name in table.column_names:
+        if name in json_columns:
+            converted[name] = [
+                pd.NA if v is None else json.loads(v) for v in table[name].to_pylist()
+            ]
+        elif name in nested:
+            converted[name] = [_strip_nulls(v) for v in table[name].to_pylist()]
+        elif name == geometry_col:
+            converted[name] = shapely.from_wkb(
+                table[name].to_numpy(zero_copy_only=False)
+            )
+    index_columns = _index_columns(table)
+    order = [c for c in table.column_names if c not in index_columns]
+
+    dataframe = table.drop_columns(list(converted)).to_pandas()
+    for name, values in converted.items():
+        dataframe[name] = pd.Series(values, index=dataframe.index, dtype=object)
+    dataframe = dataframe[order]
+    if geometry_col is not None and geometry_col in converted:
+        crs = geo["columns"][geometry_col].get("crs")
+        dataframe = gpd.GeoDataFrame(dataframe, geometry=geometry_col, crs=crs)
+    templates = stacframes_metadata.get("asset_templates")
+    if templates is not None:
+        dataframe.attrs[TEMPLATES_ATTR] = templates
+    return dataframe
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for GeoParquet support")
+
+
+def _index_columns(table):
+    pandas_metadata = table.schema.pandas_metadata or {}
+    return [c for c in pandas_metadata.get("index_columns", []) if isinstance(c, str)]
+
+
+def _is_nested(series):
+    return any(isinstance(v, (dict, list, tuple)) for v in series)
+
+
+def _round_trips(values):
+    """Whether pyarrow stores the scalars in values without changing them"""
+    try:
+        restored = pa.array(values, from_pandas=True).to_pylist()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return False
+    return _dumps(restored) == _dumps(values)
+
+
+def _json_array(values):
+    """A string array of values encoded as JSON, with pandas.NA as null"""
+    return pa.array(
+        [None if v is pd.NA else _dumps(v) for v in values], type=pa.string()
+    )
+
+
+def _dumps(value):
+    return json.dumps(value, default=_json_default)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _typed_array(values):
+    """A typed pyarrow array for values, or None if it would not round-trip exactly"""
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return None
+    if _has_empty_struct(array.type):
+        return None
+    restored = [_strip_nulls(v) for v in array.to_pylist()]
+    if _dumps(restored) != _dumps(values):
+        return None
+    return array
+
+
+def _has_empty_struct(arrow_type):
+    """Whether arrow_type contains a struct without fields, which parquet cannot store"""
+    if pa.types.is_struct(arrow_type):
+        return arrow_type.num_fields == 0 or any(
+            _has_empty_struct(arrow_type.field(i).type)
+            for i in range(arrow_type.num_fields)
+        )
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        return _has_empty_struct(arrow_type.value_type)
+    return False
+
+
+def _strip_nulls(value):
+    """Drop the null struct fields that pyarrow adds for keys missing from a row"""
+    if isinstance(value, dict):
+        return {k: _strip_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_strip_nulls(v) for v in value]
+    return value
@@ -0,0 +1,248 @@
+""" Frames split into partitions that are read and converted in separate processes """
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+import pystac
+
+from .builder import ColumnBuilder
+from .parents import DEFAULT_PARENTS_COLUMN
+
+
+class PartitionedFrame:
+    """A GeoDataFrame split into partitions that are only loaded when used
+
+    Each partition is a picklable callable that returns a geopandas.GeoDataFrame,
+    so that it can be loaded, transformed and written in a worker process
+    without the whole frame ever being in memory. stacframes.df_from returns
+    one with one partition per collection subtree when called with
+    partitioned=True, and stacframes.df_to and df_write accept one.
+
+    Example:
+    ```
+    partitioned = stacframes.df_from(catalog, partitioned=True)
+    partitioned = partitioned.map_partitions(stacframes.properties.flatten)
+    df = partitioned.compute(workers=4)
+    ```
+
+    Args:
+        partitions (list[callable]): Zero-argument callables returning the frame
+            of each partition
+        crs (any): The crs of the frames, used for the result of compute when
+            every partition is empty
+
+    """
+
+    def __init__(self, partitions, crs="EPSG:4326"):
+        self.partitions = list(partitions)
+        self.crs = crs
+
+    @property
+    def npartitions(self):
+        return len(self.partitions)
+
+    @classmethod
+    def from_frame(cls, dataframe, parents_col=DEFAULT_PARENTS_COLUMN, depth=1):
+        """Split dataframe into one partition per distinct prefix of its parents
+
+        Rows whose parents are shorter than depth are partitioned by their whole
+        parents, and rows with no parents_col value by the empty prefix.
+
+        Args:
+            dataframe (pandas.DataFrame): A frame as accepted by stacframes.df_to
+            parents_col (str): The parents column to partition on
+            depth (int): The number of parents in each partition's prefix
+
+        """
+        if parents_col in dataframe.columns:
+            prefixes = [
+                tuple(p[:depth]) if isinstance(p, (list, tuple)) else ()
+                for p in dataframe[parents_col]
+            ]
+        else:
+            prefixes = [()] * len(dataframe)
+        positions = {}
+        for position, prefix in enumerate(prefixes):
+            positions.setdefault(prefix, []).append(position)
+        return cls(
+            [FramePartition(dataframe.iloc[p]) for p in positions.values()],
+            crs=getattr(dataframe, "crs", None),
+        )
+
+    def get_partition(self, n):
+        """Load the frame of partition n"""
+        return self.partitions[n]()
+
+    def iter_partitions(self):
+        """Load and yield the frame of each partition in turn"""
+        for partition in self.partitions:
+            yield partition()
+
+    def map_partitions(self, func, *args, **kwargs):
+        """A PartitionedFrame applying func(frame, *args, **kwargs) to each partition
+
+        Nothing is loaded until the result is used. func must be picklable to
+        be run in worker processes, e.g. a module-level function.
+
+        """
+        return PartitionedFrame(
+            [MappedPartition(p, func, args, kwargs) for p in self.partitions],
+            crs=self.crs,
+        )
+
+    def apply(self, func, workers=None):
+        """The list of func(frame) for the frame of each partition, in order
+
+        Args:
+            func (callable): Must be picklable if workers is set
+            workers (int): Optional. If set, partitions are loaded and func
+                applied in this many processes.
+
+        """
+        return list(self.iter_apply(func, workers=workers))
+
+    def iter_apply(self, func, workers=None):
+        """Yield func(frame) for the frame of each partition, in order
+
+        Like apply, but each result is yielded as soon as it and those of the
+        partitions before it are done.
+
+        """
+        if not workers:
+            for partition in self.partitions:
+                yield func(partition())
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_apply, self.partitions, repeat(func))
+
+    def compute(self, workers=None):
+        """Load every partition and concatenate them into one GeoDataFrame
+
+        Args:
+            workers (int): Optional. If set, partitions are loaded in this many
+                processes.
+
+        Returns:
+            geopandas.GeoDataFrame
+
+        """
+        frames = [f for f in self.apply(_identity, workers=workers) if len(f)]
+        if not frames:
+            return ColumnBuilder().to_frame(crs=self.crs)
+        return pd.concat(frames)
+
+
+class FramePartition:
+    """A partition holding its frame in memory"""
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+
+    def __call__(self):
+        return self.dataframe
+
+
+class MappedPartition:
+    """A partition that applies func to the frame of another partition"""
+
+    def __init__(self, partition, func, args, kwargs):
+        self.partition = partition
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self):
+        return self.func(self.partition(), *self.args, **self.kwargs)
+
+
+class CatalogPartition:
+    """A partition of the items of one saved catalog, and optionally its descendants
+
+    The catalog is read from its href when the partition is loaded, so only
+    the href is sent to a worker process. The frame has the columns of
+    stacframes.df_from plus parents_col, the ids of the catalogs from the root
+    to each item's parent, so that it can be written back with
+    stacframes.df_to or df_write.
+
+    Args:
+        href (str): The href of the catalog's JSON
+        parents (tuple[str]): The ids of the catalogs from below the root to it
+        recursive (bool): If True, the items of its descendants are included
+        crs (any): The crs of the frame
+        parents_col (str): The name of the parents column
+
+    """
+
+    def __init__(
+        self,
+        href,
+        parents,
+        recursive=True,
+        crs="EPSG:4326",
+        parents_col=DEFAULT_PARENTS_COLUMN,
+    ):
+        self.href = href
+        self.parents = tuple(parents)
+        self.recursive = recursive
+        self.crs = crs
+        self.parents_col = parents_col
+
+    def __call__(self):
+        builder = ColumnBuilder()
+        for path, catalog in _walk(pystac.read_file(self.href), (), self.recursive):
+            parents = list(self.parents + path)
+            for item in catalog.get_items():
+                item_dict = item.to_dict()
+                item_dict[self.parents_col] = parents
+                builder.append(item_dict)
+        return builder.to_frame(crs=self.crs)
+
+
+def catalog_partitions(
+    catalog, depth=1, crs="EPSG:4326", parents_col=DEFAULT_PARENTS_COLUMN
+):
+    """Partition the items of catalog by the subtree of each catalog depth levels down
+
+    The items of each catalog above depth form their own partition. Partitions
+    are in the order of catalog.get_all_items(), and catalogs without item
+    links get no partition of their own.
+
+    Args:
+        catalog (pystac.Catalog): A catalog read from or saved to files
+        depth (int): The depth of the catalogs whose subtrees are partitions
+        crs (any): The crs of each partition's frame
+        parents_col (str): The name of the parents column of each frame
+
+    Returns:
+        PartitionedFrame
+
+    """
+    if catalog.get_self_href() is None:
+        raise ValueError("catalog must have a self href to be partitioned")
+    partitions = []
+    for path, node in _walk(catalog, (), True, depth):
+        recursive = len(path) == depth
+        if recursive or any(link.rel == "item" for link in node.links):
+            partitions.append(
+                CatalogPartition(
+                    node.get_self_href(), path, recursive, crs, parents_col
+                )
+            )
+    return PartitionedFrame(partitions, crs=crs)
+
+
+def _walk(catalog, path, recursive, depth=None):
+    """Yield (path, catalog) for catalog and, if recursive, its descendants to depth"""
+    yield path, catalog
+    if not recursive or (depth is not None and len(path) == depth):
+        return
+    for child in catalog.get_children():
+        yield from _walk(child, path + (child.id,), recursive, depth)
+
+
+def _apply(partition, func):
+    return func(partition())
+
+
+def _identity(dataframe):
+    return dataframe
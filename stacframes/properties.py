@@ -0,0 +1,151 @@
+""" Expand the "properties" column of a frame into one typed column per property key """
+import numpy as np
+import pandas as pd
+
+PREFIX = "properties."
+
+# String properties with at most this ratio of unique values to rows are categorical
+CATEGORY_RATIO = 0.5
+
+
+def flatten(dataframe, column="properties"):
+    """Replace the properties dict column of dataframe with one column per key
+
+    Each property key becomes a column named PREFIX + key, e.g.
+    "properties.eo:cloud_cover", in the position of the properties column.
+    Integer, float and boolean properties are stored in nullable Int64, Float64
+    and boolean columns, and string properties in string columns, or
+    categorical columns when few of their values are unique. Rows without a
+    key are missing in its column. Properties holding dicts, lists or values of
+    mixed types, including ints mixed with floats, are kept in object columns.
+    So are properties that any row explicitly sets to null: None in an object
+    column is a null property, while pandas.NA marks a row without the key.
+
+    stacframes.item_from and stacframes.df_to accept the flattened layout, and
+    stacframes.properties.nest restores the properties column.
+
+    Args:
+        dataframe (pandas.DataFrame): A frame as returned by stacframes.df_from
+        column (str): The properties dict column to flatten
+
+    Returns:
+        pandas.DataFrame: A copy of dataframe with column replaced
+
+    """
+    records = [p if isinstance(p, dict) else {} for p in dataframe[column]]
+    keys = {}
+    for record in records:
+        keys.update(dict.fromkeys(record))
+    columns = {}
+    for key in keys:
+        if any(key in record and record[key] is None for record in records):
+            values = [record.get(key, pd.NA) for record in records]
+            series = pd.Series(values, index=dataframe.index, dtype=object)
+        else:
+            values = [record.get(key) for record in records]
+            series = typed_series(values, dataframe.index)
+        columns[PREFIX + key] = series
+    order = []
+    for name in dataframe.columns:
+        order.extend(columns if name == column else [name])
+    return dataframe.drop(columns=column).assign(**columns)[order]
+
+
+def nest(dataframe, column="properties"):
+    """Fold the PREFIX columns of dataframe back into a properties dict column
+
+    Missing values are left out of each row's properties, except None, which
+    is kept as a null property. Values in an existing properties column are
+    kept unless a PREFIX column sets the same key. A new properties column
+    takes the position of the first PREFIX column.
+
+    Args:
+        dataframe (pandas.DataFrame): A frame flattened by
+            stacframes.properties.flatten
+        column (str): The properties dict column to create or update
+
+    Returns:
+        pandas.DataFrame: A copy of dataframe without PREFIX columns, or
+            dataframe itself if it has none
+
+    """
+    flattened = flattened_columns(dataframe)
+    if not flattened:
+        return dataframe
+    if column in dataframe.columns:
+        records = [dict(p) if isinstance(p, dict) else {} for p in dataframe[column]]
+    else:
+        records = [{} for _ in range(len(dataframe))]
+    for name in flattened:
+        key = name.replace(PREFIX, "", 1)
+        for record, value in zip(records, dataframe[name].astype(object)):
+            if not is_absent(value):
+                record[key] = to_python(value)
+    series = pd.Series(records, index=dataframe.index, dtype=object)
+    if column in dataframe.columns:
+        nested = dataframe.drop(columns=flattened)
+        nested[column] = series
+        return nested
+    position = list(dataframe.columns).index(flattened[0])
+    nested = dataframe.drop(columns=flattened)
+    nested.insert(position, column, series)
+    return nested
+
+
+def flattened_columns(dataframe):
+    """The names of the PREFIX columns of dataframe, in order"""
+    return [c for c in dataframe.columns if isinstance(c, str) and c.startswith(PREFIX)]
+
+
+def is_missing(value):
+    """Whether value is None, NaN, NaT or pandas.NA"""
+    return value is None or (pd.api.types.is_scalar(value) and bool(pd.isna(value)))
+
+
+def is_absent(value):
+    """Whether value marks a property a row does not have: NaN, NaT or pandas.NA
+
+    Unlike is_missing, None is not absent but a property explicitly set to null.
+
+    """
+    return value is not None and is_missing(value)
+
+
+def to_python(value):
+    """value, or its python equivalent if it is a numpy scalar
+
+    Dicts and lists are copied, with the numpy scalars nested in them
+    converted.
+
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {k: to_python(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_python(v) for v in value]
+    return value
+
+
+def typed_series(values, index):
+    """A pandas.Series of values with the most compact dtype that holds them exactly
+
+    None marks a missing value, which is pandas.NA in an object column. See
+    stacframes.properties.flatten.
+
+    """
+    present = [v for v in values if v is not None]
+    inferred = pd.api.types.infer_dtype(present)
+    if inferred == "integer":
+        dtype = "Int64"
+    elif inferred == "floating":
+        dtype = "Float64"
+    elif inferred == "boolean":
+        dtype = "boolean"
+    elif inferred == "string":
+        unique = len(set(present))
+        dtype = "category" if unique <= CATEGORY_RATIO * len(values) else "string"
+    else:
+        values = [pd.NA if v is None else v for v in values]
+        dtype = object
+    return pd.Series(values, index=index, dtype=dtype)
@@ -0,0 +1,314 @@
+""" Concurrent asyncio reading of static catalogs served over HTTP """
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import threading
+from urllib.parse import urljoin, urlparse
+
+from pystac.utils import make_absolute_href
+
+from .builder import ColumnBuilder
+from .static import read_bytes
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# The default maximum number of requests in flight at once
+DEFAULT_CONCURRENCY = 32
+
+# The default number of times a failed request is retried
+DEFAULT_RETRIES = 3
+
+# Responses with these statuses are retried, all other errors are raised
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# The number of redirects followed for one request
+MAX_REDIRECTS = 5
+
+
+class AsyncCatalogReader:
+    """Fetch the catalog, collection and item JSON of a static catalog concurrently
+
+    Documents are fetched over one pooled client: aiohttp if it is installed,
+    otherwise keep-alive http.client connections in a pool of threads. At most
+    concurrency requests are in flight at once. Requests that fail with a
+    connection error or one of RETRY_STATUSES are retried up to retries times,
+    waiting backoff * 2 ** attempt seconds before each retry. Local paths are
+    read from disk.
+
+    Items are yielded in the same order as pystac.Catalog.get_all_items(). At
+    most max_pending items are fetched ahead of the consumer, and at most
+    concurrency children of each catalog on the path being walked are
+    fetched ahead of their subtrees, so that a slow consumer holds back
+    fetching rather than filling memory.
+
+    Example:
+    ```
+    async with AsyncCatalogReader(concurrency=64) as reader:
+        df = await reader.read_frame("https://example.com/catalog.json")
+    ```
+
+    Args:
+        concurrency (int): The maximum number of requests in flight
+        retries (int): The number of times to retry a failed request
+        backoff (float): The seconds to wait before the first retry
+        max_pending (int): Optional. The maximum number of items fetched ahead
+            of the consumer. Defaults to 4 * concurrency.
+        timeout (float): The seconds to wait for each response
+
+    """
+
+    def __init__(
+        self,
+        concurrency=DEFAULT_CONCURRENCY,
+        retries=DEFAULT_RETRIES,
+        backoff=0.5,
+        max_pending=None,
+        timeout=30.0,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_pending = max_pending or 4 * concurrency
+        self.timeout = timeout
+        self._client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        if aiohttp is not None:
+            self._client = _AiohttpClient(self.concurrency, self.timeout)
+        else:
+            self._client = _ThreadedClient(self.concurrency, self.timeout)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.close()
+        self._client = None
+
+    async def fetch_json(self, href):
+        """Fetch and decode the JSON document at href, retrying failed requests"""
+        if urlparse(href).scheme not in ("http", "https"):
+            async with self._semaphore:
+                data = await asyncio.get_running_loop().run_in_executor(
+                    None, read_bytes, href
+                )
+            return _loads(data)
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    status, data = await self._client.get(href)
+            except self._client.errors:
+                if attempt >= self.retries:
+                    raise
+            else:
+                if status == 200:
+                    return _loads(data)
+                if status not in RETRY_STATUSES or attempt >= self.retries:
+                    raise OSError("GET {} returned status {}".format(href, status))
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    async def iter_item_hrefs(self, root_catalog_href):
+        """Yield the absolute href of every item in the catalog at root_catalog_href"""
+        href = make_absolute_href(root_catalog_href)
+        document = await self.fetch_json(href)
+        async for item_href in self._item_hrefs(href, document):
+            yield item_href
+
+    async def iter_item_dicts(self, root_catalog_href):
+        """Yield the JSON dict of every item in the catalog at root_catalog_href"""
+        hrefs = self.iter_item_hrefs(root_catalog_href)
+        async for _, item_dict in self._fetch_ahead(hrefs, self.max_pending):
+            yield item_dict
+
+    async def read_frame(self, root_catalog_href, crs="EPSG:4326"):
+        """Read the catalog at root_catalog_href into a new geopandas.GeoDataFrame
+
+        The frame is built as by stacframes.df_from_path.
+
+        """
+        builder = ColumnBuilder()
+        async for item_dict in self.iter_item_dicts(root_catalog_href):
+            builder.append(item_dict)
+        return builder.to_frame(crs=crs)
+
+    async def _item_hrefs(self, href, document):
+        links = document.get("links", [])
+        for link in links:
+            if link["rel"] == "item":
+                yield make_absolute_href(link["href"], href)
+        children = [
+            make_absolute_href(link["href"], href)
+            for link in links
+            if link["rel"] == "child"
+        ]
+        fetched = self._fetch_ahead(_iterate(children), self.concurrency)
+        async for child, child_document in fetched:
+            async for item_href in self._item_hrefs(child, child_document):
+                yield item_href
+
+    async def _fetch_ahead(self, hrefs, size):
+        """Yield (href, document) for each of the async iterable hrefs, in order
+
+        At most size documents are fetched or held ahead of the consumer.
+
+        """
+        pending = deque()
+        try:
+            async for href in hrefs:
+                pending.append((href, asyncio.ensure_future(self.fetch_json(href))))
+                if len(pending) >= size:
+                    href, task = pending.popleft()
+                    yield href, await task
+            while pending:
+                href, task = pending.popleft()
+                yield href, await task
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+
+def df_from_url(
+    root_catalog_href,
+    crs="EPSG:4326",
+    concurrency=DEFAULT_CONCURRENCY,
+    retries=DEFAULT_RETRIES,
+):
+    """Read the static catalog at root_catalog_href concurrently into a GeoDataFrame
+
+    Like stacframes.df_from_path, but every catalog, collection and item
+    document is fetched by an AsyncCatalogReader, with up to concurrency
+    requests in flight. Use AsyncCatalogReader.read_frame directly from code
+    that is already running in an event loop.
+
+    Example:
+    ```
+    df = stacframes.df_from_url("https://example.com/catalog.json", concurrency=64)
+    ```
+
+    Args:
+        root_catalog_href (str): Url or path of the root catalog.json
+        crs (any): Optional. Value can be anything accepted by
+            http://pyproj4.github.io/pyproj/stable/api/crs/crs.html#pyproj.crs.CRS.from_user_input
+        concurrency (int): Optional. The maximum number of requests in flight
+        retries (int): Optional. The number of times to retry a failed request
+
+    Returns:
+        geopandas.GeoDataFrame
+
+    """
+
+    async def read():
+        async with AsyncCatalogReader(concurrency, retries) as reader:
+            return await reader.read_frame(root_catalog_href, crs=crs)
+
+    return asyncio.run(read())
+
+
+class _AiohttpClient:
+    """GET requests over one aiohttp session"""
+
+    def __init__(self, concurrency, timeout):
+        self.errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+
+    async def get(self, url):
+        async with self._session.get(url) as response:
+            return response.status, await response.read()
+
+    async def close(self):
+        await self._session.close()
+
+
+class _ThreadedClient:
+    """GET requests over keep-alive http.client connections, one per thread and host"""
+
+    errors = (OSError, http.client.HTTPException)
+
+    def __init__(self, concurrency, timeout):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    async def get(self, url):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._get, url)
+
+    async def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+
+    def _get(self, url):
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, body = self._request(url)
+            location = headers.get("Location")
+            if status not in (301, 302, 303, 307, 308) or location is None:
+                return status, body
+            url = urljoin(url, location)
+        return status, body
+
+    def _request(self, url):
+        parts = urlparse(url)
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        key = (parts.scheme, parts.netloc)
+        connection = connections.get(key)
+        if connection is None:
+            if parts.scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    parts.netloc, timeout=self.timeout
+                )
+            else:
+                connection = http.client.HTTPConnection(
+                    parts.netloc, timeout=self.timeout
+                )
+            connections[key] = connection
+            with self._lock:
+                self._connections.append(connection)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            body = response.read()
+        except self.errors:
+            connection.close()
+            del connections[key]
+            raise
+        if response.will_close:
+            connection.close()
+            del connections[key]
+        return response.status, response.headers, body
+
+
+async def _iterate(values):
+    for value in values:
+        yield value
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
@@ -0,0 +1,98 @@
+""" Read static STAC catalogs straight from their JSON, without pystac objects """
+from concurrent.futures import ThreadPoolExecutor
+import json
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from pystac.utils import make_absolute_href
+
+from .builder import ColumnBuilder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def read_bytes(href):
+    """Read the contents of href, which may be a local path or an http(s) url"""
+    if urlparse(href).scheme in ("http", "https"):
+        with urlopen(href) as response:
+            return response.read()
+    with open(href, "rb") as f:
+        return f.read()
+
+
+def read_json(href):
+    """Read and decode the JSON document at href
+
+    href may be a local path or an http(s) url. orjson is used to decode the
+    document if it is installed.
+
+    """
+    data = read_bytes(href)
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def iter_item_hrefs(root_catalog_href):
+    """Yield the absolute href of every item in the catalog at root_catalog_href
+
+    Only child and item links are followed. Items are yielded in the same order
+    as pystac.Catalog.get_all_items(): each catalog's own items first, then the
+    items of each of its children in turn.
+
+    """
+    stack = [make_absolute_href(root_catalog_href)]
+    while stack:
+        href = stack.pop()
+        links = read_json(href).get("links", [])
+        for link in links:
+            if link["rel"] == "item":
+                yield make_absolute_href(link["href"], href)
+        children = [
+            make_absolute_href(link["href"], href)
+            for link in links
+            if link["rel"] == "child"
+        ]
+        stack.extend(reversed(children))
+
+
+def iter_item_dicts(root_catalog_href, workers=None):
+    """Yield the JSON dict of every item in the catalog at root_catalog_href
+
+    Args:
+        root_catalog_href (str): Path or url of the root catalog.json
+        workers (int): Optional. If set, items are read in this many threads.
+            Items are yielded in the same order either way.
+
+    """
+    hrefs = iter_item_hrefs(root_catalog_href)
+    if not workers:
+        yield from map(read_json, hrefs)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(read_json, hrefs)
+
+
+def df_from_path(root_catalog_href, crs="EPSG:4326", workers=None):
+    """Read the static catalog at root_catalog_href into a new geopandas.GeoDataFrame
+
+    Walks the catalog's child and item links and loads each item's JSON directly
+    into columns, without constructing the pystac object graph. The frame has
+    the same index, columns and dtypes as stacframes.df_from, but values are
+    taken from the JSON as written: the links column holds each item's links as
+    stored on disk, and stac_version is not migrated.
+
+    Args:
+        root_catalog_href (str): Path or url of the root catalog.json
+        crs (any): Optional. Value can be anything accepted by
+            http://pyproj4.github.io/pyproj/stable/api/crs/crs.html#pyproj.crs.CRS.from_user_input
+        workers (int): Optional. If set, items are read in this many threads.
+
+    Returns:
+        geopandas.GeoDataFrame
+
+    """
+    builder = ColumnBuilder()
+    builder.extend(iter_item_dicts(root_catalog_href, workers=workers))
+    return builder.to_frame(crs=crs)
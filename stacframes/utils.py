@@ -1,4 +1,11 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
 import pystac
 
 
@@ -20,6 +27,319 @@ def update_collection_extents(catalog):
         catalog.update_extent_from_items()
 
 
+def iter_items(catalog, item_filter=None, keep=True):
+    """Yield the items in the catalog tree, in the order of catalog.get_all_items()
+
+    Args:
+        catalog (pystac.Catalog)
+        item_filter (stacframes.filters.ItemFilter): Optional. Only items matching
+            the filter are yielded, and child collections whose extent cannot
+            contain a match are not walked.
+        keep (bool): Optional. If False, each item read from its file is
+            detached again once the next one is requested: its link is reset
+            to its href and it is removed from the root's resolved objects, so
+            that the tree does not hold every item read.
+
+    """
+    if not item_filter and keep:
+        yield from catalog.get_all_items()
+        return
+    root = catalog.get_root()
+    for link in catalog.links:
+        if link.rel != pystac.RelType.ITEM:
+            continue
+        href = None if link.is_resolved() else link.target
+        item = link.resolve_stac_object(root=root).target
+        if not item_filter or item_filter.matches_item(item):
+            yield item
+        if not keep and href is not None:
+            item.set_root(None)
+            link.target = href
+    for child in _children(catalog, item_filter):
+        yield from iter_items(child, item_filter, keep)
+
+
+def resolve_items(catalog, workers, item_filter=None):
+    """Resolve every item link in the catalog tree using a pool of worker threads
+
+    Child links are walked first to discover each catalog's item links. The items
+    are then read and parsed concurrently by pystac in up to workers threads and
+    attached to their links exactly as catalog.get_all_items() would, so
+    iterating the catalog afterwards yields the same items in the same order
+    without further reads.
+
+    Args:
+        catalog (pystac.Catalog)
+        workers (int): The number of threads to read items with
+        item_filter (stacframes.filters.ItemFilter): Optional. Child collections
+            whose extent cannot contain a match are not walked.
+
+    """
+    catalogs = [catalog]
+    links = []
+    while catalogs:
+        current = catalogs.pop()
+        links.extend(link for link in current.links if link.rel == "item")
+        catalogs.extend(_children(current, item_filter))
+    resolve_links(links, catalog.get_root(), workers)
+
+
+def resolve_links(links, root, workers):
+    """Resolve the unresolved links in links using a pool of worker threads
+
+    Args:
+        links (list[pystac.Link])
+        root (pystac.Catalog): The root catalog to resolve links against
+        workers (int): The number of threads to read links with
+
+    """
+    links = [link for link in links if not link.is_resolved()]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(lambda link: link.resolve_stac_object(root=root), links):
+            pass
+
+
+def index_items(builder):
+    """Map the id of every item in the builder's catalog tree to its path and item
+
+    Args:
+        builder (CatalogBuilder)
+
+    Returns:
+        dict: item id -> (tuple of parent catalog ids, pystac.Item)
+
+    """
+    return {
+        item.id: (path, item)
+        for path, catalog in builder.walk()
+        for item in catalog.get_items()
+    }
+
+
+def item_hash(item):
+    """A hash of the content of item, ignoring its links, hrefs and collection"""
+    item_dict = item.to_dict(include_self_link=False, transform_hrefs=False)
+    item_dict.pop("links", None)
+    item_dict.pop("collection", None)
+    content = json.dumps(item_dict, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def remove_items(catalog, item_ids):
+    """Remove the items with ids in item_ids from catalog in a single pass
+
+    Equivalent to calling catalog.remove_item for each id.
+
+    """
+    root = catalog.get_root()
+    links = []
+    for link in catalog.links:
+        if link.rel == "item":
+            link.resolve_stac_object(root=root)
+            if link.target.id in item_ids:
+                link.target.set_parent(None)
+                link.target.set_root(None)
+                continue
+        links.append(link)
+    catalog.links = links
+
+
+def refresh_extents(catalogs, paths):
+    """Recompute the extent of each pystac.Collection along paths
+
+    Collections are updated deepest first, each from its own items and the
+    extents of its child collections, so untouched subtrees are not re-read.
+    Collections left without items have their extent reset to empty_extent().
+
+    Args:
+        catalogs (dict): parents tuple -> pystac.Catalog, e.g. CatalogBuilder.catalogs
+        paths (iterable[tuple]): The parents tuples whose items changed
+
+    """
+    prefixes = {path[:depth] for path in paths for depth in range(len(path) + 1)}
+    for path in sorted(prefixes, key=len, reverse=True):
+        collection = catalogs[path]
+        if not isinstance(collection, pystac.Collection):
+            continue
+        items = list(collection.get_items())
+        bounds = _bounds_from(pystac.Extent.from_items(items)) if items else None
+        for child in collection.get_children():
+            if isinstance(child, pystac.Collection):
+                child_bounds = _bounds_from(child.extent)
+                if child_bounds is not None:
+                    bounds = _union(bounds, child_bounds)
+        collection.extent = empty_extent() if bounds is None else _extent_from(bounds)
+
+
+def _children(catalog, item_filter):
+    """The children of catalog that may contain items matching item_filter"""
+    for child in catalog.get_children():
+        if (
+            item_filter
+            and isinstance(child, pystac.Collection)
+            and not item_filter.intersects_extent(child.extent)
+        ):
+            continue
+        yield child
+
+
+def extents_from_frame(dataframe, groups):
+    """Compute the extent of every parents prefix in groups from dataframe
+
+    Spatial extents come from the bbox column, temporal extents from the datetime
+    column and any start_datetime / end_datetime in the properties column. Rows
+    are reduced with a vectorized groupby min / max per group, and each group is
+    then rolled up into every prefix of its parents, so that the extent for
+    ("foo",) covers the rows in both ("foo",) and ("foo", "bar").
+
+    Args:
+        dataframe (pandas.DataFrame): A DataFrame of rows structured as described
+            by stacframes.item_from
+        groups (dict): parents tuple -> list of row positions, as returned by
+            stacframes.parents.group_positions
+
+    Returns:
+        dict: parents tuple -> pystac.Extent
+
+    """
+    codes = np.empty(len(dataframe), dtype=np.intp)
+    for code, positions in enumerate(groups.values()):
+        codes[positions] = code
+
+    bboxes = np.array(
+        [(b[0], b[1], b[3], b[4]) if len(b) == 6 else b for b in dataframe["bbox"]],
+        dtype=float,
+    ).reshape(len(dataframe), 4)
+    frame = pd.DataFrame(bboxes, columns=["minx", "miny", "maxx", "maxy"])
+    frame["start"] = _datetimes(dataframe, "start_datetime")
+    frame["end"] = _datetimes(dataframe, "end_datetime")
+    reduced = frame.groupby(codes).agg(
+        {
+            "minx": "min",
+            "miny": "min",
+            "maxx": "max",
+            "maxy": "max",
+            "start": "min",
+            "end": "max",
+        }
+    )
+
+    keys = list(groups)
+    bounds = {}
+    for code, row in zip(reduced.index, reduced.itertuples(index=False)):
+        parents = keys[code]
+        for depth in range(len(parents) + 1):
+            prefix = parents[:depth]
+            bounds[prefix] = _union(bounds.get(prefix), _Bounds(*row))
+    return {prefix: _extent_from(b) for prefix, b in bounds.items()}
+
+
+def set_collection_extents(catalogs, extents):
+    """Set the extent of every pystac.Collection in catalogs
+
+    Collections that already had a spatial extent, i.e. were not created with
+    empty_extent(), have it expanded to cover the new extent instead.
+
+    Args:
+        catalogs (dict): parents tuple -> pystac.Catalog
+        extents (dict): parents tuple -> pystac.Extent, as returned by
+            extents_from_frame
+
+    """
+    for parents, extent in extents.items():
+        collection = catalogs.get(parents)
+        if not isinstance(collection, pystac.Collection):
+            continue
+        previous = _bounds_from(collection.extent)
+        if previous is not None:
+            extent = _extent_from(_union(previous, _bounds_from(extent)))
+        collection.extent = extent
+
+
+def merge_extents(extents, other):
+    """Combine two dicts of extents as returned by extents_from_frame
+
+    The extents of parents in both are unioned, e.g. to combine the extents
+    computed from each partition of a frame.
+
+    Returns:
+        dict: parents tuple -> pystac.Extent
+
+    """
+    merged = dict(extents)
+    for parents, extent in other.items():
+        current = merged.get(parents)
+        if current is not None:
+            extent = _extent_from(_union(_bounds_from(current), _bounds_from(extent)))
+        merged[parents] = extent
+    return merged
+
+
+_Bounds = namedtuple("_Bounds", ["minx", "miny", "maxx", "maxy", "start", "end"])
+
+
+def _datetimes(dataframe, property_name):
+    """UTC datetimes for each row from properties[property_name], else datetime"""
+    if "datetime" in dataframe.columns:
+        values = pd.Series(pd.to_datetime(list(dataframe["datetime"]), utc=True))
+    else:
+        values = pd.Series(
+            pd.NaT, index=range(len(dataframe)), dtype="datetime64[ns, UTC]"
+        )
+    if "properties" in dataframe.columns:
+        overrides = [
+            p.get(property_name) if isinstance(p, dict) else None
+            for p in dataframe["properties"]
+        ]
+        if any(overrides):
+            overrides = pd.Series(pd.to_datetime(overrides, utc=True))
+            values = overrides.where(overrides.notna(), values)
+    return values
+
+
+def _union(a, b):
+    """Combine two _Bounds, ignoring missing values"""
+    if a is None:
+        return b
+    return _Bounds(
+        np.fmin(a.minx, b.minx),
+        np.fmin(a.miny, b.miny),
+        np.fmax(a.maxx, b.maxx),
+        np.fmax(a.maxy, b.maxy),
+        min((t for t in (a.start, b.start) if not pd.isna(t)), default=None),
+        max((t for t in (a.end, b.end) if not pd.isna(t)), default=None),
+    )
+
+
+def _bounds_from(extent):
+    """_Bounds for a pystac.Extent, or None if it has no spatial extent"""
+    if extent is None or None in extent.spatial.bboxes:
+        return None
+    bbox = extent.spatial.bboxes[0]
+    if len(bbox) == 6:
+        bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
+    start, end = extent.temporal.intervals[0]
+    return _Bounds(
+        *bbox,
+        pd.Timestamp(start) if start else None,
+        pd.Timestamp(end) if end else None
+    )
+
+
+def _extent_from(bounds):
+    bbox = [
+        float(bounds.minx),
+        float(bounds.miny),
+        float(bounds.maxx),
+        float(bounds.maxy),
+    ]
+    start = None if pd.isna(bounds.start) else bounds.start.to_pydatetime()
+    end = None if pd.isna(bounds.end) else bounds.end.to_pydatetime()
+    return pystac.Extent(
+        pystac.SpatialExtent([bbox]), pystac.TemporalExtent([[start, end]])
+    )
+
+
 def build_recursive(catalog, children, catalog_type="collection"):
     """Append child catalogs to catalog with the ids in children
 
@@ -54,21 +374,88 @@ def build_recursive(catalog, children, catalog_type="collection"):
 
 
     """
-    if not children:
+    return CatalogBuilder(catalog, catalog_type).get(children)
+
+
+class CatalogBuilder:
+    """Find or create the child catalogs of catalog by their path of ids
+
+    Every catalog found or created is indexed by its path, and the children of
+    a catalog are indexed by id the first time one of them is looked up, so
+    repeated lookups take constant time instead of a linear get_child scan at
+    each level. Reuse one builder for all the lookups into a catalog tree.
+
+    Example:
+    ```
+    builder = CatalogBuilder(catalog, "collection")
+    leaf_catalog = builder.get(["foo", "bar"])
+    builder.catalogs
+        <{(): catalog, ("foo",): Collection("foo"), ("foo", "bar"): Collection("bar")}>
+    ```
+
+    Args:
+        catalog (pystac.Catalog | pystac.Collection): The root of the paths
+        catalog_type (str): Must be either "catalog" or "collection". Each child
+            created will be of the requested catalog_type.
+
+    """
+
+    def __init__(self, catalog, catalog_type="collection"):
+        self.catalog_type = catalog_type
+        self.catalogs = {(): catalog}
+        self._children = {}
+
+    def get(self, children):
+        """Return the catalog at the path children, creating any that are missing
+
+        Args:
+            children (list[str]): A list of child catalog ids to walk in order,
+                down the catalog tree. It is not modified.
+
+        Return:
+            pystac.Catalog
+
+        """
+        path = tuple(children)
+        catalog = self.catalogs.get(path)
+        if catalog is not None:
+            return catalog
+        parent = self.get(path[:-1])
+        siblings = self._children.get(path[:-1])
+        if siblings is None:
+            siblings = {child.id: child for child in parent.get_children()}
+            self._children[path[:-1]] = siblings
+        catalog = siblings.get(path[-1])
+        if catalog is None:
+            catalog = self._create(path[-1])
+            parent.add_child(catalog)
+            siblings[catalog.id] = catalog
+        self.catalogs[path] = catalog
         return catalog
-    else:
-        child_id = children.pop(0)
-        child_catalog = catalog.get_child(child_id)
-        if child_catalog is None:
-            if catalog_type == "catalog":
-                child_catalog = pystac.Catalog(child_id, child_id)
-            elif catalog_type == "collection":
-                child_catalog = pystac.Collection(child_id, child_id, empty_extent())
-            else:
-                raise TypeError(
-                    "catalog_type {} must be 'catalog' or 'collection'".format(
-                        catalog_type
-                    )
-                )
-            catalog.add_child(child_catalog)
-        return build_recursive(child_catalog, children, catalog_type)
+
+    def walk(self, path=()):
+        """Yield (path, catalog) for the catalog at path and all of its descendants
+
+        Every catalog visited is added to the index.
+
+        """
+        catalog = self.get(path)
+        yield path, catalog
+        siblings = self._children.get(path)
+        if siblings is None:
+            siblings = {child.id: child for child in catalog.get_children()}
+            self._children[path] = siblings
+        for child_id, child in siblings.items():
+            self.catalogs[path + (child_id,)] = child
+            yield from self.walk(path + (child_id,))
+
+    def _create(self, child_id):
+        if self.catalog_type == "catalog":
+            return pystac.Catalog(child_id, child_id)
+        elif self.catalog_type == "collection":
+            return pystac.Collection(child_id, child_id, empty_extent())
+        raise TypeError(
+            "catalog_type {} must be 'catalog' or 'collection'".format(
+                self.catalog_type
+            )
+        )
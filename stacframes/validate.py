@@ -0,0 +1,335 @@
+""" Column-wise checks of a frame before stacframes.df_to() builds items from it """
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+from pyproj import CRS
+import shapely
+
+from . import assets
+from .convert import STAC_CRS
+from . import properties
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+
+# The columns every row must have
+REQUIRED_COLUMNS = ["id", "geometry", "bbox"]
+
+# The absolute difference in degrees allowed between a bbox and its geometry's bounds
+BBOX_TOLERANCE = 1e-7
+
+# The number of index labels listed in each error message
+MAX_IDS = 5
+
+_JSON_TYPES = {str, int, float, bool, type(None), list, dict}
+
+# numpy scalars that stacframes.item_from converts to JSON values
+_NUMPY_TYPES = (np.integer, np.floating, np.bool_)
+
+
+class ValidationError(ValueError):
+    """Raised by stacframes.validate_df with every problem found in a frame
+
+    Args:
+        errors (list[str]): One message per failed check
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("\n".join(errors))
+
+
+def check_frame(dataframe, parents_col):
+    """The problems found by checking whole columns of dataframe at once
+
+    Args:
+        dataframe (pandas.DataFrame): A frame structured as described by
+            stacframes.item_from
+        parents_col (str): The parents column of dataframe, if it has one
+
+    Returns:
+        list[str]: One message per failed check, with the index labels of up
+            to MAX_IDS of the rows that failed it
+
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in dataframe.columns]
+    if missing:
+        return ["missing required columns: {}".format(", ".join(missing))]
+
+    ids = dataframe["id"]
+    checks = [
+        ("missing or non-string id", ~_is_str(ids)),
+        ("duplicate id", ids.duplicated(keep=False).to_numpy()),
+    ]
+    geometries = np.asarray(dataframe["geometry"], dtype=object)
+    not_geometry = ~shapely.is_geometry(geometries)
+    checks.append(("missing or non-shapely geometry", not_geometry))
+    geometries = np.where(not_geometry, None, geometries)
+    checks.append(("empty geometry", shapely.is_empty(geometries)))
+    checks.append(("invalid geometry", ~shapely.is_valid(geometries) & ~not_geometry))
+    checks.extend(_check_bboxes(dataframe, geometries))
+    checks.append(("missing or invalid datetime", ~_has_datetime(dataframe)))
+    checks.extend(_check_properties(dataframe))
+    if parents_col in dataframe.columns:
+        checks.append(
+            (
+                "parents that are not a list of strings",
+                ~_is_parents(dataframe[parents_col]),
+            )
+        )
+    return [
+        _message(name, dataframe.index, failed)
+        for name, failed in checks
+        if failed.any()
+    ]
+
+
+def layouts(dataframe):
+    """The position of the first row with each distinct property and asset key layout
+
+    Two rows have the same layout when they have the same property keys, the
+    same asset keys with the same fields, and the same stac_extensions. Keys
+    in a different order are counted as a different layout.
+
+    Returns:
+        dict: layout -> (position of its first row, number of rows)
+
+    """
+    parts = []
+    if "properties" in dataframe.columns:
+        parts.append([_dict_keys(p) for p in dataframe["properties"]])
+    if "assets" in dataframe.columns:
+        parts.append([_asset_keys(a) for a in dataframe["assets"]])
+    if "stac_extensions" in dataframe.columns:
+        parts.append(
+            [
+                tuple(e) if isinstance(e, list) else ()
+                for e in dataframe["stac_extensions"]
+            ]
+        )
+    columns = properties.flattened_columns(dataframe)
+    templates = dataframe.attrs.get(assets.TEMPLATES_ATTR)
+    if templates:
+        columns += assets.templated_columns(dataframe.columns, templates)
+    if columns:
+        present = dataframe[columns].notna().to_numpy()
+        parts.append([row.tobytes() for row in np.packbits(present, axis=1)])
+
+    found = {}
+    for position, layout in enumerate(zip(*parts) if parts else [()] * len(dataframe)):
+        first = found.get(layout)
+        found[layout] = (position, 1) if first is None else (first[0], first[1] + 1)
+    return found
+
+
+def require_jsonschema():
+    """Raise ImportError if jsonschema, which pystac validates items with, is missing"""
+    if jsonschema is None:
+        raise ImportError(
+            "jsonschema is required for schema validation, "
+            "install stacframes[validation] or pass schema=False"
+        )
+
+
+def _check_bboxes(dataframe, geometries):
+    """The bbox checks, comparing each bbox to its geometry's bounds
+
+    The comparison is skipped for a GeoDataFrame not in EPSG:4326, whose bbox
+    column stacframes.df_to recomputes after reprojecting it.
+
+    """
+    bboxes = list(dataframe["bbox"])
+    try:
+        corners = np.array(bboxes, dtype=float)
+    except (TypeError, ValueError):
+        corners = None
+    if corners is not None and corners.ndim == 2 and corners.shape[1] in (4, 6):
+        lengths = np.full(len(bboxes), corners.shape[1])
+    else:
+        lengths = np.array([_bbox_length(b) for b in bboxes], dtype=int)
+    bad_length = (lengths != 4) & (lengths != 6)
+    checks = [("bbox that is not 4 or 6 numbers", bad_length)]
+    crs = getattr(dataframe, "crs", None)
+    if crs is not None and crs != CRS.from_user_input(STAC_CRS):
+        return checks
+
+    corners = np.full((len(bboxes), 4), np.nan)
+    for i in np.flatnonzero(lengths == 4):
+        corners[i] = bboxes[i]
+    for i in np.flatnonzero(lengths == 6):
+        b = bboxes[i]
+        corners[i] = [b[0], b[1], b[3], b[4]]
+    bounds = shapely.bounds(geometries)
+    # A bbox crossing the antimeridian has minx > maxx, so only its y is compared
+    crosses = corners[:, 0] > corners[:, 2]
+    with np.errstate(invalid="ignore"):
+        outside = (
+            (~crosses & (corners[:, 0] > bounds[:, 0] + BBOX_TOLERANCE))
+            | (~crosses & (corners[:, 2] < bounds[:, 2] - BBOX_TOLERANCE))
+            | (corners[:, 1] > bounds[:, 1] + BBOX_TOLERANCE)
+            | (corners[:, 3] < bounds[:, 3] - BBOX_TOLERANCE)
+        )
+    checked = ~bad_length & ~np.isnan(bounds).any(axis=1)
+    checks.append(("bbox that does not contain its geometry", outside & checked))
+    return checks
+
+
+def _has_datetime(dataframe):
+    """Whether each row has a datetime, or both a start_datetime and end_datetime"""
+    if "datetime" in dataframe.columns:
+        column = dataframe["datetime"]
+        if pd.api.types.is_datetime64_any_dtype(column.dtype):
+            present = column.notna().to_numpy(copy=True)
+        else:
+            values = column.astype(object)
+            present = values.notna().to_numpy(copy=True)
+            parsed = pd.to_datetime(
+                values[present], errors="coerce", utc=True, format="ISO8601"
+            )
+            present[present] = parsed.notna().to_numpy()
+    else:
+        present = np.zeros(len(dataframe), dtype=bool)
+    missing = np.flatnonzero(~present)
+    if len(missing):
+        rows = dataframe.iloc[missing]
+        ranged = _has_property(rows, "start_datetime")
+        ranged &= _has_property(rows, "end_datetime")
+        present[missing] = _has_property(rows, "datetime") | ranged
+    return present
+
+
+def _has_property(dataframe, key):
+    """Whether each row has a value for the property key"""
+    present = np.zeros(len(dataframe), dtype=bool)
+    if "properties" in dataframe.columns:
+        present |= np.array(
+            [
+                isinstance(p, dict) and p.get(key) is not None
+                for p in dataframe["properties"]
+            ],
+            dtype=bool,
+        )
+    name = properties.PREFIX + key
+    if name in dataframe.columns:
+        present |= dataframe[name].notna().to_numpy()
+    return present
+
+
+def _check_properties(dataframe):
+    """The checks that properties are dicts of JSON values without NaN or infinity
+
+    Dicts and lists are checked recursively. numpy integer, floating and bool
+    scalars count as JSON values. Values in flattened columns with a
+    numeric, boolean, string or categorical dtype are converted by
+    stacframes.item_from and are not checked.
+
+    """
+    checks = []
+    columns = []
+    if "properties" in dataframe.columns:
+        column = dataframe["properties"]
+        not_dict = np.array(
+            [not isinstance(p, dict) and not properties.is_missing(p) for p in column],
+            dtype=bool,
+        )
+        checks.append(("properties that is not a dict", not_dict))
+        columns.append([p.values() if isinstance(p, dict) else () for p in column])
+    for name in properties.flattened_columns(dataframe):
+        column = dataframe[name]
+        if column.dtype == object:
+            columns.append([() if properties.is_missing(v) else (v,) for v in column])
+            continue
+        if pd.api.types.is_float_dtype(column.dtype):
+            values = column.to_numpy(dtype=float, na_value=0.0)
+            checks.append(("NaN or infinite property value", ~np.isfinite(values)))
+
+    for rows in columns:
+        flat = list(_leaves(itertools.chain.from_iterable(rows)))
+        floats = np.fromiter(
+            (v for v in flat if isinstance(v, (float, np.floating))), dtype=float
+        )
+        if all(map(_is_json_type, set(map(type, flat)))) and np.isfinite(floats).all():
+            continue
+        bad_type = np.zeros(len(dataframe), dtype=bool)
+        not_finite = np.zeros(len(dataframe), dtype=bool)
+        for i, values in enumerate(rows):
+            for value in _leaves(values):
+                if not _is_json_type(type(value)):
+                    bad_type[i] = True
+                elif isinstance(value, (float, np.floating)) and not math.isfinite(
+                    value
+                ):
+                    not_finite[i] = True
+        checks.append(("property value that is not a JSON type", bad_type))
+        checks.append(("NaN or infinite property value", not_finite))
+    return checks
+
+
+def _is_json_type(value_type):
+    return value_type in _JSON_TYPES or issubclass(value_type, _NUMPY_TYPES)
+
+
+def _leaves(values):
+    """Yield each of values that is not a dict or list, and those nested inside them"""
+    for value in values:
+        if type(value) is dict:
+            yield from _leaves(value.values())
+        elif type(value) is list:
+            yield from _leaves(value)
+        else:
+            yield value
+
+
+def _message(name, index, failed):
+    labels = [str(label) for label in index[failed][:MAX_IDS]]
+    count = int(failed.sum())
+    more = ", ..." if count > MAX_IDS else ""
+    return "{} row(s) with {}, at index {}{}".format(
+        count, name, ", ".join(labels), more
+    )
+
+
+def _is_str(column):
+    """Whether each value of column is a string"""
+    if pd.api.types.is_string_dtype(column.dtype) and column.dtype != object:
+        return column.notna().to_numpy(dtype=bool)
+    return np.array([isinstance(v, str) for v in column], dtype=bool)
+
+
+def _is_parents(column):
+    """Whether each value of column is a list of strings"""
+    values = list(column)
+    if set(map(type, values)) <= {list, tuple} and set(
+        map(type, itertools.chain.from_iterable(values))
+    ) <= {str}:
+        return np.ones(len(values), dtype=bool)
+    return np.array(
+        [
+            isinstance(v, (list, tuple)) and all(isinstance(p, str) for p in v)
+            for v in values
+        ],
+        dtype=bool,
+    )
+
+
+def _bbox_length(bbox):
+    if not isinstance(bbox, (list, tuple, np.ndarray)):
+        return 0
+    if not all(isinstance(v, (int, float, np.number)) for v in bbox):
+        return 0
+    return len(bbox)
+
+
+def _dict_keys(value):
+    return tuple(value) if isinstance(value, dict) else ()
+
+
+def _asset_keys(value):
+    if not isinstance(value, dict):
+        return ()
+    return tuple([(key, _dict_keys(asset)) for key, asset in value.items()])
@@ -0,0 +1,63 @@
+import unittest
+
+import pandas as pd
+
+from stacframes.assets import expand, templatize, TEMPLATES_ATTR
+
+
+class TestAssetsManager(unittest.TestCase):
+    def test_templatize(self):
+        assets = [
+            {
+                "data": {"href": "0.tif", "title": "Data", "roles": ["data"]},
+                "thumbnail": {"href": "0.png", "title": "Thumbnail 0"},
+            },
+            {"data": {"href": "1.tif", "title": "Data", "roles": ["data"]}},
+            {
+                "data": {"href": "2.tif", "title": "Data", "roles": ["data"]},
+                "thumbnail": {"href": "2.png", "title": "Thumbnail 2"},
+            },
+        ]
+        df = pd.DataFrame({"id": ["a", "b", "c"], "assets": assets, "links": [[]] * 3})
+        templated = templatize(df)
+        self.assertEqual(
+            templated.attrs[TEMPLATES_ATTR],
+            {"data": {"title": "Data", "roles": ["data"]}, "thumbnail": {}},
+        )
+        self.assertEqual(
+            list(templated.columns),
+            [
+                "id",
+                "assets.data.href",
+                "assets.thumbnail.href",
+                "assets.thumbnail.title",
+                "links",
+            ],
+        )
+        self.assertTrue(pd.isna(templated["assets.thumbnail.href"].iloc[1]))
+
+        expanded = expand(templated)
+        self.assertEqual(list(expanded.columns), ["id", "links", "assets"])
+        self.assertEqual(expanded["assets"].tolist(), assets)
+        self.assertNotIn(TEMPLATES_ATTR, expanded.attrs)
+
+    def test_expand_without_templates(self):
+        df = pd.DataFrame({"id": ["a"], "assets": [{"data": {"href": "a.tif"}}]})
+        self.assertIs(expand(df), df)
+
+    def test_dotted_keys(self):
+        assets = [
+            {
+                "a": {"href": "a0.tif", "title": "A"},
+                "a.b": {"href": "ab0.tif", "title": "AB"},
+                "a%2Eb": {"href": "pct0.tif"},
+            },
+            {"a.b": {"href": "ab1.tif", "title": "AB"}},
+        ]
+        df = pd.DataFrame({"id": ["x", "y"], "assets": assets})
+        templated = templatize(df)
+        self.assertEqual(
+            list(templated.columns),
+            ["id", "assets.a.href", "assets.a%2Eb.href", "assets.a%252Eb.href"],
+        )
+        self.assertEqual(expand(templated)["assets"].tolist(), assets)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+import json
+import unittest
+from unittest import mock
+
+import geopandas as gpd
+import pandas as pd
+import pystac
+import shapely
+from shapely.errors import GEOSException
+from shapely.geometry import box, mapping, Point, shape
+
+from stacframes.convert import (
+    bboxes_from_geometries,
+    datetimes_from_str,
+    datetimes_to_str,
+    geojson_from_geometries,
+    geometries_from_geojson,
+)
+
+
+class TestConvertManager(unittest.TestCase):
+    def test_geojson_round_trip(self):
+        geometries = gpd.GeoSeries([box(0.0, 0.0, 1.0, 1.0), Point(1.5, 2.5, 3.5)])
+        geojsons = geojson_from_geometries(geometries)
+        self.assertEqual(geojsons[1], {"type": "Point", "coordinates": [1.5, 2.5, 3.5]})
+        self.assertEqual(
+            geojsons[0]["coordinates"],
+            [[list(c) for c in mapping(geometries[0])["coordinates"][0]]],
+        )
+        self.assertTrue(all(geometries_from_geojson(geojsons) == geometries.to_numpy()))
+
+    def test_geometries_from_geojson_3d(self):
+        """Ensure Z coordinates are read, also where GEOS cannot read them in bulk"""
+        geojsons = [
+            {"type": "Point", "coordinates": [1.5, 2.5, 3.5]},
+            {
+                "type": "Polygon",
+                "coordinates": [[[0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 0, 1]]],
+            },
+        ]
+        expected = [shape(g) for g in geojsons]
+        self.assertTrue(all(shapely.has_z(geometries_from_geojson(geojsons))))
+        self.assertTrue(all(geometries_from_geojson(geojsons) == expected))
+        error = GEOSException("Expected two coordinates found more than two")
+        with mock.patch.object(shapely, "from_geojson", side_effect=error):
+            self.assertTrue(all(geometries_from_geojson(geojsons) == expected))
+
+    def test_geojson_from_geometries_3d(self):
+        """Ensure Z coordinates are written where GEOS would drop them in bulk"""
+        geometries = [Point(1.5, 2.5, 3.5), box(0.0, 0.0, 1.0, 1.0), None]
+        expected = json.loads(json.dumps([mapping(g) for g in geometries[:2]] + [None]))
+        to_geojson = shapely.to_geojson
+
+        def drop_z(values):
+            return to_geojson(shapely.force_2d(values))
+
+        with mock.patch.object(shapely, "geos_version", (3, 11, 1)):
+            with mock.patch.object(shapely, "to_geojson", side_effect=drop_z):
+                geojsons = geojson_from_geometries(geometries)
+                self.assertEqual(geojsons, expected)
+                self.assertEqual(geojsons[0]["coordinates"], [1.5, 2.5, 3.5])
+
+    def test_geojson_missing(self):
+        self.assertEqual(geojson_from_geometries([]), [])
+        self.assertEqual(geojson_from_geometries([None]), [None])
+
+    def test_bboxes_from_geometries(self):
+        geometries = [box(0.0, 1.0, 2.0, 3.0), None, Point()]
+        self.assertEqual(
+            bboxes_from_geometries(geometries), [[0.0, 1.0, 2.0, 3.0], None, None]
+        )
+
+    def test_datetimes_to_str(self):
+        values = [
+            datetime(2020, 1, 1, tzinfo=timezone.utc),
+            datetime(2020, 1, 1, 1, 2, 3, 4500, tzinfo=timezone.utc),
+        ]
+        expected = ["2020-01-01T00:00:00Z", "2020-01-01T01:02:03.004500Z"]
+        self.assertEqual(datetimes_to_str(pd.Series(values)), expected)
+        self.assertEqual(datetimes_to_str(values), expected)
+        naive = pd.Series(values).dt.tz_localize(None)
+        self.assertEqual(datetimes_to_str(naive), expected)
+        self.assertEqual(datetimes_to_str(datetimes_from_str(expected)), expected)
+
+    def test_datetimes_to_str_offsets(self):
+        offset = timezone(timedelta(hours=-5))
+        values = [datetime(2020, 1, 1, tzinfo=offset), None, "2020-01-01T00:00:00Z"]
+        self.assertEqual(
+            datetimes_to_str(values),
+            [pystac.utils.datetime_to_str(values[0]), None, values[2]],
+        )
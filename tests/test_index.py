@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pystac
+from shapely.geometry import box, mapping
+
+from stacframes.filters import ItemFilter
+from stacframes.index import CatalogIndex, write_index
+
+
+class TestCatalogIndexManager(unittest.TestCase):
+    def test_query(self):
+        catalog = pystac.Catalog("test", "test")
+        for i in range(4):
+            geometry = box(float(i), 0.0, i + 1.0, 1.0)
+            dt = datetime(2020, 1, i + 1, tzinfo=timezone.utc)
+            properties = {}
+            if i == 3:
+                dt = None
+                properties = {
+                    "start_datetime": "2020-01-01T00:00:00Z",
+                    "end_datetime": "2020-02-01T00:00:00Z",
+                }
+            item = pystac.Item(
+                str(i), mapping(geometry), list(geometry.bounds), dt, properties
+            )
+            catalog.add_item(item)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog.normalize_and_save(tmp_dir, pystac.CatalogType.SELF_CONTAINED)
+            self.assertIsNone(CatalogIndex.load(catalog))
+            write_index(catalog)
+            index = CatalogIndex.load(os.path.join(tmp_dir, "catalog.json"))
+
+            def ids(**kwargs):
+                hrefs = index.query(ItemFilter(**kwargs))
+                return [os.path.basename(os.path.dirname(h)) for h in hrefs]
+
+            self.assertEqual(len(index), 4)
+            self.assertEqual(ids(bbox=[1.5, 0.0, 2.5, 1.0]), ["1", "2"])
+            self.assertEqual(ids(datetime="2020-01-02T12:00:00Z/.."), ["2", "3"])
+            self.assertEqual(ids(datetime=(None, datetime(2020, 1, 1))), ["0", "3"])
+            self.assertEqual(ids(ids=["3", "1"], bbox=[3.5, 0.5, 9.0, 9.0]), ["3"])
+            self.assertTrue(os.path.isabs(index.query(ItemFilter(ids=["0"]))[0]))
+
+    def test_stale(self):
+        catalog = pystac.Catalog("test", "test")
+        for i, bbox in enumerate([[170.0, 0.0, -170.0, 1.0], [0.0, 0.0, 1.0, 1.0]]):
+            geometry = box(*bbox) if i else box(170.0, 0.0, 180.0, 1.0)
+            dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+            catalog.add_item(pystac.Item(str(i), mapping(geometry), bbox, dt, {}))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog.normalize_and_save(tmp_dir, pystac.CatalogType.SELF_CONTAINED)
+            write_index(catalog)
+            index = CatalogIndex.load(catalog)
+            self.assertTrue(index.is_current())
+            self.assertEqual(len(index.query(ItemFilter(bbox=[-175, 0, -170, 1]))), 1)
+            self.assertEqual(len(index.query(ItemFilter(bbox=[179, 0, -179, 1]))), 1)
+
+            # Loading only checks the catalog file, not every item file
+            with mock.patch("stacframes.index.os.stat", wraps=os.stat) as stat:
+                CatalogIndex.load(catalog)
+            self.assertEqual(stat.call_count, 1)
+
+            item = next(i for i in catalog.get_items() if i.id == "1")
+            item.properties["edited"] = True
+            item.save_object()
+            index = CatalogIndex.load(catalog)
+            self.assertIsNone(index.query(ItemFilter(ids=["1"])))
+            self.assertIsNone(index.items(ItemFilter(bbox=[0, 0, 1, 1])))
+            self.assertEqual(len(index.query(ItemFilter(ids=["0"]))), 1)
+            unverified = CatalogIndex.load(catalog, verify=False)
+            self.assertEqual(len(unverified.query(ItemFilter(ids=["1"]))), 1)
+
+            catalog.add_item(pystac.Item("2", mapping(box(0, 0, 1, 1)), None, dt, {}))
+            catalog.save()
+            self.assertIsNone(CatalogIndex.load(catalog))
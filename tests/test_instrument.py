@@ -0,0 +1,86 @@
+import unittest
+
+from stacframes.instrument import Instrument, record, StageTimings
+
+
+class EventLog(Instrument):
+    def __init__(self):
+        self.events = []
+
+    def started(self, operation, total):
+        self.events.append(("started", operation, total))
+
+    def progress(self, operation, done, total):
+        self.events.append(("progress", operation, done, total))
+
+    def stage(self, operation, name, seconds, items):
+        self.events.append(("stage", operation, name, items))
+
+    def finished(self, operation, seconds, items):
+        self.events.append(("finished", operation, items))
+
+
+class TestInstrumentManager(unittest.TestCase):
+    def test_record(self):
+        """Ensure stages are summed over laps and reported in the order first entered"""
+        log = EventLog()
+        recorder = record(log, "op", 3)
+        for n in (1, 2):
+            start = recorder.clock()
+            start = recorder.lap("b", start, n)
+            recorder.lap("a", start, n)
+            recorder.advance(n)
+        recorder.finish()
+        self.assertEqual(
+            log.events,
+            [
+                ("started", "op", 3),
+                ("progress", "op", 1, 3),
+                ("progress", "op", 3, 3),
+                ("stage", "op", "b", 3),
+                ("stage", "op", "a", 3),
+                ("finished", "op", 3),
+            ],
+        )
+
+    def test_record_track(self):
+        log = EventLog()
+        recorder = record(log, "op")
+        self.assertEqual(list(recorder.track(range(5), interval=2)), list(range(5)))
+        progress = [e[2] for e in log.events if e[0] == "progress"]
+        self.assertEqual(progress, [2, 4, 5])
+
+    def test_record_disabled(self):
+        """Ensure no instrument records nothing and passes iterables through"""
+        recorder = record(None, "op", 3)
+        values = iter(range(3))
+        self.assertIs(recorder.track(values), values)
+        self.assertEqual(recorder.lap("a", recorder.clock(), 3), 0.0)
+        recorder.advance(3)
+        recorder.finish()
+
+    def test_stage_timings(self):
+        timings = StageTimings()
+        timings.stage("op", "a", 2.0, 10)
+        timings.stage("op", "b", 0.0, 0)
+        timings.finished("op", 2.0, 10)
+        self.assertEqual(
+            timings.summary(),
+            [
+                {
+                    "operation": "op",
+                    "stage": "a",
+                    "seconds": 2.0,
+                    "items": 10,
+                    "items_per_second": 5.0,
+                },
+                {
+                    "operation": "op",
+                    "stage": "b",
+                    "seconds": 0.0,
+                    "items": 0,
+                    "items_per_second": None,
+                },
+            ],
+        )
+        self.assertEqual(timings.operations, [("op", 2.0, 10)])
@@ -2,7 +2,7 @@ import unittest
 
 import pandas as pd
 
-from stacframes.parents import from_properties, from_properties_accum
+from stacframes.parents import from_properties, from_properties_accum, group_positions
 
 
 class TestFromPropertiesManager(unittest.TestCase):
@@ -36,6 +36,17 @@ class TestFromPropertiesManager(unittest.TestCase):
         self.assertEqual(len(df["parents"]), 1)
         self.assertEqual(df["parents"][0], ["prefix-bar", "prefix-123"])
 
+    def test_from_properties_preserves_columns(self):
+        df = pd.DataFrame(
+            {"id": ["a", "b"], "n": [1, 2], "properties": [{"foo": 1}, {"foo": 2}]},
+            index=[10, 20],
+        )
+        result = from_properties(["foo"], df)
+        self.assertEqual(list(result.index), [10, 20])
+        self.assertEqual(list(result["parents"]), [["1"], ["2"]])
+        pd.testing.assert_frame_equal(result.drop(columns="parents"), df)
+        self.assertNotIn("parents", df.columns)
+
 
 class TestFromPropertiesAccumManager(unittest.TestCase):
     def test_error_if_has_parents_col(self):
@@ -62,3 +73,16 @@ class TestFromPropertiesAccumManager(unittest.TestCase):
         df = pd.DataFrame({"properties": [{"Year": 2020, "Month": 1}]})
         df = from_properties_accum(["Year", "Month"], df, separator="-")
         self.assertEqual(df["parents"][0], ["2020", "2020-1"])
+
+
+class TestGroupPositionsManager(unittest.TestCase):
+    def test_group_positions(self):
+        df = pd.DataFrame({"parents": [["a"], [], ["a", "b"], ["a"], None]})
+        groups = group_positions(df)
+        self.assertEqual(list(groups), [("a",), (), ("a", "b")])
+        self.assertEqual(groups[("a",)], [0, 3])
+        self.assertEqual(groups[()], [1, 4])
+
+    def test_group_positions_no_parents_col(self):
+        df = pd.DataFrame({"id": ["a", "b"]})
+        self.assertEqual(group_positions(df), {(): [0, 1]})
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+import unittest
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+
+from stacframes.partitions import PartitionedFrame
+
+
+def add_column(dataframe, name, value):
+    return dataframe.assign(**{name: value})
+
+
+class TestPartitionsManager(unittest.TestCase):
+    def setUp(self):
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        self.df = gpd.GeoDataFrame(
+            {
+                "id": ["a", "b", "c", "d", "e"],
+                "datetime": [dt] * 5,
+                "geometry": [geometry] * 5,
+                "bbox": [[*geometry.bounds]] * 5,
+                "parents": [["foo"], [], ["foo", "bar"], ["baz"], ["foo"]],
+            },
+            crs="EPSG:4326",
+        )
+
+    def test_from_frame(self):
+        partitioned = PartitionedFrame.from_frame(self.df)
+        self.assertEqual(partitioned.npartitions, 3)
+        self.assertEqual(
+            [list(f["id"]) for f in partitioned.iter_partitions()],
+            [["a", "c", "e"], ["b"], ["d"]],
+        )
+        self.assertEqual(partitioned.crs, self.df.crs)
+        deeper = PartitionedFrame.from_frame(self.df, depth=2)
+        self.assertEqual(deeper.npartitions, 4)
+
+    def test_compute(self):
+        partitioned = PartitionedFrame.from_frame(self.df)
+        mapped = partitioned.map_partitions(add_column, "n", 1)
+        for workers in (None, 2):
+            df = mapped.compute(workers=workers)
+            pd.testing.assert_frame_equal(df, self.df.iloc[[0, 2, 4, 1, 3]].assign(n=1))
+        self.assertEqual(mapped.apply(len, workers=2), [3, 1, 1])
+
+    def test_compute_empty(self):
+        df = PartitionedFrame([], crs="EPSG:3857").compute()
+        self.assertEqual(len(df), 0)
+        self.assertEqual(df.crs, "EPSG:3857")
@@ -0,0 +1,80 @@
+import unittest
+
+import pandas as pd
+
+from stacframes.properties import flatten, nest
+
+
+class TestPropertiesManager(unittest.TestCase):
+    def test_flatten_dtypes(self):
+        df = pd.DataFrame(
+            {
+                "id": ["a", "b", "c", "d"],
+                "properties": [
+                    {"n": 1, "f": 1.5, "s": "x", "b": True, "u": "a", "l": [1]},
+                    {"n": 2, "s": "x", "b": False, "u": "b"},
+                    {"f": 2.0, "s": "y", "u": "c"},
+                    {"n": 3, "s": "x", "u": "d", "l": {"k": 1}},
+                ],
+                "links": [[]] * 4,
+            }
+        )
+        flat = flatten(df)
+        self.assertEqual(
+            list(flat.columns),
+            [
+                "id",
+                "properties.n",
+                "properties.f",
+                "properties.s",
+                "properties.b",
+                "properties.u",
+                "properties.l",
+                "links",
+            ],
+        )
+        self.assertEqual(flat["properties.n"].dtype, "Int64")
+        self.assertEqual(flat["properties.f"].dtype, "Float64")
+        self.assertEqual(flat["properties.s"].dtype, "category")
+        self.assertEqual(flat["properties.b"].dtype, "boolean")
+        self.assertEqual(flat["properties.u"].dtype, "string")
+        self.assertEqual(flat["properties.l"].dtype, object)
+        self.assertTrue(pd.isna(flat["properties.n"][2]))
+
+    def test_nest_round_trip(self):
+        properties = [{"n": 1, "f": 1.0, "l": [1]}, {"s": "x"}, {}]
+        df = pd.DataFrame({"id": ["a", "b", "c"], "properties": properties})
+        nested = nest(flatten(df))
+        self.assertEqual(list(nested.columns), ["id", "properties"])
+        self.assertEqual(nested["properties"].tolist(), properties)
+        self.assertIsInstance(nested["properties"][0]["n"], int)
+        self.assertIsInstance(nested["properties"][0]["f"], float)
+
+    def test_nest_without_flattened_columns(self):
+        df = pd.DataFrame({"id": ["a"], "properties": [{"foo": "bar"}]})
+        self.assertIs(nest(df), df)
+
+    def test_round_trip_heterogeneous(self):
+        properties = [
+            {"n": 1, "x": 1, "z": None, "l": [1], "s": "a"},
+            {"n": 2, "x": 2.5, "z": 3, "d": {"k": None}},
+            {"x": None, "s": "b", "b": True},
+            {},
+        ]
+        df = pd.DataFrame(
+            {"id": ["a", "b", "c", "d"], "properties": properties, "links": [[]] * 4},
+            index=[10, 20, 30, 40],
+        )
+        flat = flatten(df)
+        self.assertEqual(flat["properties.n"].dtype, "Int64")
+        self.assertEqual(flat["properties.x"].dtype, object)
+        self.assertEqual(flat["properties.z"].dtype, object)
+        self.assertIsNone(flat["properties.z"][10])
+        self.assertIs(flat["properties.z"][30], pd.NA)
+        nested = nest(flat)
+        self.assertEqual(list(nested.columns), ["id", "properties", "links"])
+        self.assertEqual(list(nested.index), [10, 20, 30, 40])
+        self.assertEqual(nested["properties"].tolist(), properties)
+        self.assertIsInstance(nested["properties"][10]["x"], int)
+        self.assertIsInstance(nested["properties"][20]["x"], float)
+        self.assertIsInstance(nested["properties"][20]["z"], int)
@@ -0,0 +1,172 @@
+import asyncio
+from datetime import datetime, timezone
+import functools
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import geopandas as gpd
+import pandas as pd
+import pystac
+from shapely.geometry import box
+
+import stacframes
+from stacframes.remote import AsyncCatalogReader
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FlakyHandler(QuietHandler):
+    """Respond 503 to the first request for each path"""
+
+    failed = set()
+
+    def do_GET(self):
+        if self.path not in self.failed:
+            self.failed.add(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+class CountingHandler(QuietHandler):
+    """Record the most requests handled at once"""
+
+    lock = threading.Lock()
+    active = 0
+    most = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.most = max(cls.most, cls.active)
+        time.sleep(0.01)
+        try:
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+class TestRemote(unittest.TestCase):
+    def setUp(self):
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        df = gpd.GeoDataFrame(
+            {
+                "id": [str(i) for i in range(12)],
+                "datetime": [dt] * 12,
+                "geometry": [geometry] * 12,
+                "bbox": [[*geometry.bounds]] * 12,
+                "properties": [{"i": i} for i in range(12)],
+                "parents": [[], ["foo"], ["foo", "bar"], ["baz"]] * 3,
+            },
+            crs="EPSG:4326",
+        )
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        catalog.normalize_and_save(self.tmp_dir.name, pystac.CatalogType.SELF_CONTAINED)
+        self.path = os.path.join(self.tmp_dir.name, "catalog.json")
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.tmp_dir.cleanup()
+
+    def serve(self, handler):
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(handler, directory=self.tmp_dir.name)
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return "http://127.0.0.1:{}/catalog.json".format(server.server_address[1])
+
+    def read(self, url, **kwargs):
+        async def read():
+            async with AsyncCatalogReader(**kwargs) as reader:
+                return await reader.read_frame(url)
+
+        return asyncio.run(read())
+
+    def test_df_from_url(self):
+        """Ensure df_from_url reads the same frame over HTTP as df_from_path"""
+        url = self.serve(QuietHandler)
+        expected = stacframes.df_from_path(self.path)
+        pd.testing.assert_frame_equal(stacframes.df_from_url(url), expected)
+        pd.testing.assert_frame_equal(stacframes.df_from_url(self.path), expected)
+        result = self.read(url, concurrency=1, max_pending=1)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_retries(self):
+        """Ensure failed requests are retried, and raised once retries run out"""
+        FlakyHandler.failed = set()
+        url = self.serve(FlakyHandler)
+        result = self.read(url, backoff=0.0)
+        pd.testing.assert_frame_equal(result, stacframes.df_from_path(self.path))
+        FlakyHandler.failed = set()
+        with self.assertRaisesRegex(OSError, "status 503"):
+            self.read(url, retries=0)
+
+    def test_missing(self):
+        """Ensure a missing document is raised without retrying"""
+        url = self.serve(QuietHandler).replace("catalog.json", "missing.json")
+        with self.assertRaisesRegex(OSError, "status 404"):
+            self.read(url, backoff=10.0)
+
+    def test_concurrency(self):
+        """Ensure no more than concurrency requests are in flight at once"""
+        CountingHandler.most = 0
+        url = self.serve(CountingHandler)
+        self.read(url, concurrency=3)
+        self.assertGreater(CountingHandler.most, 1)
+        self.assertLessEqual(CountingHandler.most, 3)
+
+    def test_children_fetched_ahead(self):
+        """Ensure only a bounded number of child catalogs is fetched ahead"""
+        catalog = pystac.Catalog("wide", "wide")
+        df = gpd.GeoDataFrame(
+            {
+                "id": [str(i) for i in range(20)],
+                "datetime": [datetime(2020, 1, 1, tzinfo=timezone.utc)] * 20,
+                "geometry": [box(0.0, 0.0, 1.0, 1.0)] * 20,
+                "bbox": [[0.0, 0.0, 1.0, 1.0]] * 20,
+                "parents": [["c{}".format(i)] for i in range(20)],
+            },
+            crs="EPSG:4326",
+        )
+        stacframes.df_to(catalog, df)
+        root = os.path.join(self.tmp_dir.name, "wide")
+        catalog.normalize_and_save(root, pystac.CatalogType.SELF_CONTAINED)
+
+        fetched = []
+
+        class Reader(AsyncCatalogReader):
+            async def fetch_json(self, href):
+                fetched.append(href)
+                return await super().fetch_json(href)
+
+        async def first_item():
+            async with Reader(concurrency=2) as reader:
+                hrefs = reader.iter_item_hrefs(os.path.join(root, "catalog.json"))
+                await hrefs.__anext__()
+                await asyncio.sleep(0.1)
+                count = len(fetched)
+                await hrefs.aclose()
+                return count
+
+        # The root, the first child and at most one more child ahead of it
+        self.assertLessEqual(asyncio.run(first_item()), 3)
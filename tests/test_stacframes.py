@@ -1,10 +1,15 @@
 from datetime import datetime, timezone
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pystac
-from shapely.geometry import box, mapping
+from shapely.geometry import box, mapping, Polygon, shape
 
 import stacframes
 
@@ -37,6 +42,7 @@ class TestStacFramesManager(unittest.TestCase):
             },
         )
         self.assertEqual(item.bbox, [0.0, 0.0, 1.0, 1.0])
+        self.assertEqual(series["properties"], {})
 
     def test_series_from(self):
         dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
@@ -89,3 +95,822 @@ class TestStacFramesManager(unittest.TestCase):
         catalog_bar = catalog_foo.get_child("bar")
         self.assertEqual(len(list(catalog_bar.get_items())), 1)
         self.assertEqual(catalog_bar.get_item("c").id, "c")
+
+    def test_nested_add_extents(self):
+        """Ensure collection extents cover the items of their descendants"""
+        dt1 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        dt2 = datetime(2020, 2, 1, tzinfo=timezone.utc)
+        geom1 = box(0.0, 0.0, 1.0, 1.0)
+        geom2 = box(2.0, -1.0, 3.0, 0.5)
+        d = {
+            "id": ["a", "b"],
+            "datetime": [dt1, dt2],
+            "geometry": [geom1, geom2],
+            "bbox": [[*geom1.bounds], [*geom2.bounds]],
+            "parents": [["foo"], ["foo", "bar"]],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+        catalog_foo = catalog.get_child("foo")
+        self.assertEqual(catalog_foo.extent.spatial.bboxes, [[0.0, -1.0, 3.0, 1.0]])
+        self.assertEqual(catalog_foo.extent.temporal.intervals, [[dt1, dt2]])
+        catalog_bar = catalog_foo.get_child("bar")
+        self.assertEqual(catalog_bar.extent.spatial.bboxes, [[*geom2.bounds]])
+        self.assertEqual(catalog_bar.extent.temporal.intervals, [[dt2, dt2]])
+
+    def test_grouped_add(self):
+        """Ensure parents paths are looked up through an index and not mutated"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        parents = [["foo"], ["foo", "bar"], ["foo"], ["foo", "bar"]]
+        d = {
+            "id": ["a", "b", "c", "d"],
+            "datetime": [dt] * 4,
+            "geometry": [geometry] * 4,
+            "bbox": [bbox] * 4,
+            "parents": parents,
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        catalog = pystac.Catalog("test", "test")
+        with mock.patch.object(
+            pystac.Catalog, "get_children", autospec=True, side_effect=lambda c: []
+        ) as get_children:
+            stacframes.df_to(catalog, df)
+        self.assertEqual(get_children.call_count, 2)
+        self.assertEqual(list(df["parents"]), [["foo"], ["foo", "bar"]] * 2)
+        catalog_foo = catalog.get_child("foo")
+        self.assertEqual([i.id for i in catalog_foo.get_items()], ["a", "c"])
+        catalog_bar = catalog_foo.get_child("bar")
+        self.assertEqual([i.id for i in catalog_bar.get_items()], ["b", "d"])
+
+    def test_instrument(self):
+        """Ensure df_to, df_write and df_from report their stages and progress"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        d = {
+            "id": ["a", "b", "c"],
+            "datetime": [dt] * 3,
+            "geometry": [geometry] * 3,
+            "bbox": [[*geometry.bounds]] * 3,
+            "parents": [["foo"], [], ["foo"]],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        timings = stacframes.instrument.StageTimings()
+        with mock.patch.object(timings, "progress") as progress:
+            catalog = pystac.Catalog("test", "test")
+            stacframes.df_to(catalog, df, instrument=timings)
+            stacframes.df_from(catalog, instrument=timings)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                stacframes.df_write(
+                    pystac.Catalog("test", "test"), df, tmp_dir, instrument=timings
+                )
+        self.assertEqual(
+            [args for args, _ in progress.call_args_list],
+            [
+                ("df_to", 2, 3),
+                ("df_to", 3, 3),
+                ("df_from", 3, None),
+                ("df_write", 2, 3),
+                ("df_write", 3, 3),
+            ],
+        )
+        stages = [(row["operation"], row["stage"]) for row in timings.summary()]
+        self.assertEqual(
+            stages,
+            [
+                ("df_to", "prepare"),
+                ("df_to", "item_from"),
+                ("df_to", "build_collections"),
+                ("df_to", "add_items"),
+                ("df_to", "collection_extents"),
+                ("df_from", "read_items"),
+                ("df_from", "build_frame"),
+                ("df_write", "prepare"),
+                ("df_write", "build_collections"),
+                ("df_write", "write_items"),
+                ("df_write", "collection_extents"),
+                ("df_write", "save_catalog"),
+            ],
+        )
+        self.assertEqual([items for _, _, items in timings.operations], [3, 3, 3])
+
+    def test_df_from(self):
+        """Ensure df_from matches a frame built from one series_from per item"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        catalog = pystac.Catalog("test", "test")
+        collection = pystac.Collection("foo", "foo", stacframes.utils.empty_extent())
+        catalog.add_child(collection)
+        for i in range(3):
+            item = pystac.Item(
+                str(i), mapping(geometry), list(geometry.bounds), dt, {"i": i}
+            )
+            (collection if i else catalog).add_item(item)
+        df = stacframes.df_from(catalog)
+        expected = gpd.GeoDataFrame(
+            [stacframes.series_from(item) for item in catalog.get_all_items()],
+            crs="EPSG:4326",
+        )
+        pd.testing.assert_frame_equal(df, expected)
+        self.assertEqual(list(df.index), ["0", "1", "2"])
+        self.assertNotIn("datetime", df["properties"]["0"])
+
+    def test_df_from_flatten_properties(self):
+        """Ensure flattened properties round trip through df_to"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        catalog = pystac.Catalog("test", "test")
+        for i in range(3):
+            properties = {"i": i, "name": "item"} if i else {"name": "first"}
+            item = pystac.Item(
+                str(i), mapping(geometry), list(geometry.bounds), dt, properties
+            )
+            catalog.add_item(item)
+        df = stacframes.df_from(catalog, flatten_properties=True)
+        self.assertNotIn("properties", df.columns)
+        self.assertEqual(df["properties.i"].dtype, "Int64")
+        self.assertEqual(df["properties.i"].sum(), 3)
+
+        result = pystac.Catalog("test", "test")
+        stacframes.df_to(result, df.drop(columns="links"))
+        self.assertEqual(
+            [json.dumps(item.to_dict(), sort_keys=True) for item in result.get_items()],
+            [
+                json.dumps(item.to_dict(), sort_keys=True)
+                for item in catalog.get_items()
+            ],
+        )
+
+    def test_df_from_templatize_assets(self):
+        """Ensure templated assets round trip through df_to and parquet"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        catalog = pystac.Catalog("test", "test")
+        for i in range(3):
+            item = pystac.Item(str(i), mapping(geometry), list(geometry.bounds), dt, {})
+            asset = pystac.Asset(
+                "{}.tif".format(i), "Data", media_type=pystac.MediaType.COG
+            )
+            item.add_asset("data", asset)
+            catalog.add_item(item)
+        df = stacframes.df_from(catalog, templatize_assets=True)
+        self.assertNotIn("assets", df.columns)
+        self.assertEqual(list(df.filter(like="assets.").columns), ["assets.data.href"])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "items.parquet")
+            stacframes.to_parquet(df, path)
+            df = stacframes.read_parquet(path)
+        result = pystac.Catalog("test", "test")
+        stacframes.df_to(result, df.drop(columns="links"))
+        self.assertEqual(
+            [json.dumps(item.to_dict(), sort_keys=True) for item in result.get_items()],
+            [
+                json.dumps(item.to_dict(), sort_keys=True)
+                for item in catalog.get_items()
+            ],
+        )
+
+    def test_df_from_crs(self):
+        """Ensure df_from reprojects and df_to reprojects back to EPSG:4326"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(10.0, 20.0, 11.0, 21.0)
+        catalog = pystac.Catalog("test", "test")
+        item = pystac.Item("a", mapping(geometry), list(geometry.bounds), dt, {})
+        catalog.add_item(item)
+        df = stacframes.df_from(catalog, crs="EPSG:3857")
+        self.assertEqual(df.crs, "EPSG:3857")
+        minx, miny, maxx, maxy = df.geometry["a"].bounds
+        self.assertAlmostEqual(minx, 1113194.9, places=1)
+        self.assertEqual(df["bbox"]["a"], [minx, miny, maxx, maxy])
+
+        result = pystac.Catalog("test", "test")
+        stacframes.df_to(result, df.drop(columns="links"))
+        item = result.get_item("a")
+        for actual, expected in zip(item.bbox, geometry.bounds):
+            self.assertAlmostEqual(actual, expected)
+        self.assertTrue(shape(item.geometry).equals_exact(geometry, 1e-9))
+
+    def test_round_trip_3d(self):
+        """Ensure Z coordinates survive df_to and df_from"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = Polygon([(0, 0, 5), (1, 0, 5), (1, 1, 6), (0, 0, 5)])
+        df = gpd.GeoDataFrame(
+            {
+                "id": ["a"],
+                "datetime": [dt],
+                "geometry": [geometry],
+                "bbox": [list(geometry.bounds)],
+            },
+            crs="EPSG:4326",
+        )
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+        item = next(catalog.get_items())
+        self.assertEqual(item.geometry["coordinates"][0][2], [1.0, 1.0, 6.0])
+        result = stacframes.df_from(catalog)
+        self.assertTrue(result.geometry["a"].has_z)
+        self.assertTrue(result.geometry["a"].equals_exact(geometry, 0))
+
+    def test_iter_df_from(self):
+        """Ensure iter_df_from chunks concatenate to the result of df_from"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        catalog = pystac.Catalog("test", "test")
+        for i in range(5):
+            item = pystac.Item(str(i), mapping(geometry), list(geometry.bounds), dt, {})
+            if i == 3:
+                item.collection_id = "foo"
+            catalog.add_item(item)
+        chunks = list(stacframes.iter_df_from(catalog, chunk_size=2))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        self.assertEqual(list(chunks[1].columns)[-1], "collection")
+        self.assertEqual(list(chunks[1].columns), list(chunks[2].columns))
+        self.assertTrue(chunks[2]["collection"].isna().all())
+        df = pd.concat(chunks)
+        pd.testing.assert_frame_equal(
+            df, stacframes.df_from(catalog)[df.columns], check_dtype=False
+        )
+
+    def test_iter_df_from_releases_items(self):
+        """Ensure iter_df_from does not keep the items it read in the catalog"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        d = {
+            "id": [str(i) for i in range(30)],
+            "datetime": [dt] * 30,
+            "geometry": [geometry] * 30,
+            "bbox": [[*geometry.bounds]] * 30,
+            "properties": [{"i": i} for i in range(30)],
+            "parents": [[], ["foo"], ["foo", "bar"]] * 10,
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            stacframes.df_write(pystac.Catalog("test", "test"), df, tmp_dir)
+            href = os.path.join(tmp_dir, "catalog.json")
+            expected = stacframes.df_from(pystac.Catalog.from_file(href))
+            for filters in ({}, {"where": lambda p: p["i"] % 2}):
+                catalog = pystac.Catalog.from_file(href)
+                chunks = stacframes.iter_df_from(catalog, chunk_size=4, **filters)
+                result = pd.concat(list(chunks))
+                links = [
+                    link
+                    for _, node in stacframes.utils.CatalogBuilder(catalog).walk()
+                    for link in node.links
+                    if link.rel == "item"
+                ]
+                self.assertEqual(len(links), 30)
+                self.assertFalse(any(link.is_resolved() for link in links))
+                cached = catalog._resolved_objects.hrefs_to_objects.values()
+                self.assertFalse(any(isinstance(o, pystac.Item) for o in cached))
+                ids = list(expected.index)
+                if filters:
+                    ids = [i for i in ids if int(i) % 2]
+                pd.testing.assert_frame_equal(
+                    result, expected.loc[ids, result.columns], check_dtype=False
+                )
+
+    def test_df_from_workers(self):
+        """Ensure df_from reads items concurrently in the same order"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": [str(i) for i in range(10)],
+            "datetime": [dt] * 10,
+            "geometry": [geometry] * 10,
+            "bbox": [bbox] * 10,
+            "parents": [["foo"] if i % 3 else ["bar", "baz"] for i in range(10)],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog.normalize_and_save(tmp_dir, pystac.CatalogType.SELF_CONTAINED)
+            href = os.path.join(tmp_dir, "catalog.json")
+            expected = stacframes.df_from(pystac.Catalog.from_file(href))
+            result = stacframes.df_from(pystac.Catalog.from_file(href), workers=4)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_df_from_path(self):
+        """Ensure df_from_path reads the same frame as df_from from JSON"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": [str(i) for i in range(6)],
+            "datetime": [dt] * 6,
+            "geometry": [geometry] * 6,
+            "bbox": [bbox] * 6,
+            "properties": [{"i": i} for i in range(6)],
+            "parents": [[], ["foo"], ["foo", "bar"], ["baz"], ["foo"], []],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog.normalize_and_save(tmp_dir, pystac.CatalogType.SELF_CONTAINED)
+            href = os.path.join(tmp_dir, "catalog.json")
+            expected = stacframes.df_from(pystac.Catalog.from_file(href))
+            result = stacframes.df_from_path(href)
+            threaded = stacframes.df_from_path(href, workers=3)
+        pd.testing.assert_frame_equal(
+            result.drop(columns="links"), expected.drop(columns="links")
+        )
+        pd.testing.assert_frame_equal(threaded, result)
+
+    def test_df_from_cache(self):
+        """Ensure df_from with cache_dir reuses cached rows until files change"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": [str(i) for i in range(6)],
+            "datetime": [dt] * 6,
+            "geometry": [geometry] * 6,
+            "bbox": [bbox] * 6,
+            "properties": [{"i": i} for i in range(6)],
+            "parents": [[], ["foo"], ["foo", "bar"], ["baz"], ["foo"], []],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog.normalize_and_save(
+                os.path.join(tmp_dir, "stac"), pystac.CatalogType.SELF_CONTAINED
+            )
+            href = os.path.join(tmp_dir, "stac", "catalog.json")
+            cache_dir = os.path.join(tmp_dir, "cache")
+            expected = stacframes.df_from(pystac.Catalog.from_file(href))
+            cold = stacframes.df_from(
+                pystac.Catalog.from_file(href), cache_dir=cache_dir
+            )
+            with mock.patch.object(
+                pystac.Item, "from_dict", side_effect=AssertionError
+            ):
+                warm = stacframes.df_from(
+                    pystac.Catalog.from_file(href), cache_dir=cache_dir, workers=2
+                )
+            pd.testing.assert_frame_equal(cold, expected)
+            pd.testing.assert_frame_equal(warm, expected)
+
+            updated = pystac.Catalog.from_file(href)
+            item = updated.get_child("foo").get_item("4")
+            item.properties["i"] = 40
+            item.save_object()
+            result = stacframes.df_from(
+                pystac.Catalog.from_file(href), cache_dir=cache_dir
+            )
+        self.assertEqual(result.loc["4", "properties"], {"i": 40})
+        pd.testing.assert_frame_equal(result.drop(index="4"), expected.drop(index="4"))
+
+    def test_df_from_cache_filters(self):
+        """Ensure cache_dir cannot be combined with filters"""
+        with self.assertRaises(ValueError):
+            stacframes.df_from(pystac.Catalog("test", "test"), ids=["1"], cache_dir=".")
+
+    def test_df_from_filters(self):
+        """Ensure df_from filters items and prunes collections by extent"""
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": ["a", "b", "c", "d"],
+            "datetime": [
+                datetime(2020, m, 1, tzinfo=timezone.utc) for m in range(1, 5)
+            ],
+            "geometry": [geometry, box(5.0, 5.0, 6.0, 6.0), geometry, geometry],
+            "bbox": [bbox, [5.0, 5.0, 6.0, 6.0], bbox, bbox],
+            "properties": [{"n": 1}, {"n": 2}, {"n": 3}, {"n": 4}],
+            "parents": [["foo"], ["foo"], ["bar"], ["bar"]],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+
+        def ids(**kwargs):
+            return list(stacframes.df_from(catalog, **kwargs)["id"])
+
+        self.assertEqual(ids(bbox=[4.0, 4.0, 10.0, 10.0]), ["b"])
+        self.assertEqual(
+            ids(datetime=(datetime(2020, 2, 15), datetime(2020, 3, 15))), ["c"]
+        )
+        self.assertEqual(ids(datetime="2020-02-01T00:00:00Z/.."), ["b", "c", "d"])
+        self.assertEqual(ids(ids={"a", "d"}), ["a", "d"])
+        self.assertEqual(ids(where=lambda p: p["n"] % 2 == 0), ["b", "d"])
+
+        chunks = stacframes.iter_df_from(catalog, bbox=[0.5, 0.5, 2.0, 2.0])
+        self.assertEqual(list(pd.concat(list(chunks))["id"]), ["a", "c", "d"])
+
+        # Items inside a collection whose extent does not match are never read
+        catalog.get_child("bar").extent.temporal.intervals = [
+            [datetime(2019, 1, 1, tzinfo=timezone.utc)] * 2
+        ]
+        read_text = pystac.stac_io.DefaultStacIO.read_text
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog.normalize_and_save(tmp_dir, pystac.CatalogType.SELF_CONTAINED)
+            saved = pystac.Catalog.from_file(os.path.join(tmp_dir, "catalog.json"))
+            with mock.patch.object(
+                pystac.stac_io.DefaultStacIO,
+                "read_text",
+                autospec=True,
+                side_effect=read_text,
+            ) as read:
+                result = stacframes.df_from(saved, datetime=datetime(2020, 3, 1))
+            hrefs = [os.path.relpath(c.args[1], tmp_dir) for c in read.call_args_list]
+        self.assertEqual(len(result), 0)
+        self.assertEqual(
+            sorted(hrefs),
+            [os.path.join(c, "collection.json") for c in ("bar", "foo")],
+        )
+
+    def test_filter_antimeridian(self):
+        """Ensure bboxes crossing the antimeridian intersect those on either side"""
+        crossing = [170.0, 0.0, -170.0, 1.0]
+        item_filter = stacframes.ItemFilter(bbox=[175.0, 0.0, 180.0, 1.0])
+        self.assertTrue(item_filter.matches_dict({"id": "a", "bbox": crossing}))
+        item_filter = stacframes.ItemFilter(bbox=[-180.0, 0.0, -175.0, 1.0])
+        self.assertTrue(item_filter.matches_dict({"id": "a", "bbox": crossing}))
+        item_filter = stacframes.ItemFilter(bbox=[0.0, 0.0, 10.0, 1.0])
+        self.assertFalse(item_filter.matches_dict({"id": "a", "bbox": crossing}))
+        item_filter = stacframes.ItemFilter(bbox=crossing)
+        self.assertTrue(
+            item_filter.matches_dict({"id": "a", "bbox": [-178.0, 0.0, -177.0, 1.0]})
+        )
+        extent = pystac.Extent(
+            pystac.SpatialExtent([crossing]), pystac.TemporalExtent([[None, None]])
+        )
+        self.assertTrue(
+            stacframes.ItemFilter(bbox=[179.0, 0.0, 180.0, 1.0]).intersects_extent(
+                extent
+            )
+        )
+
+    def test_upsert(self):
+        """Ensure upsert only touches changed items and their collections"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": ["a", "b", "c"],
+            "datetime": [dt] * 3,
+            "geometry": [geometry] * 3,
+            "bbox": [bbox] * 3,
+            "properties": [{"n": 1}, {"n": 2}, {"n": 3}],
+            "parents": [["foo"], ["foo"], ["bar"]],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog = pystac.Catalog("test", "test")
+            stacframes.df_to(catalog, df)
+            catalog.normalize_and_save(tmp_dir, pystac.CatalogType.SELF_CONTAINED)
+            catalog = pystac.Catalog.from_file(os.path.join(tmp_dir, "catalog.json"))
+            item_a = catalog.get_child("foo").get_item("a")
+            bar_extent = catalog.get_child("bar").extent.to_dict()
+
+            geometry_b = box(2.0, 2.0, 3.0, 3.0)
+            df.at[1, "geometry"] = geometry_b
+            df.at[1, "bbox"] = [*geometry_b.bounds]
+            df = pd.concat([df.iloc[:2], df.iloc[:1].assign(id="d")])
+            stacframes.df_to(catalog, df, mode="upsert", delete_missing=True)
+
+        catalog_foo = catalog.get_child("foo")
+        self.assertIs(catalog_foo.get_item("a"), item_a)
+        self.assertEqual(catalog_foo.get_item("b").bbox, [2.0, 2.0, 3.0, 3.0])
+        self.assertEqual(sorted(i.id for i in catalog_foo.get_items()), ["a", "b", "d"])
+        self.assertEqual(catalog_foo.extent.spatial.bboxes, [[0.0, 0.0, 3.0, 3.0]])
+        catalog_bar = catalog.get_child("bar")
+        self.assertEqual(list(catalog_bar.get_items()), [])
+        self.assertNotEqual(catalog_bar.extent.to_dict(), bar_extent)
+
+    def test_error_if_bad_mode(self):
+        catalog = pystac.Catalog("test", "test")
+        with self.assertRaises(ValueError):
+            stacframes.df_to(catalog, pd.DataFrame(), mode="replace")
+        with self.assertRaises(ValueError):
+            stacframes.df_to(catalog, pd.DataFrame(), delete_missing=True)
+
+    def test_df_write(self):
+        """Ensure df_write writes the same catalog as df_to and save"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": ["a", "b", "c"],
+            "datetime": [dt] * 3,
+            "geometry": [geometry] * 3,
+            "bbox": [bbox] * 3,
+            "properties": [{"n": 1}, {"n": 2}, {"n": 3}],
+            "parents": [["foo"], [], ["foo", "bar"]],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            expected_dir = os.path.join(tmp_dir, "expected")
+            catalog = pystac.Catalog("test", "test")
+            stacframes.df_to(catalog, df)
+            catalog.normalize_and_save(expected_dir, pystac.CatalogType.SELF_CONTAINED)
+
+            result_dir = os.path.join(tmp_dir, "result")
+            stacframes.df_write(pystac.Catalog("test", "test"), df, result_dir)
+
+            for path in ("foo/a/a.json", "b/b.json", "foo/bar/c/c.json"):
+                with open(os.path.join(expected_dir, path)) as f:
+                    expected = f.read()
+                with open(os.path.join(result_dir, path)) as f:
+                    self.assertEqual(f.read(), expected)
+                self.assertNotIn("parents", json.loads(expected))
+
+            catalog = pystac.Catalog.from_file(os.path.join(result_dir, "catalog.json"))
+            catalog_foo = catalog.get_child("foo")
+            self.assertEqual([i.id for i in catalog_foo.get_items()], ["a"])
+            self.assertEqual(catalog_foo.extent.spatial.bboxes, [bbox])
+            self.assertEqual(catalog_foo.get_child("bar").get_item("c").id, "c")
+            self.assertEqual([i.id for i in catalog.get_items()], ["b"])
+
+    def test_df_write_index(self):
+        """Ensure df_from answers queries from the index written by df_write"""
+        geometries = [box(float(i), 0.0, i + 1.0, 1.0) for i in range(6)]
+        d = {
+            "id": [str(i) for i in range(6)],
+            "datetime": [
+                datetime(2020, 1, i + 1, tzinfo=timezone.utc) for i in range(6)
+            ],
+            "geometry": geometries,
+            "bbox": [[*g.bounds] for g in geometries],
+            "properties": [{"i": i} for i in range(6)],
+            "parents": [[], ["foo"], ["foo", "bar"], ["baz"], ["foo"], []],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        queries = [
+            {"bbox": [2.5, 0.0, 4.5, 1.0]},
+            {"datetime": (datetime(2020, 1, 3), None)},
+            {"ids": ["4", "0"], "where": lambda p: p["i"] > 0},
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            stacframes.df_write(
+                pystac.Catalog("test", "test"), df, tmp_dir, write_index=True
+            )
+            href = os.path.join(tmp_dir, "catalog.json")
+            catalog = pystac.Catalog.from_file(href)
+            written = stacframes.index.CatalogIndex.load(catalog)
+            stacframes.index.write_index(catalog)
+            index = stacframes.index.CatalogIndex.load(catalog)
+            for name in ("hrefs", "ids", "bboxes", "starts", "ends"):
+                np.testing.assert_array_equal(
+                    getattr(written, name), getattr(index, name)
+                )
+            self.assertEqual(list(index.ids), ["0", "5", "1", "4", "2", "3"])
+            for query in queries:
+                expected = stacframes.df_from(pystac.Catalog.from_file(href), **query)
+                with mock.patch.object(
+                    stacframes, "iter_items", side_effect=AssertionError
+                ):
+                    result = stacframes.df_from(
+                        pystac.Catalog.from_file(href),
+                        workers=2,
+                        use_index=True,
+                        **query
+                    )
+                pd.testing.assert_frame_equal(
+                    result.drop(columns="links"), expected.drop(columns="links")
+                )
+            self.assertEqual(list(result.index), ["4"])
+
+            # Items edited in place are read again rather than from the index
+            catalog = pystac.Catalog.from_file(href)
+            item = next(i for i in catalog.get_all_items() if i.id == "4")
+            item.bbox = [9.0, 9.0, 10.0, 10.0]
+            item.save_object()
+            with mock.patch.object(
+                stacframes, "iter_items", wraps=stacframes.iter_items
+            ) as walk:
+                result = stacframes.df_from(
+                    pystac.Catalog.from_file(href), use_index=True, ids=["4"]
+                )
+            walk.assert_called_once()
+            self.assertEqual(result["bbox"]["4"], [9.0, 9.0, 10.0, 10.0])
+
+            # Items added after the index was written are not missed
+            catalog = pystac.Catalog.from_file(href)
+            extra = df.iloc[[4]].assign(id="6", parents=[["baz"]])
+            stacframes.df_to(catalog, extra)
+            catalog.save()
+            self.assertIsNone(stacframes.index.CatalogIndex.load(catalog))
+            result = stacframes.df_from(
+                pystac.Catalog.from_file(href), use_index=True, ids=["4", "6"]
+            )
+            self.assertEqual(sorted(result.index), ["4", "6"])
+
+    def test_df_write_workers(self):
+        """Ensure df_write writes identical files with a process pool"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": [str(i) for i in range(20)],
+            "datetime": [dt] * 20,
+            "geometry": [geometry] * 20,
+            "bbox": [bbox] * 20,
+            "parents": [["foo"] if i % 2 else ["foo", "bar"] for i in range(20)],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            contents = []
+            for workers in (None, 2):
+                out_dir = os.path.join(tmp_dir, str(workers))
+                catalog = pystac.Catalog("test", "test")
+                stacframes.df_write(catalog, df, out_dir, workers=workers)
+                files = {}
+                for dirpath, _, filenames in os.walk(out_dir):
+                    for filename in filenames:
+                        path = os.path.join(dirpath, filename)
+                        with open(path, "rb") as f:
+                            files[os.path.relpath(path, out_dir)] = f.read()
+                contents.append(files)
+        self.assertEqual(len(contents[0]), 23)
+        self.assertEqual(contents[0], contents[1])
+
+    def test_df_from_partitioned(self):
+        """Ensure a partitioned frame reads, adds and writes the same items"""
+        geometries = [box(float(i), 0.0, i + 1.0, 1.0) for i in range(6)]
+        d = {
+            "id": [str(i) for i in range(6)],
+            "datetime": [
+                datetime(2020, 1, i + 1, tzinfo=timezone.utc) for i in range(6)
+            ],
+            "geometry": geometries,
+            "bbox": [[*g.bounds] for g in geometries],
+            "properties": [{"i": i} for i in range(6)],
+            "parents": [[], ["foo"], ["foo", "bar"], ["baz"], ["foo"], []],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_dir = os.path.join(tmp_dir, "source")
+            stacframes.df_write(pystac.Catalog("test", "test"), df, source_dir)
+            catalog = pystac.Catalog.from_file(os.path.join(source_dir, "catalog.json"))
+            with self.assertRaises(ValueError):
+                stacframes.df_from(catalog, partitioned=True, ids=["0"])
+            partitioned = stacframes.df_from(catalog, partitioned=True)
+            self.assertEqual(partitioned.npartitions, 3)
+            computed = partitioned.compute(workers=2)
+            pd.testing.assert_frame_equal(
+                computed.drop(columns="parents"), stacframes.df_from(catalog)
+            )
+            self.assertEqual(
+                dict(zip(computed["id"], computed["parents"])),
+                dict(zip(df["id"], df["parents"])),
+            )
+            deeper = stacframes.df_from(catalog, partitioned=True, partition_depth=2)
+            self.assertEqual(deeper.npartitions, 4)
+
+            contents = []
+            runs = [(computed, None), (partitioned, None), (partitioned, 2)]
+            for i, (frame, workers) in enumerate(runs):
+                out_dir = os.path.join(tmp_dir, str(i))
+                stacframes.df_write(
+                    pystac.Catalog("test", "test"), frame, out_dir, workers=workers
+                )
+                files = {}
+                for dirpath, _, filenames in os.walk(out_dir):
+                    for filename in filenames:
+                        path = os.path.join(dirpath, filename)
+                        with open(path, "rb") as f:
+                            files[os.path.relpath(path, out_dir)] = f.read()
+                contents.append(files)
+            self.assertEqual(len(contents[0]), 10)
+            self.assertEqual(contents[0], contents[1])
+            self.assertEqual(contents[0], contents[2])
+
+            expected = pystac.Catalog("test", "test")
+            stacframes.df_to(expected, computed)
+            result = pystac.Catalog("test", "test")
+            stacframes.df_to(result, partitioned)
+            for path in (["foo"], ["foo", "bar"], ["baz"]):
+                self.assertEqual(
+                    stacframes.build_recursive(result, path).extent.to_dict(),
+                    stacframes.build_recursive(expected, path).extent.to_dict(),
+                )
+            self.assertEqual(
+                sorted(i.id for i in result.get_all_items()),
+                sorted(i.id for i in expected.get_all_items()),
+            )
+
+    def test_ndjson(self):
+        """Ensure df_to_ndjson and df_from_ndjson round-trip items and parents"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        bbox = [*geometry.bounds]
+        d = {
+            "id": [str(i) for i in range(5)],
+            "datetime": [dt] * 5,
+            "geometry": [geometry] * 5,
+            "bbox": [bbox] * 5,
+            "properties": [{"i": i} for i in range(5)],
+            "parents": [[], ["foo"], ["foo", "bar"], [], ["foo"]],
+        }
+        df = gpd.GeoDataFrame(d, crs="EPSG:4326")
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df.drop(columns="parents"))
+        expected = stacframes.df_from(catalog).drop(columns="links")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "items.ndjson")
+            self.assertEqual(stacframes.df_to_ndjson(df, path), 5)
+            with open(path) as f:
+                lines = f.read().splitlines()
+            result = stacframes.df_from_ndjson(path)
+            chunks = list(stacframes.iter_df_from_ndjson(path, chunk_size=2))
+
+            sharded = os.path.join(tmp_dir, "sharded")
+            stacframes.df_to_ndjson(df, sharded, shard=True)
+            self.assertTrue(
+                os.path.exists(os.path.join(sharded, "foo", "bar", "items.ndjson"))
+            )
+            from_shards = stacframes.df_from_ndjson(sharded)
+
+            # Parent ids are encoded so that no shard is written outside its root
+            unsafe = [["..", "a/b"], ["/abs"], ["..", "%2E", "c.d"]]
+            contained = os.path.join(tmp_dir, "contained", "root")
+            stacframes.df_to_ndjson(
+                df.iloc[:3].assign(parents=unsafe), contained, shard=True
+            )
+            self.assertEqual(os.listdir(os.path.dirname(contained)), ["root"])
+            from_unsafe = stacframes.df_from_ndjson(contained)
+            with self.assertRaises(ValueError):
+                stacframes.df_to_ndjson(
+                    df.iloc[:1].assign(parents=[[""]]), contained, shard=True
+                )
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[2])["id"], "2")
+        pd.testing.assert_frame_equal(result.drop(columns="links"), expected)
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        pd.testing.assert_frame_equal(pd.concat(chunks), result)
+        self.assertEqual(list(from_shards.index), ["0", "3", "1", "4", "2"])
+        self.assertEqual(
+            list(from_shards["parents"]), [[], [], ["foo"], ["foo"], ["foo", "bar"]]
+        )
+        self.assertEqual(
+            dict(zip(from_unsafe["id"], from_unsafe["parents"])),
+            dict(zip(["0", "1", "2"], unsafe)),
+        )
+
+    def test_parquet(self):
+        """Ensure to_parquet and read_parquet round-trip a df_from frame"""
+        catalog = pystac.Catalog("test", "test")
+        for i in range(4):
+            geometry = box(float(i), 0.0, i + 1.0, 1.0)
+            dt = datetime(2020, 1, i + 1, tzinfo=timezone.utc)
+            properties = {"n": i, "name": "x"} if i else {"tags": ["a", "b"]}
+            item = pystac.Item(
+                str(i), mapping(geometry), list(geometry.bounds), dt, properties
+            )
+            item.add_asset("data", pystac.Asset("{}.tif".format(i), title="data"))
+            catalog.add_item(item)
+        df = stacframes.df_from(catalog)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "items.parquet")
+            stacframes.to_parquet(df, path, row_group_size=2)
+            result = stacframes.read_parquet(path)
+            subset = stacframes.read_parquet(
+                path, columns=["id", "properties"], row_groups=[1]
+            )
+        self.assertEqual(result.crs, df.crs)
+        pd.testing.assert_frame_equal(result, df, check_dtype=False)
+        self.assertEqual(list(subset.columns), ["id", "properties"])
+        self.assertEqual(list(subset.index), ["2", "3"])
+        self.assertEqual(subset.loc["2", "properties"], {"n": 2, "name": "x"})
+        item = stacframes.item_from(result.iloc[0])
+        self.assertEqual(item.assets["data"].href, "0.tif")
+
+    def test_parquet_flattened(self):
+        """Ensure flattened properties keep ints and nulls through parquet"""
+        dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        geometry = box(0.0, 0.0, 1.0, 1.0)
+        properties = [{"x": 1, "z": None}, {"x": 2.5, "z": 3}, {"x": 4}]
+        df = gpd.GeoDataFrame(
+            {
+                "id": ["a", "b", "c"],
+                "datetime": [dt] * 3,
+                "geometry": [geometry] * 3,
+                "bbox": [[*geometry.bounds]] * 3,
+                "properties": properties,
+            },
+            crs="EPSG:4326",
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "items.parquet")
+            stacframes.to_parquet(stacframes.properties.flatten(df), path)
+            result = stacframes.read_parquet(path)
+        self.assertEqual(result["properties.x"].tolist(), [1, 2.5, 4])
+        self.assertIsInstance(result["properties.x"][0], int)
+        self.assertIsNone(result["properties.z"][0])
+        self.assertIs(result["properties.z"][2], pd.NA)
+
+        def items(frame):
+            catalog = pystac.Catalog("test", "test")
+            stacframes.df_to(catalog, frame)
+            return [
+                json.dumps(i.to_dict(), sort_keys=True) for i in catalog.get_items()
+            ]
+
+        self.assertEqual(items(result), items(df))
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+import unittest
+
+import pystac
+
+from stacframes.utils import build_recursive, CatalogBuilder, merge_extents
+
+
+class TestCatalogBuilderManager(unittest.TestCase):
+    def test_build_recursive(self):
+        catalog = pystac.Catalog("test", "test")
+        children = ["foo", "bar"]
+        leaf_catalog = build_recursive(catalog, children, "collection")
+        self.assertEqual(leaf_catalog.id, "bar")
+        self.assertIsInstance(leaf_catalog, pystac.Collection)
+        self.assertEqual(children, ["foo", "bar"])
+        self.assertIs(catalog.get_child("foo").get_child("bar"), leaf_catalog)
+
+    def test_error_if_bad_catalog_type(self):
+        catalog = pystac.Catalog("test", "test")
+        with self.assertRaises(TypeError):
+            build_recursive(catalog, ["foo"], "folder")
+
+    def test_builder_reuses_catalogs(self):
+        catalog = pystac.Catalog("test", "test")
+        existing = pystac.Catalog("foo", "foo")
+        catalog.add_child(existing)
+        builder = CatalogBuilder(catalog, "catalog")
+        bar = builder.get(["foo", "bar"])
+        self.assertIs(builder.get(["foo"]), existing)
+        self.assertIs(builder.get(("foo", "bar")), bar)
+        self.assertEqual(len(list(catalog.get_children())), 1)
+        self.assertEqual(len(list(existing.get_children())), 1)
+        self.assertEqual(set(builder.catalogs), {(), ("foo",), ("foo", "bar")})
+
+
+class TestExtentsManager(unittest.TestCase):
+    def test_merge_extents(self):
+        def extent(bbox, start, end):
+            return pystac.Extent(
+                pystac.SpatialExtent([bbox]),
+                pystac.TemporalExtent(
+                    [
+                        [
+                            datetime(*start, tzinfo=timezone.utc),
+                            datetime(*end, tzinfo=timezone.utc),
+                        ]
+                    ]
+                ),
+            )
+
+        a = {(): extent([0.0, 0.0, 1.0, 1.0], (2020, 1, 2), (2020, 1, 3))}
+        b = {
+            (): extent([-1.0, 0.5, 0.5, 2.0], (2020, 1, 1), (2020, 1, 2)),
+            ("foo",): extent([-1.0, 0.5, 0.5, 2.0], (2020, 1, 1), (2020, 1, 2)),
+        }
+        merged = merge_extents(a, b)
+        self.assertEqual(set(merged), {(), ("foo",)})
+        self.assertEqual(merged[()].spatial.bboxes, [[-1.0, 0.0, 1.0, 2.0]])
+        self.assertEqual(
+            merged[()].temporal.intervals,
+            [
+                [
+                    datetime(2020, 1, 1, tzinfo=timezone.utc),
+                    datetime(2020, 1, 3, tzinfo=timezone.utc),
+                ]
+            ],
+        )
+        self.assertIs(merged[("foo",)], b[("foo",)])
+        self.assertEqual(len(a), 1)
@@ -0,0 +1,175 @@
+from datetime import datetime, timezone
+import json
+import unittest
+from unittest import mock
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pystac
+from shapely.geometry import box, Polygon
+
+import stacframes
+from stacframes import validate
+
+
+def make_frame(n=3):
+    dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    geometry = box(0.0, 0.0, 1.0, 1.0)
+    return gpd.GeoDataFrame(
+        {
+            "id": [str(i) for i in range(n)],
+            "datetime": [dt] * n,
+            "geometry": [geometry] * n,
+            "bbox": [list(geometry.bounds)] * n,
+            "properties": [{"n": i} for i in range(n)],
+            "parents": [["foo"]] * n,
+        },
+        crs="EPSG:4326",
+    )
+
+
+class TestValidateManager(unittest.TestCase):
+    def assertErrors(self, df, *expected):
+        with self.assertRaises(validate.ValidationError) as context:
+            stacframes.validate_df(df, schema=False)
+        self.assertEqual(context.exception.errors, list(expected))
+
+    def test_valid(self):
+        stacframes.validate_df(make_frame(), schema=False)
+        stacframes.validate_df(make_frame(0), schema=False)
+
+    def test_missing_columns(self):
+        self.assertErrors(
+            make_frame().drop(columns="bbox"), "missing required columns: bbox"
+        )
+
+    def test_ids(self):
+        df = make_frame(8)
+        df.loc[:, "id"] = ["a"] * 7 + [None]
+        self.assertErrors(
+            df,
+            "1 row(s) with missing or non-string id, at index 7",
+            "7 row(s) with duplicate id, at index 0, 1, 2, 3, 4, ...",
+        )
+
+    def test_geometries(self):
+        df = make_frame(4)
+        bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+        df["geometry"] = [None, Polygon(), bowtie, box(0.0, 0.0, 2.0, 1.0)]
+        self.assertErrors(
+            df,
+            "1 row(s) with missing or non-shapely geometry, at index 0",
+            "1 row(s) with empty geometry, at index 1",
+            "1 row(s) with invalid geometry, at index 2",
+            "1 row(s) with bbox that does not contain its geometry, at index 3",
+        )
+
+    def test_bboxes(self):
+        df = make_frame(3)
+        df["bbox"] = [[0.0, 0.0], [0.0, 0.0, -1.0, 1.0, 1.0, 2.0], None]
+        self.assertErrors(
+            df, "2 row(s) with bbox that is not 4 or 6 numbers, at index 0, 2"
+        )
+        # The bbox is recomputed when a frame is reprojected
+        df = make_frame(1).to_crs("EPSG:3857")
+        df["bbox"] = [[0.0, 0.0, 1.0, 1.0]]
+        stacframes.validate_df(df, schema=False)
+
+    def test_datetimes(self):
+        df = make_frame(4).astype({"datetime": object})
+        df["datetime"] = [None, "2020-01-01T00:00:00Z", "not a date", None]
+        df["properties"] = [
+            {},
+            {},
+            {},
+            {"start_datetime": "2020-01-01T00:00:00Z", "end_datetime": "2021-01-01"},
+        ]
+        self.assertErrors(
+            df, "2 row(s) with missing or invalid datetime, at index 0, 2"
+        )
+        stacframes.validate_df(
+            stacframes.properties.flatten(df.iloc[[1, 3]]), schema=False
+        )
+
+    def test_properties(self):
+        df = make_frame(4)
+        df["properties"] = [{"a": 1.5}, "text", {"a": 1j}, {"a": float("nan")}]
+        self.assertErrors(
+            df,
+            "1 row(s) with properties that is not a dict, at index 1",
+            "1 row(s) with property value that is not a JSON type, at index 2",
+            "1 row(s) with NaN or infinite property value, at index 3",
+        )
+        df["properties"] = [
+            {"a": {"b": [1, {"c": "d"}]}},
+            {"a": [np.float64(1.0)]},
+            {"a": {"b": pd.Timestamp("2020-01-01")}},
+            {"a": [{"b": float("nan")}]},
+        ]
+        self.assertErrors(
+            df,
+            "1 row(s) with property value that is not a JSON type, at index 2",
+            "1 row(s) with NaN or infinite property value, at index 3",
+        )
+        df["properties"] = [
+            {"a": np.int64(1), "b": np.bool_(True)},
+            {"a": [np.float32(1.5)]},
+            {"a": {"b": np.float64("inf")}},
+            {"a": np.float32("nan")},
+        ]
+        self.assertErrors(
+            df, "2 row(s) with NaN or infinite property value, at index 2, 3"
+        )
+        df["properties"] = [{"a": np.int64(1), "b": [np.bool_(False)]}, {}, {}, {}]
+        stacframes.validate_df(df)
+        catalog = pystac.Catalog("test", "test")
+        stacframes.df_to(catalog, df)
+        item = next(i for i in catalog.get_all_items() if i.id == "0")
+        self.assertEqual(json.dumps(item.properties["a"]), "1")
+        self.assertEqual(json.dumps(item.properties["b"]), "[false]")
+        df["properties"] = [{"a": 1.5}, {}, {"a": float("inf")}, {}]
+        flattened = stacframes.properties.flatten(df)
+        self.assertErrors(
+            flattened, "1 row(s) with NaN or infinite property value, at index 2"
+        )
+
+    def test_parents(self):
+        df = make_frame(2)
+        df["parents"] = [["foo"], "foo"]
+        self.assertErrors(
+            df, "1 row(s) with parents that are not a list of strings, at index 1"
+        )
+
+    def test_layouts(self):
+        df = make_frame(4)
+        df["properties"] = [{"a": 1}, {"b": 1}, {"a": 2}, {}]
+        self.assertEqual(list(validate.layouts(df).values()), [(0, 2), (1, 1), (3, 1)])
+        flattened = stacframes.properties.flatten(df)
+        self.assertEqual(
+            list(validate.layouts(flattened).values()), [(0, 2), (1, 1), (3, 1)]
+        )
+
+    def test_schema(self):
+        """Ensure one item per layout is validated against the schemas"""
+        df = make_frame(4)
+        df["properties"] = [{"a": 1}, {"b": 1}, {"a": 2}, {"b": 2}]
+        with mock.patch.object(validate, "jsonschema", object()):
+            with mock.patch.object(pystac.Item, "validate", autospec=True) as mocked:
+                mocked.side_effect = [
+                    None,
+                    pystac.errors.STACValidationError("bad b"),
+                ]
+                with self.assertRaises(validate.ValidationError) as context:
+                    stacframes.validate_df(df, schema=True)
+        self.assertEqual([c.args[0].id for c in mocked.call_args_list], ["0", "1"])
+        self.assertEqual(
+            context.exception.errors,
+            ["2 row(s) with the layout of index 1 fail schema validation: bad b"],
+        )
+
+    def test_schema_requires_jsonschema(self):
+        with mock.patch.object(validate, "jsonschema", None):
+            with self.assertRaises(ImportError):
+                stacframes.validate_df(make_frame(), schema=True)
+            stacframes.validate_df(make_frame())